@@ -0,0 +1,46 @@
+"""Add report_daily_rollups
+
+Revision ID: 3b7c1d9e2f40
+Revises: efe3687ade33
+Create Date: 2026-10-17 09:12:05.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b7c1d9e2f40'
+down_revision: Union[str, Sequence[str], None] = 'efe3687ade33'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Backfill afterwards with `python scripts/rebuild_report_rollups.py`.
+    """
+    op.create_table(
+        'report_daily_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('dimension', sa.String(length=16), nullable=False),
+        sa.Column('dimension_key', sa.String(), nullable=False),
+        sa.Column('orders', sa.Integer(), nullable=True),
+        sa.Column('closed_orders', sa.Integer(), nullable=True),
+        sa.Column('savings', sa.Numeric(precision=14, scale=2), nullable=True),
+        sa.Column('response_seconds', sa.Float(), nullable=True),
+        sa.Column('responded_orders', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'dimension', 'dimension_key', name='uq_report_rollup_bucket'),
+    )
+    op.create_index(op.f('ix_report_daily_rollups_day'), 'report_daily_rollups', ['day'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_report_daily_rollups_day'), table_name='report_daily_rollups')
+    op.drop_table('report_daily_rollups')
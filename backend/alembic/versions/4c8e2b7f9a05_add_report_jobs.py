@@ -0,0 +1,53 @@
+"""Add report_jobs
+
+Revision ID: 4c8e2b7f9a05
+Revises: 9a6d2f4e8b13
+Create Date: 2026-10-17 21:05:37.118402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4c8e2b7f9a05'
+down_revision: Union[str, Sequence[str], None] = '9a6d2f4e8b13'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+job_status = sa.Enum('queued', 'running', 'succeeded', 'failed', name='jobstatus')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'report_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=32), nullable=False),
+        sa.Column('params', sa.JSON(), nullable=False),
+        sa.Column('status', job_status, nullable=False),
+        sa.Column('requested_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('progress', sa.Integer(), nullable=False),
+        sa.Column('total', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('result_path', sa.String(), nullable=True),
+        sa.Column('result_size', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['requested_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_report_jobs_id'), 'report_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_report_jobs_status'), 'report_jobs', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_report_jobs_status'), table_name='report_jobs')
+    op.drop_index(op.f('ix_report_jobs_id'), table_name='report_jobs')
+    op.drop_table('report_jobs')
+    job_status.drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,33 @@
+"""Add version counters to sourcing_ids and master_products
+
+Revision ID: 5e0a9b3c7d21
+Revises: c2f95e7a1d68
+Create Date: 2026-10-17 16:22:40.518317
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e0a9b3c7d21'
+down_revision: Union[str, Sequence[str], None] = 'c2f95e7a1d68'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    The server default fills existing rows with 1, so no backfill is needed.
+    """
+    op.add_column('sourcing_ids', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+    op.add_column('master_products', sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('master_products', 'version')
+    op.drop_column('sourcing_ids', 'version')
@@ -0,0 +1,57 @@
+"""Add trigram indexes to master_products
+
+Revision ID: 8d41a6c0b5e3
+Revises: 3b7c1d9e2f40
+Create Date: 2026-10-17 11:40:27.530912
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d41a6c0b5e3'
+down_revision: Union[str, Sequence[str], None] = '3b7c1d9e2f40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_COLUMNS = ('sku', 'product_name', 'category')
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    PostgreSQL only. The indexes are built CONCURRENTLY so the catalogue stays
+    writable; the pg_trgm extension needs a role allowed to create it.
+    """
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    with op.get_context().autocommit_block():
+        for column in _COLUMNS:
+            op.create_index(
+                f'ix_master_products_{column}_trgm',
+                'master_products',
+                [column],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_ops={column: 'gin_trgm_ops'},
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    with op.get_context().autocommit_block():
+        for column in _COLUMNS:
+            op.drop_index(
+                f'ix_master_products_{column}_trgm',
+                table_name='master_products',
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,69 @@
+"""Add report_daily_series and the assigned/finalized indexes
+
+Revision ID: 9a6d2f4e8b13
+Revises: 5e0a9b3c7d21
+Create Date: 2026-10-17 18:40:12.604951
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a6d2f4e8b13'
+down_revision: Union[str, Sequence[str], None] = '5e0a9b3c7d21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, columns) of the sourcing_ids indexes the series rebuild ranges over
+INDEXES = [
+    ('ix_sourcing_ids_assigned_at', ['assigned_at']),
+    ('ix_sourcing_ids_finalized_at', ['finalized_at']),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    finalized_at was never written before, so closed orders get their last
+    purchaser action time instead. Backfill the series afterwards with
+    `python scripts/rebuild_report_rollups.py`.
+
+    On PostgreSQL the sourcing_ids indexes are built CONCURRENTLY, outside
+    the migration transaction, so the table stays writable.
+    """
+    op.create_table(
+        'report_daily_series',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('metric', sa.String(length=32), nullable=False),
+        sa.Column('bucket', sa.Integer(), nullable=False),
+        sa.Column('value', sa.Float(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('day', 'metric', 'bucket', name='uq_report_series_point'),
+    )
+    op.create_index(op.f('ix_report_daily_series_day'), 'report_daily_series', ['day'], unique=False)
+    op.execute(
+        "UPDATE sourcing_ids SET finalized_at = purchaser_action_time "
+        "WHERE finalized_at IS NULL AND status IN ('Purchased', 'Dropshipped')"
+    )
+
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES:
+            op.create_index(
+                name, 'sourcing_ids', columns, unique=False,
+                postgresql_concurrently=postgresql, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.drop_index(name, table_name='sourcing_ids', postgresql_concurrently=postgresql, if_exists=True)
+    op.drop_index(op.f('ix_report_daily_series_day'), table_name='report_daily_series')
+    op.drop_table('report_daily_series')
@@ -0,0 +1,58 @@
+"""Add indexes for the sourcing list and dashboard queries
+
+Revision ID: c2f95e7a1d68
+Revises: 8d41a6c0b5e3
+Create Date: 2026-10-17 14:03:51.207764
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c2f95e7a1d68'
+down_revision: Union[str, Sequence[str], None] = '8d41a6c0b5e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (name, table, columns, partial-index predicate)
+INDEXES = [
+    ('ix_sourcing_items_sourcing_id', 'sourcing_items', ['sourcing_id'], None),
+    ('ix_sourcing_ids_purchaser_created', 'sourcing_ids', ['purchaser_id', 'created_at', 'id'], None),
+    ('ix_sourcing_ids_purchaser_status_created', 'sourcing_ids', ['purchaser_id', 'status', 'created_at'], None),
+    ('ix_sourcing_ids_purchaser_awaiting', 'sourcing_ids', ['purchaser_id'], "tracking_status = 'Awaiting'"),
+    ('ix_sourcing_ids_sourcer_created', 'sourcing_ids', ['sourcer_id', sa.text('created_at DESC'), sa.text('id DESC')], None),
+    ('ix_sourcing_ids_pending_created', 'sourcing_ids', ['created_at', 'id'], "status = 'Pending'"),
+    ('ix_sourcing_ids_created_at', 'sourcing_ids', ['created_at'], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    On PostgreSQL the indexes are built CONCURRENTLY, outside the migration
+    transaction, so the tables stay writable.
+    """
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(where) if where else None,
+                sqlite_where=sa.text(where) if where else None,
+                postgresql_concurrently=postgresql,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    postgresql = op.get_bind().dialect.name == 'postgresql'
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=postgresql, if_exists=True)
@@ -1,15 +1,21 @@
-from collections.abc import Generator
+import hashlib
+import time
+from collections.abc import AsyncGenerator, Generator
+from dataclasses import dataclass
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from .. import schemas
 from ..core import security
+from ..core.cache import TTLCache
 from ..core.config import settings
 from ..db import models
-from ..db.session import SessionLocal
+from ..db.session import AsyncSessionLocal, SessionLocal
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"/api/v1/login/token"
@@ -25,10 +31,57 @@ def get_db() -> Generator:
     finally:
         db.close()
 
-def get_current_user(
-    token: str = Depends(reusable_oauth2),
-    db: Session = Depends(get_db)
-) -> models.User:
+async def get_async_db() -> AsyncGenerator:
+    """
+    Dependency to get an asyncio database session for each request.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+@dataclass(frozen=True)
+class CachedUser:
+    """
+    Detached snapshot of the authenticated user. Carries the columns the
+    endpoints read from `current_user` and that `schemas.User` serialises.
+    """
+    id: int
+    email: str
+    first_name: str
+    last_name: str
+    role: models.UserRole
+    is_active: bool
+
+    @classmethod
+    def from_user(cls, user: models.User) -> "CachedUser":
+        return cls(
+            id=user.id,
+            email=user.email,
+            first_name=user.first_name,
+            last_name=user.last_name,
+            role=user.role,
+            is_active=user.is_active,
+        )
+
+# Users keyed by token subject (email), and subjects keyed by token hash so a
+# token's signature is only verified once per process within its lifetime.
+# AUTH_CACHE_TTL_SECONDS=0 disables both.
+user_cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+_subject_cache = TTLCache(
+    settings.AUTH_CACHE_MAX_ENTRIES,
+    settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60 if settings.AUTH_CACHE_TTL_SECONDS > 0 else 0,
+)
+
+def forget_user(*emails: str) -> None:
+    """Drops cached snapshots; call after changing or deleting a user."""
+    for email in emails:
+        user_cache.pop(email)
+
+def _token_subject(token: str) -> str:
+    token_key = hashlib.sha256(token.encode()).hexdigest()
+    username = _subject_cache.get(token_key)
+    if username is not None:
+        return username
+
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM]
@@ -45,8 +98,41 @@ def get_current_user(
             detail="Invalid token"
         )
 
+    expires_at = payload.get("exp")
+    if isinstance(expires_at, (int, float)):
+        _subject_cache.set(token_key, username, ttl=expires_at - time.time())
+    return username
+
+def get_current_user(
+    token: str = Depends(reusable_oauth2),
+    db: Session = Depends(get_db)
+) -> CachedUser:
+    username = _token_subject(token)
+    cached = user_cache.get(username)
+    if cached is not None:
+        return cached
+
     user = db.query(models.User).filter(models.User.email == username).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
-    return user
+    cached = CachedUser.from_user(user)
+    user_cache.set(username, cached)
+    return cached
+
+async def get_current_user_async(
+    token: str = Depends(reusable_oauth2),
+    db: AsyncSession = Depends(get_async_db)
+) -> CachedUser:
+    username = _token_subject(token)
+    cached = user_cache.get(username)
+    if cached is not None:
+        return cached
+
+    user = await db.scalar(select(models.User).where(models.User.email == username))
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    cached = CachedUser.from_user(user)
+    user_cache.set(username, cached)
+    return cached
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, HTTPException
+from typing import List
+
+from ... import schemas
+from ...db import models
+from ...db import pool
+from ...services import product_service, report_service
+from .. import deps
+
+router = APIRouter()
+
+
+@router.get("/db-pool", response_model=List[schemas.PoolStats])
+def read_db_pool_stats(
+    current_user: models.User = Depends(deps.get_current_user)
+):
+    """
+    Connection pool occupancy and checkout wait times for each engine.
+    Accessible only by admins.
+    """
+    if current_user.role != models.UserRole.admin:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    return [metrics.snapshot() for metrics in pool.registry.values()]
+
+
+@router.get("/caches", response_model=List[schemas.CacheStats])
+def read_cache_stats(
+    current_user: models.User = Depends(deps.get_current_user)
+):
+    """
+    Size and hit/miss counters of this worker's in-process caches.
+    Accessible only by admins.
+    """
+    if current_user.role != models.UserRole.admin:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+
+    caches = {
+        "auth_users": deps.user_cache,
+        "products_by_sku": product_service.product_cache,
+        "purchaser_stats": report_service.purchaser_stats_cache,
+    }
+    return [{"name": name, **cache.stats()} for name, cache in caches.items()]
@@ -1,10 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 from typing import List, Optional
 
 from ... import schemas
 from ...db import models
 from .. import deps
+from ..etags import ETAG_HEADER, etag_matches, make_etag, not_modified
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, finish_page, keyset_query
+from ...services import product_service
 
 router = APIRouter()
 
@@ -33,22 +36,33 @@ def create_master_product(
     db.add(product)
     db.commit()
     db.refresh(product)
+    product_service.forget_products(product.sku)
     return product
 
 
 @router.get("/", response_model=List[schemas.Product])
 def read_master_products(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     q: Optional[str] = None,
+    fuzzy: bool = False,
     category: Optional[str] = None,
     product_type: Optional[str] = None, # <-- THIS LINE IS THE FIX
+    if_none_match: Optional[str] = Header(None),
     current_user: models.User = Depends(deps.get_current_user)
 ):
     """
     Retrieve master products with optional search and filtering. 
     Accessible by admins and sourcers.
+    Pass the X-Next-Cursor header back as `cursor` to page by key instead of `skip`.
+    With `fuzzy=true`, `q` also matches misspellings and results are ranked by
+    relevance; ranked results page with `skip` only.
+    The ETag covers the id and version of every product on the page (plus the
+    look-ahead row), so a matching If-None-Match is answered with a 304 from an
+    id/version-only query.
     """
     if current_user.role not in [models.UserRole.admin, models.UserRole.sourcer, models.UserRole.purchaser]:
         raise HTTPException(
@@ -58,18 +72,30 @@ def read_master_products(
     
     query = db.query(models.MasterProduct)
 
-    if q:
-        query = query.filter(
-            (models.MasterProduct.sku.ilike(f"%{q}%")) |
-            (models.MasterProduct.product_name.ilike(f"%{q}%"))
-        )
+    if q and not fuzzy:
+        query = query.filter(product_service.contains_filter(q))
     if category:
-        query = query.filter(models.MasterProduct.category.ilike(f"%{category}%"))
+        query = query.filter(product_service.category_filter(category))
     if product_type and product_type in models.ProductType.__members__:
         query = query.filter(models.MasterProduct.product_type == product_type)
 
-    products = query.offset(skip).limit(limit).all()
-    return products
+    order_key = [models.MasterProduct.id]
+    if q and fuzzy:
+        query = product_service.fuzzy_search(query, q, db.get_bind().dialect.name).offset(skip).limit(limit)
+    else:
+        query = keyset_query(query, order_key, cursor=cursor, limit=limit, skip=skip)
+
+    if if_none_match:
+        versions = query.with_entities(models.MasterProduct.id, models.MasterProduct.version).all()
+        etag = make_etag(*(f"{row.id}.{row.version}" for row in versions))
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag, response)
+
+    products = query.all()
+    response.headers[ETAG_HEADER] = make_etag(*(f"{p.id}.{p.version}" for p in products))
+    if q and fuzzy:
+        return products
+    return finish_page(products, response, order_key, limit)
 
 
 @router.put("/{product_id}", response_model=schemas.Product)
@@ -93,6 +119,7 @@ def update_master_product(
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
+    previous_sku = product.sku
     update_data = product_in.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(product, field, value)
@@ -100,6 +127,7 @@ def update_master_product(
     db.add(product)
     db.commit()
     db.refresh(product)
+    product_service.forget_products(previous_sku, product.sku)
     return product
 
 
@@ -125,4 +153,5 @@ def delete_master_product(
         
     db.delete(product)
     db.commit()
+    product_service.forget_products(product.sku)
     return product
\ No newline at end of file
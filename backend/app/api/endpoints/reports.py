@@ -1,266 +1,438 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from fastapi.responses import StreamingResponse
-from sqlalchemy.orm import Session
-from sqlalchemy import func
-from sqlalchemy import orm
+from collections import Counter, defaultdict
+from datetime import date, datetime, timezone
+from typing import List, Literal, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import case, func, select
 import io
 import csv
+import os
+import zlib
 
 from ... import schemas
 from ...db import models
+from ...db.session import AsyncSessionLocal
+from ...services import analytics_export, job_service, report_service
 from .. import deps
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, finish_page, keyset_query
+from ..responses import model_response
 
 router = APIRouter()
 
 
 @router.get("/dashboard", response_model=schemas.DashboardStats)
-def get_dashboard_stats(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def get_dashboard_stats(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
 ):
+    """
+    Company-wide dashboard, read from the daily rollup table so the cost grows
+    with the number of days and dimension values rather than with order history.
+    """
     if current_user.role not in [models.UserRole.manager, models.UserRole.admin]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    # Subquery: Total target cost per sourcing ID
-    total_target_cost_subquery = (
-        db.query(
-            models.SourcingItem.sourcing_id,
-            func.sum(
-                models.MasterProduct.target_cost_per_unit * models.SourcingItem.quantity_needed
-            ).label("total_target")
-        )
-        .join(models.MasterProduct, models.SourcingItem.sku == models.MasterProduct.sku)
-        .group_by(models.SourcingItem.sourcing_id)
-        .subquery()
-    )
+    by_sourcer, by_purchaser, by_market, by_category = [
+        (await db.execute(report_service.rollup_summary(dimension, start_date, end_date))).all()
+        for dimension in ("sourcer", "purchaser", "market", "category")
+    ]
 
-    # Main efficiency query: savings per sourcing ID
-    efficiency_query = (
-        db.query(
-            models.SourcingID.sourcer_id,
-            (
-                total_target_cost_subquery.c.total_target -
-                (models.SourcingID.sellers_price + models.SourcingID.shipping_price + models.SourcingID.tax)
-            ).label("efficiency")
-        )
-        .join(total_target_cost_subquery, models.SourcingID.id == total_target_cost_subquery.c.sourcing_id)
-        .filter(
-            models.SourcingID.status.in_([
-                models.SourcingItemStatus.Purchased,
-                models.SourcingItemStatus.Dropshipped
-            ])
+    # Rollups are keyed by user id; resolve emails for just those users
+    user_ids = {int(row[0]) for row in by_sourcer + by_purchaser if row[0]}
+    emails = {
+        str(user_id): email
+        for user_id, email in await db.execute(
+            select(models.User.id, models.User.email).where(models.User.id.in_(user_ids))
         )
-    )
-
-    # Aggregate by sourcer email
-    sourcer_performance_query = (
-        efficiency_query.add_columns(models.User.email)
-        .join(models.User, models.SourcingID.sourcer_id == models.User.id)
-        .group_by(models.User.email)
-        .with_entities(models.User.email, func.sum(efficiency_query.subquery().c.efficiency))
-        .all()
-    )
+    } if user_ids else {}
 
     performance_by_sourcer = [
-        schemas.SourcerPerformance(sourcer_email=email, total_savings=savings or 0)
-        for email, savings in sourcer_performance_query
+        schemas.SourcerPerformance(sourcer_email=emails[key], total_savings=savings or 0)
+        for key, orders, closed, savings, _, _ in by_sourcer
+        if key in emails and closed
     ]
     total_company_savings = sum(p.total_savings for p in performance_by_sourcer)
 
-    sourcing_ids_per_sourcer = db.query(
-        models.User.email,
-        func.count(models.SourcingID.id)
-    ).join(
-        models.SourcingID, models.User.id == models.SourcingID.sourcer_id
-    ).group_by(models.User.email).all()
-
-    sourcing_ids_per_purchaser = db.query(
-        models.User.email,
-        func.count(models.SourcingID.id)
-    ).join(
-        models.SourcingID, models.User.id == models.SourcingID.purchaser_id
-    ).filter(
-        models.SourcingID.purchaser_id.isnot(None)
-    ).group_by(models.User.email).all()
-
-    # ✅ Avg time between created_at and assigned_at
-    avg_response_timedelta = db.query(
-        func.avg(models.SourcingID.assigned_at - models.SourcingID.created_at)
-    ).filter(models.SourcingID.assigned_at.isnot(None)).scalar()
-
-    avg_response_hours = (avg_response_timedelta.total_seconds() / 3600) if avg_response_timedelta else None
-
-    return schemas.DashboardStats(
+    response_seconds = sum(row[4] or 0 for row in by_sourcer)
+    responded = sum(row[5] or 0 for row in by_sourcer)
+    avg_response_hours = (response_seconds / responded / 3600) if responded else None
+
+    return model_response(schemas.DashboardStats, schemas.DashboardStats(
         total_company_savings=total_company_savings,
         performance_by_sourcer=performance_by_sourcer,
         sourcing_ids_per_sourcer=[
-            schemas.CountByUser(user_email=email, count=count)
-            for email, count in sourcing_ids_per_sourcer
+            schemas.CountByUser(user_email=emails[key], count=orders)
+            for key, orders, *_ in by_sourcer
+            if key in emails
         ],
         sourcing_ids_per_purchaser=[
-            schemas.CountByUser(user_email=email, count=count)
-            for email, count in sourcing_ids_per_purchaser
+            schemas.CountByUser(user_email=emails[key], count=orders)
+            for key, orders, *_ in by_purchaser
+            if key in emails
         ],
         avg_response_time_hours=avg_response_hours,
-        efficiency_by_market=[],  # Placeholder for future expansion
-        efficiency_by_category=[]  # Placeholder for future expansion
-    )
+        efficiency_by_market=[
+            schemas.EfficiencyBreakdown(dimension="Market", value=key, total_savings=savings or 0)
+            for key, orders, closed, savings, _, _ in by_market
+            if key and closed
+        ],
+        efficiency_by_category=[
+            schemas.EfficiencyBreakdown(dimension="Category", value=key, total_savings=savings or 0)
+            for key, orders, closed, savings, _, _ in by_category
+            if key and closed
+        ]
+    ))
+
+
+MAX_SERIES_DAYS = 3 * 366
+
+
+@router.get("/timeseries", response_model=schemas.Timeseries)
+async def get_timeseries(
+    metric: Literal[tuple(report_service.SERIES_METRICS)],
+    start: date = Query(..., alias="from"),
+    end: date = Query(..., alias="to"),
+    bucket: Literal["day", "week"] = "day",
+    percentiles: List[float] = Query([50, 90, 95]),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
+):
+    """
+    Daily or weekly (ISO week) series of one metric between `from` and `to`
+    inclusive, read from the precomputed report_daily_series table. created,
+    assigned and purchased count orders by the UTC day of that event; savings sums
+    closed orders' savings by finalization day; time_to_assign and
+    time_to_finalize report an order count and percentiles, in hours, of the
+    time since creation.
+    """
+    if current_user.role not in [models.UserRole.manager, models.UserRole.admin]:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    if end < start:
+        raise HTTPException(status_code=400, detail="`to` must not be before `from`")
+    if (end - start).days >= MAX_SERIES_DAYS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_SERIES_DAYS} days per request")
+    if not all(0 < p <= 100 for p in percentiles):
+        raise HTTPException(status_code=400, detail="Percentiles must be in (0, 100]")
+
+    rows = (await db.execute(report_service.series_rows(metric, start, end))).all()
+    return model_response(schemas.Timeseries, {
+        "metric": metric,
+        "bucket": bucket,
+        "unit": report_service.SERIES_METRICS[metric],
+        "points": report_service.series_points(rows, metric, bucket, start, end, percentiles),
+    })
+
+
+EXPORT_BATCH_SIZE = 1000
+
+
+async def _export_csv_chunks(statement):
+    """
+    Yields the CSV one batch at a time while rows arrive from a server-side
+    cursor. Runs with its own session because the request's session is closed
+    before a streaming body is sent.
+    """
+    async with AsyncSessionLocal() as db:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(report_service.EXPORT_HEADER)
+        result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+        async for rows in result.partitions():
+            writer.writerows(rows)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+        if buffer.tell():
+            yield buffer.getvalue()
+
+
+async def _gzip_chunks(chunks):
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    async for chunk in chunks:
+        data = compressor.compress(chunk.encode("utf-8"))
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+async def _export_columnar_chunks(statement, export_format: str):
+    """Like _export_csv_chunks, yielding whatever the Parquet/Arrow writer has produced after each batch."""
+    async with AsyncSessionLocal() as db:
+        sink = analytics_export.ChunkSink()
+        writer = analytics_export.ColumnarWriter(export_format, sink)
+        result = await db.stream(statement.execution_options(yield_per=analytics_export.BATCH_SIZE))
+        async for rows in result.partitions():
+            writer.write(rows)
+            if chunk := sink.drain():
+                yield chunk
+        writer.close()
+        if chunk := sink.drain():
+            yield chunk
 
 
 @router.get("/dashboard/export")
-def export_dashboard_stats_to_csv(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def export_dashboard_stats_to_csv(
+    start_date: Optional[datetime] = Query(None),
+    end_date: Optional[datetime] = Query(None),
+    status_filter: Optional[List[models.SourcingItemStatus]] = Query(None),
+    gzip: bool = False,
+    export_format: Literal["csv", "parquet", "arrow"] = Query("csv", alias="format"),
+    month: Optional[str] = Query(None, description="YYYY-MM; only orders created that month"),
+    current_user: models.User = Depends(deps.get_current_user_async)
 ):
+    """
+    Streams one CSV row per order item. Date-range and status filters run in
+    SQL; `gzip=true` compresses the stream with Content-Encoding: gzip.
+
+    `format=parquet` (zstd-compressed) or `format=arrow` (Arrow IPC stream)
+    export every order and item column instead, with typed decimal and enum
+    columns and a `month` column to partition by. `gzip` only applies to CSV.
+    """
     if current_user.role not in [models.UserRole.manager, models.UserRole.admin]:
         raise HTTPException(status_code=403, detail="Not enough permissions")
+    if month:
+        try:
+            month_start, month_end = analytics_export.month_bounds(month)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="month must be YYYY-MM")
+
+    if export_format != "csv":
+        if not analytics_export.available():
+            raise HTTPException(status_code=501, detail="Parquet/Arrow export requires pyarrow")
+        statement = analytics_export.analytics_statement(start_date, end_date, status_filter, month)
+        extension, media_type = analytics_export.FORMATS[export_format]
+        headers = {"Content-Disposition": f"attachment; filename=sourcing_report{extension}"}
+        return StreamingResponse(_export_columnar_chunks(statement, export_format), media_type=media_type, headers=headers)
+
+    statement = report_service.export_statement(start_date, end_date, status_filter)
+    if month:
+        statement = statement.where(models.SourcingID.created_at >= month_start, models.SourcingID.created_at < month_end)
+
+    headers = {"Content-Disposition": "attachment; filename=sourcing_report.csv"}
+    chunks = _export_csv_chunks(statement)
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+        chunks = _gzip_chunks(chunks)
+    return StreamingResponse(chunks, media_type="text/csv", headers=headers)
+
+
+async def _get_job(db: AsyncSession, job_id: int, current_user) -> models.ReportJob:
+    if current_user.role not in [models.UserRole.manager, models.UserRole.admin]:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    job = await db.get(models.ReportJob, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Report job not found")
+    if current_user.role != models.UserRole.admin and job.requested_by != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this job")
+    return job
+
+
+@router.post("/jobs", response_model=schemas.ReportJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_report_job(
+    job_in: schemas.ReportJobCreate,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
+):
+    """
+    Queues an order export (`export`, same filters as /dashboard/export) or a
+    rebuild of the dashboard rollups and time series (`rebuild`) to run in the
+    background. Poll GET /jobs/{id} for progress, then fetch the export from
+    GET /jobs/{id}/download.
+    """
+    if current_user.role not in [models.UserRole.manager, models.UserRole.admin]:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    if job_in.kind == job_service.REBUILD and current_user.role != models.UserRole.admin:
+        raise HTTPException(status_code=403, detail="Not enough permissions")
+    if job_in.format != "csv" and not analytics_export.available():
+        raise HTTPException(status_code=501, detail="Parquet/Arrow export requires pyarrow")
+
+    job = models.ReportJob(
+        kind=job_in.kind,
+        params=job_in.model_dump(mode="json", exclude={"kind"}, exclude_none=True),
+        requested_by=current_user.id,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(job)
+    await db.commit()
+    job_service.runner.submit(job.id)
+    return model_response(schemas.ReportJob, job, status_code=status.HTTP_202_ACCEPTED)
 
-    query_result = db.query(
-        models.SourcingID.id,
-        models.SourcingID.created_at,
-        models.SourcingID.assigned_at,
-        models.SourcingItem.product_name,
-        models.SourcingItem.sku,
-        models.SourcingID.market,
-        models.SourcingItem.category,
-        models.SourcingID.status,
-        (models.SourcingID.sellers_price + models.SourcingID.shipping_price + models.SourcingID.tax).label("total_actual_cost")
-    ).join(
-        models.SourcingItem, models.SourcingID.id == models.SourcingItem.sourcing_id
-    ).all()
-
-    output = io.StringIO()
-    writer = csv.writer(output)
-    writer.writerow([
-        "SourcingID", "CreatedAt", "AssignedAt",
-        "ProductName", "SKU", "Market",
-        "Category", "Status", "TotalActualCost"
-    ])
-    for row in query_result:
-        writer.writerow(row)
-
-    output.seek(0)
-    return StreamingResponse(output, media_type="text/csv", headers={
-        "Content-Disposition": "attachment; filename=sourcing_report.csv"
-    })
+
+@router.get("/jobs/{job_id}", response_model=schemas.ReportJob)
+async def read_report_job(
+    job_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
+):
+    return model_response(schemas.ReportJob, await _get_job(db, job_id, current_user))
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_report_job(
+    job_id: int,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
+):
+    """Streams a finished export from disk, until the result file expires (410)."""
+    job = await _get_job(db, job_id, current_user)
+    if job.status != models.JobStatus.succeeded or job.kind != job_service.EXPORT:
+        raise HTTPException(status_code=409, detail="Report job has no file to download")
+    if not job.result_path or not os.path.exists(path := job_service.result_file(job)):
+        raise HTTPException(status_code=410, detail="Report file is no longer available")
+    extension, media_type = job_service.result_type(job)
+    return FileResponse(path, media_type=media_type, filename="sourcing_report" + extension)
 
 
 @router.get("/sourcer/me", response_model=schemas.SourcerDashboardStats)
-def get_sourcer_stats(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def get_sourcer_stats(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
 ):
+    """
+    Sourcer dashboard. Counts, savings, the catalogue-target baseline and the
+    overall efficiency cover every order and come from one aggregate query;
+    `all_requests` is paged newest-first with `cursor`/`limit` (next page
+    cursor in the X-Next-Cursor header).
+    """
     if current_user.role != models.UserRole.sourcer:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    requests = db.query(models.SourcingID).filter(
-        models.SourcingID.sourcer_id == current_user.id
-    ).options(
-        orm.joinedload(models.SourcingID.items)
-    ).all()
-
-    total_requests_created = len(requests)
-    requests_pending = sum(1 for r in requests if r.status == models.SourcingItemStatus.Pending)
-    requests_assigned = sum(1 for r in requests if r.status == models.SourcingItemStatus.Assigned)
+    closed_statuses = [models.SourcingItemStatus.Purchased, models.SourcingItemStatus.Dropshipped]
 
-    purchased_or_dropshipped = [
-        r for r in requests if r.status in [models.SourcingItemStatus.Purchased, models.SourcingItemStatus.Dropshipped]
-    ]
-    requests_purchased = len(purchased_or_dropshipped)
-
-    total_savings = 0
-    for r in purchased_or_dropshipped:
-        total_target = sum(
-            (db.query(models.MasterProduct.target_cost_per_unit)
-             .filter(models.MasterProduct.sku == item.sku)
-             .scalar() or 0) * item.quantity_needed
-            for item in r.items
+    # Target cost per order, priced from the master catalogue
+    master_target = (
+        select(
+            models.SourcingItem.sourcing_id,
+            func.sum(
+                func.coalesce(models.MasterProduct.target_cost_per_unit, 0) * models.SourcingItem.quantity_needed
+            ).label("total_target")
         )
-        total_actual = r.sellers_price + r.shipping_price + r.tax
-        total_savings += (total_target - total_actual)
-
-    recent_requests_query = db.query(models.SourcingID).filter(
-        models.SourcingID.sourcer_id == current_user.id
-    ).options(
-        orm.joinedload(models.SourcingID.items)
-    ).order_by(
-        models.SourcingID.created_at.desc()
-    ).limit(5).all()
-
-    recent_requests = []
-    for r in recent_requests_query:
-        savings = None
-        if r.status in [models.SourcingItemStatus.Purchased, models.SourcingItemStatus.Dropshipped]:
-            total_target = sum(
-                (db.query(models.MasterProduct.target_cost_per_unit)
-                 .filter(models.MasterProduct.sku == item.sku)
-                 .scalar() or 0) * item.quantity_needed
-                for item in r.items
-            )
-            total_actual = r.sellers_price + r.shipping_price + r.tax
-            savings = total_target - total_actual
-
-        recent_requests.append(schemas.RecentSourcingRequest(
-            id=r.id,
-            status=r.status,
-            created_at=r.created_at,
-            items=r.items,
-            savings=savings
-        ))
+        .join(models.SourcingID, models.SourcingID.id == models.SourcingItem.sourcing_id)
+        .outerjoin(models.MasterProduct, models.SourcingItem.sku == models.MasterProduct.sku)
+        .where(models.SourcingID.sourcer_id == current_user.id)
+        .group_by(models.SourcingItem.sourcing_id)
+        .subquery()
+    )
+    is_closed = models.SourcingID.status.in_(closed_statuses)
+    savings = case(
+        (
+            is_closed,
+            func.coalesce(master_target.c.total_target, 0)
+            - (models.SourcingID.sellers_price + models.SourcingID.shipping_price + models.SourcingID.tax)
+        ),
+        else_=None,
+    ).label("savings")
+
+    totals = (await db.execute(
+        select(
+            func.count(models.SourcingID.id),
+            func.count(models.SourcingID.id).filter(models.SourcingID.status == models.SourcingItemStatus.Pending),
+            func.count(models.SourcingID.id).filter(models.SourcingID.status == models.SourcingItemStatus.Assigned),
+            func.count(models.SourcingID.id).filter(is_closed),
+            func.sum(savings),
+            func.sum(master_target.c.total_target),
+        )
+        .outerjoin(master_target, master_target.c.sourcing_id == models.SourcingID.id)
+        .where(models.SourcingID.sourcer_id == current_user.id)
+    )).one()
+    (
+        total_requests_created, requests_pending, requests_assigned, requests_purchased,
+        total_savings, total_baseline,
+    ) = totals
+    total_savings = float(total_savings or 0)
+    total_baseline = float(total_baseline or 0)
+
+    # Only the columns RecentSourcingRequest needs; no ORM objects or item rows
+    summary_query = (
+        select(
+            models.SourcingID.id, models.SourcingID.status, models.SourcingID.created_at, savings,
+            master_target.c.total_target,
+        )
+        .outerjoin(master_target, master_target.c.sourcing_id == models.SourcingID.id)
+        .where(models.SourcingID.sourcer_id == current_user.id)
+    )
+    recent_rows = (await db.execute(
+        summary_query
+        .order_by(models.SourcingID.created_at.desc(), models.SourcingID.id.desc())
+        .limit(5)
+    )).all()
+    order_key = [models.SourcingID.created_at, models.SourcingID.id]
+    page_rows = finish_page(
+        await db.execute(keyset_query(summary_query, order_key, cursor=cursor, limit=limit, descending=True)),
+        response,
+        order_key,
+        limit,
+    )
 
-    all_requests = [
-        schemas.RecentSourcingRequest(
+    # Product names for every order shown, in one query
+    item_names = defaultdict(list)
+    order_ids = {r.id for r in recent_rows} | {r.id for r in page_rows}
+    if order_ids:
+        for sourcing_id, product_name in await db.execute(
+            select(models.SourcingItem.sourcing_id, models.SourcingItem.product_name)
+            .where(models.SourcingItem.sourcing_id.in_(order_ids))
+            .order_by(models.SourcingItem.id)
+        ):
+            item_names[sourcing_id].append(schemas.ItemSummary(product_name=product_name))
+
+    def to_summary(r):
+        return schemas.RecentSourcingRequest(
             id=r.id,
             status=r.status,
             created_at=r.created_at,
-            items=r.items,
-            savings=(
-                sum(
-                    (db.query(models.MasterProduct.target_cost_per_unit)
-                     .filter(models.MasterProduct.sku == item.sku)
-                     .scalar() or 0) * item.quantity_needed
-                    for item in r.items
-                ) - (r.sellers_price + r.shipping_price + r.tax)
-            ) if r.status in [models.SourcingItemStatus.Purchased, models.SourcingItemStatus.Dropshipped] else None
+            items=item_names[r.id],
+            savings=r.savings,
+            target_total=r.total_target or 0,
         )
-        for r in requests
-    ]
 
-    return schemas.SourcerDashboardStats(
+    return model_response(schemas.SourcerDashboardStats, schemas.SourcerDashboardStats(
         total_requests_created=total_requests_created,
         total_savings=total_savings,
+        total_baseline=total_baseline,
+        overall_efficiency_pct=total_savings / total_baseline * 100 if total_baseline else 0,
         requests_pending=requests_pending,
         requests_assigned=requests_assigned,
         requests_purchased=requests_purchased,
-        recent_requests=recent_requests,
-        all_requests=all_requests
-    )
+        recent_requests=[to_summary(r) for r in recent_rows],
+        all_requests=[to_summary(r) for r in page_rows]
+    ), response)
 
 
 @router.get("/purchaser/me", response_model=schemas.PurchaserDashboardStats)
-def get_purchaser_stats(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user)
+async def get_purchaser_stats(
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async)
 ):
+    """
+    Purchaser dashboard: totals plus per-status and per-tracking-status
+    counts, all from one grouped query. Cached per purchaser for
+    PURCHASER_STATS_CACHE_TTL_SECONDS; writes to orders on this worker clear it.
+    """
     if current_user.role != models.UserRole.purchaser:
         raise HTTPException(status_code=403, detail="Not enough permissions")
 
-    requests_assigned = db.query(models.SourcingID).filter(
-        models.SourcingID.purchaser_id == current_user.id
-    ).count()
-
-    awaiting_tracking = db.query(models.SourcingID).filter(
-        models.SourcingID.purchaser_id == current_user.id,
-        models.SourcingID.tracking_status == models.TrackingStatus.Awaiting
-    ).count()
-
-    items_purchased = db.query(models.SourcingID).filter(
-        models.SourcingID.purchaser_id == current_user.id,
-        models.SourcingID.status == models.SourcingItemStatus.Purchased
-    ).count()
+    stats = report_service.purchaser_stats_cache.get(current_user.id)
+    if stats is None:
+        by_status, by_tracking_status = Counter(), Counter()
+        for order_status, tracking_status, count in await db.execute(
+            report_service.purchaser_status_counts(current_user.id)
+        ):
+            by_status[order_status.value] += count
+            by_tracking_status[tracking_status.value if tracking_status else ""] += count
+        stats = schemas.PurchaserDashboardStats(
+            requests_assigned=by_status.total(),
+            awaiting_tracking=by_tracking_status[models.TrackingStatus.Awaiting.value],
+            items_purchased=by_status[models.SourcingItemStatus.Purchased.value],
+            requests_by_status=by_status,
+            requests_by_tracking_status=by_tracking_status,
+        )
+        report_service.purchaser_stats_cache.set(current_user.id, stats)
 
-    return schemas.PurchaserDashboardStats(
-        requests_assigned=requests_assigned,
-        awaiting_tracking=awaiting_tracking,
-        items_purchased=items_purchased
-    )
+    return model_response(schemas.PurchaserDashboardStats, stats)
@@ -1,30 +1,152 @@
+import asyncio
+import json
 from datetime import datetime, timezone
 from decimal import Decimal
-from typing import List, Optional
-from decimal import Decimal
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from ... import schemas
-from ...db import models
+from ...core.broadcast import CLOSED
+from ...core.config import settings
+from ...db import loaders, models
 from .. import deps
+from ..etags import ETAG_HEADER, etag_matches, make_etag, not_modified
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, finish_page, keyset_query
+from ..responses import model_response
+from ...services import event_service, product_service, report_service, sourcing_service
 
 router = APIRouter()
 
+MAX_BULK_ORDERS = 5000
+
+
+async def _load_order(db: AsyncSession, sourcing_id: int, refresh: bool = False):
+    """
+    Selects an order with its items. Lazy loads are not available under
+    asyncio, so everything schemas.SourcingID serializes is loaded up front;
+    `refresh` overwrites stale in-session copies after a write.
+    """
+    statement = (
+        select(models.SourcingID)
+        .options(*loaders.ORDER_WITH_ITEMS)
+        .where(models.SourcingID.id == sourcing_id)
+    )
+    if refresh:
+        statement = statement.execution_options(populate_existing=True)
+    return await db.scalar(statement)
+
+
+def _summary_columns():
+    """Columns for schemas.SourcingIDSummary; item count and first name come from correlated subqueries on the items index."""
+    order = models.SourcingID
+    item = models.SourcingItem
+    fields = [name for name in schemas.SourcingIDSummary.model_fields if name not in ("created_on", "item_count", "first_product_name")]
+    return [
+        *(getattr(order, name) for name in fields),
+        order.created_at,
+        select(func.count(item.id)).where(item.sourcing_id == order.id).scalar_subquery().label("item_count"),
+        select(item.product_name).where(item.sourcing_id == order.id)
+        .order_by(item.id).limit(1).scalar_subquery().label("first_product_name"),
+    ]
+
+
+async def _order_page(db: AsyncSession, response: Response, conditions, cursor, limit: int, view: str):
+    """
+    One keyset page of orders, oldest first. `view=full` serialises ORM
+    orders with their items as schemas.SourcingID; `view=summary` selects
+    only the header columns, as schemas.SourcingIDSummary.
+    """
+    order_key = [models.SourcingID.created_at, models.SourcingID.id]
+    if view == "summary":
+        statement = select(*_summary_columns()).where(*conditions)
+        rows = finish_page(
+            await db.execute(keyset_query(statement, order_key, cursor=cursor, limit=limit)),
+            response, order_key, limit,
+        )
+        return model_response(List[schemas.SourcingIDSummary], rows, response)
+
+    statement = select(models.SourcingID).options(*loaders.ORDER_WITH_ITEMS).where(*conditions)
+    rows = await db.scalars(keyset_query(statement, order_key, cursor=cursor, limit=limit))
+    return model_response(List[schemas.SourcingID], finish_page(rows, response, order_key, limit), response)
+
+
+# Master product fields copied onto a PATCHed item unless the request sets them
+_MASTER_FIELDS = [
+    "product_name", "type_code", "brnd_cod", "model_code", "abbr_code",
+    "color_code", "cnd_code", "regular_price", "price",
+    "target_cost_per_unit", "product_type", "category"
+]
+
+
+def _apply_item_update(item_obj, update_data: dict, prod=None):
+    """
+    Applies PATCHed fields to an item and recalculates its per-item totals.
+    When the SKU changed, `prod` is its master product: fields the request did
+    not send are auto-populated from it.
+    """
+    if prod is not None:
+        for k in _MASTER_FIELDS:
+            if hasattr(prod, k):
+                update_data.setdefault(k, getattr(prod, k))
+        update_data["product_id"] = prod.id
+        update_data["uid"] = prod.id
+
+    # Apply all user PATCHed values (overwrite everything)
+    for field, value in update_data.items():
+        setattr(item_obj, field, value)
+
+    # --- Recalculate per-item totals & efficiency ---
+    item_obj.item_target_total = (
+        Decimal(item_obj.target_cost_per_unit or 0)
+        * Decimal(item_obj.quantity_needed or 1)
+    )
+    item_obj.sku_efficiency = (
+        Decimal(item_obj.item_target_total or 0)
+        - (Decimal(item_obj.sourced_price or 0) + Decimal(item_obj.shipping_charges or 0) + Decimal(item_obj.tax or 0))
+    )
+    item_obj.shipping_charges = item_obj.shipping_charges or Decimal("0")
+    item_obj.tax = item_obj.tax or Decimal("0")
+
+
+def _new_item(sourcing_id: int, item_in: schemas.SourcingItemCreate, prod) -> models.SourcingItem:
+    """Builds an item for an existing order, taking name, target cost and type from its master product."""
+    # Extract fields with defaults
+    quantity_needed = item_in.quantity_needed or 1
+    sourced_price = Decimal(str(item_in.sourced_price or 0))
+    shipping_charges = item_in.shipping_charges or 0
+    product_condition = item_in.product_condition or "Excellent"
+
+    return models.SourcingItem(
+        sourcing_id=sourcing_id,
+        product_id=prod.id,
+        product_name=prod.product_name,
+        target_cost_per_unit=prod.target_cost_per_unit,
+        product_type=prod.product_type,
+        category=prod.category,
+        sku=item_in.sku,
+        quantity_needed=quantity_needed,
+        sourced_price=sourced_price,
+        shipping_charges=shipping_charges,
+        product_condition=product_condition,
+        sku_efficiency=(sourced_price - (prod.target_cost_per_unit or 0))
+    )
 
 
 @router.post("/", response_model=schemas.SourcingID)
-def create_sourcing_request(
+async def create_sourcing_request(
     *,
     sourcing_in: schemas.SourcingIDCreate,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
     if current_user.role not in [models.UserRole.sourcer, models.UserRole.purchaser]:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    # 1) Create order record and persist it immediately
+    # 1) Create the order; it is written together with its items on commit
     order = models.SourcingID(
         sourcer_id     = current_user.id,
         created_at     = datetime.now(timezone.utc),
@@ -38,34 +160,18 @@ def create_sourcing_request(
         status         = models.SourcingItemStatus.Pending
     )
     db.add(order)
-    db.flush()   # ← now order.id is assigned and it’s in the session
 
     if current_user.role == models.UserRole.purchaser:
         order.purchaser_id = current_user.id
         order.status       = models.SourcingItemStatus.Assigned
 
-# 2) Compute total_target as before...
-    total_target = sum(
-        Decimal(str(item.target_cost_per_unit)) * Decimal(item.quantity_needed or 1)
-        for item in sourcing_in.items
-    )
-    order.target_total = total_target
-
-    # But actual cost should be the order-level sellers_price + shipping_price + tax
-    actual_cost = (
-       order.sellers_price
-        + order.shipping_price
-        + order.tax
-    )
-    order.sourced_price = actual_cost
-    order.savings       = Decimal(total_target) - Decimal(actual_cost)
-
-    # 3) Create items
+    # 2) Create items; order totals are recomputed once when the session flushes
+    #    (see models.recompute_sourcing_totals)
     for item_in in sourcing_in.items:
         target   = Decimal(str(item_in.target_cost_per_unit or 0))
         sourced = Decimal(str(item_in.sourced_price or 0))
         db.add(models.SourcingItem(
-            sourcing_id         = order.id,
+            sourcing_order      = order,
             product_name        = item_in.product_name,
             sku                 = item_in.sku,
             quantity_needed     = item_in.quantity_needed,
@@ -78,66 +184,244 @@ def create_sourcing_request(
             sku_efficiency      = target - sourced,
         ))
 
-    db.commit()
-    db.refresh(order)
-    return order
+    await db.commit()
+    report_service.forget_purchaser_stats(order.purchaser_id)
+    return model_response(schemas.SourcingID, await _load_order(db, order.id, refresh=True))
 
 
 
-@router.get("/pending", response_model=List[schemas.SourcingID])
-def list_pending_requests(
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+@router.post("/bulk", response_model=List[schemas.SourcingBulkResult])
+async def create_sourcing_requests_bulk(
+    *,
+    orders_in: List[schemas.SourcingIDCreate],
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
+):
+    """
+    Creates many sourcing requests at once, e.g. pasted from a spreadsheet.
+    All item SKUs are checked against the catalogue in one query; an order
+    with an unknown SKU is rejected and the rest are created. Orders and items
+    are written with multi-row INSERTs, and the results come back in request
+    order.
+    """
+    if current_user.role not in [models.UserRole.sourcer, models.UserRole.purchaser]:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    if len(orders_in) > MAX_BULK_ORDERS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BULK_ORDERS} orders per request")
+
+    products = await product_service.get_products_by_sku(
+        db, {item_in.sku for order_in in orders_in for item_in in order_in.items}
+    )
+
+    results = [schemas.SourcingBulkResult(index=index, created=False) for index in range(len(orders_in))]
+    accepted = []
+    for index, order_in in enumerate(orders_in):
+        unknown = sorted({item_in.sku for item_in in order_in.items} - products.keys())
+        if unknown:
+            results[index].detail = f"Products not found for SKUs: {unknown}"
+        else:
+            accepted.append(index)
+    if not accepted:
+        return model_response(List[schemas.SourcingBulkResult], results)
+
+    now = datetime.now(timezone.utc)
+    assigned = current_user.role == models.UserRole.purchaser
+    order_rows = [
+        {
+            "sourcer_id": current_user.id,
+            "purchaser_id": current_user.id if assigned else None,
+            "status": models.SourcingItemStatus.Assigned if assigned else models.SourcingItemStatus.Pending,
+            "created_at": now,
+            **orders_in[index].model_dump(exclude={"items"}),
+        }
+        for index in accepted
+    ]
+    # sort_by_parameter_order keeps the returned ids aligned with order_rows
+    # when the rows are sent as batched multi-row INSERTs
+    order_ids = (await db.scalars(
+        insert(models.SourcingID).returning(models.SourcingID.id, sort_by_parameter_order=True),
+        order_rows,
+    )).all()
+
+    item_rows = []
+    for index, order_id in zip(accepted, order_ids):
+        results[index].id = order_id
+        results[index].created = True
+        for item_in in orders_in[index].items:
+            target = Decimal(str(item_in.target_cost_per_unit or 0))
+            sourced = Decimal(str(item_in.sourced_price or 0))
+            item_rows.append({
+                "sourcing_id": order_id,
+                "product_id": products[item_in.sku].id,
+                "product_name": item_in.product_name,
+                "sku": item_in.sku,
+                "quantity_needed": item_in.quantity_needed,
+                "target_cost_per_unit": item_in.target_cost_per_unit,
+                "sourced_price": item_in.sourced_price or Decimal("0"),
+                "shipping_charges": item_in.shipping_charges or Decimal("0"),
+                "tax": item_in.tax or Decimal("0"),
+                "product_type": item_in.product_type,
+                "category": item_in.category,
+                "sku_efficiency": target - sourced,
+            })
+    if item_rows:
+        await db.execute(insert(models.SourcingItem), item_rows)
+
+    # Bulk INSERTs skip the flush hooks, so refresh totals and rollups directly
+    def refresh_derived(session):
+        connection = session.connection()
+        models.recompute_sourcing_totals(connection, order_ids)
+        report_service.update_reports(connection, order_ids)
+
+    await db.run_sync(refresh_derived)
+    await db.commit()
+    if assigned:
+        report_service.forget_purchaser_stats(current_user.id)
+    # Bulk INSERTs skip the flush hooks the event feed listens on too
+    for row, order_id in zip(order_rows, order_ids):
+        event_service.publish_order_event(
+            event_service.CREATED, order_id, row["status"], row["sourcer_id"], row["purchaser_id"]
+        )
+    return model_response(List[schemas.SourcingBulkResult], results)
+
+
+@router.get(
+    "/pending",
+    response_model=List[schemas.SourcingID],
+    responses={200: {"description": "`view=summary` returns a list of SourcingIDSummary instead"}},
+)
+async def list_pending_requests(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
     if current_user.role != models.UserRole.purchaser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
-    return (
-        db.query(models.SourcingID)
-        .options(joinedload(models.SourcingID.items))
-        .filter(models.SourcingID.status == models.SourcingItemStatus.Pending)
-        .all()
+    conditions = [models.SourcingID.status == models.SourcingItemStatus.Pending]
+    return await _order_page(db, response, conditions, cursor, limit, view)
+
+
+def _sse(event_type: str, data: dict, event_id: int | None = None) -> str:
+    lines = [f"id: {event_id}"] if event_id is not None else []
+    lines += [f"event: {event_type}", f"data: {json.dumps(data, separators=(',', ':'))}"]
+    return "\n".join(lines) + "\n\n"
+
+
+async def _order_event_stream(current_user, sourcing_id: int | None, last_event_id: int | None):
+    queue, complete = event_service.broadcaster.subscribe(last_event_id)
+    try:
+        if not complete:
+            # Some events since Last-Event-ID are gone; the client should reload its lists
+            yield _sse("resync", {})
+        last_sent = last_event_id or 0
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), settings.EVENTS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            if event is CLOSED:
+                # Dropped for falling behind; the client reconnects with Last-Event-ID
+                return
+            if event.id <= last_sent:
+                continue  # already replayed from the history
+            last_sent = event.id
+            if sourcing_id is not None and event.data["sourcing_id"] != sourcing_id:
+                continue
+            if event_service.can_see(current_user, event.type, event.data):
+                yield _sse(event.type, event.data, event.id)
+    finally:
+        event_service.broadcaster.unsubscribe(queue)
+
+
+@router.get("/events", response_class=StreamingResponse)
+async def stream_order_events(
+    sourcing_id: Optional[int] = None,
+    last_event_id: Optional[int] = Header(None),
+    current_user: models.User = Depends(deps.get_current_user_async),
+):
+    """
+    Server-sent events for orders the caller can see, replacing polling of the
+    pending list and the order detail: order.created, order.assigned,
+    order.status_changed, order.items_changed and order.updated. Each carries
+    the order id, status and owners; fetch the order itself (with its ETag) to
+    get the new state. `sourcing_id` narrows the stream to one order.
+    Reconnecting with Last-Event-ID replays missed events, or sends `resync`
+    when they are no longer held. Events reach clients of the same worker only.
+    """
+    return StreamingResponse(
+        _order_event_stream(current_user, sourcing_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
+async def _claim(db: AsyncSession, target, current_user):
+    """Runs sourcing_service.claim and returns the claimed order id, or None."""
+    claimed = await db.run_sync(lambda session: sourcing_service.claim(
+        session.connection(), target, current_user.id, datetime.now(timezone.utc)
+    ))
+    if claimed is None:
+        await db.rollback()
+        return None
+    await db.commit()
+    report_service.forget_purchaser_stats(current_user.id)
+    event_service.publish_order_event(
+        event_service.ASSIGNED, claimed.id, models.SourcingItemStatus.Assigned, claimed.sourcer_id, current_user.id
+    )
+    return claimed.id
+
+
+@router.post("/claim-next", response_model=schemas.SourcingID)
+async def claim_next_pending_request(
+    market: Optional[models.Market] = None,
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
+):
+    """
+    Assigns the oldest pending order (optionally of one market, or with an
+    item in one category) to the caller. The pick locks one pending row and
+    a version-checked UPDATE assigns it; on PostgreSQL rows other purchasers
+    are claiming are skipped rather than waited on. 404 when nothing is left
+    to claim.
+    """
+    if current_user.role != models.UserRole.purchaser:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
+    sourcing_id = await _claim(db, sourcing_service.next_pending_order(market, category), current_user)
+    if sourcing_id is None:
+        raise HTTPException(status_code=404, detail="No pending requests to claim")
+    return model_response(schemas.SourcingID, await _load_order(db, sourcing_id, refresh=True))
+
+
 @router.post("/{sourcing_id}/assign", response_model=schemas.SourcingID)
-def assign_request_to_self(
+async def assign_request_to_self(
     sourcing_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
     if current_user.role != models.UserRole.purchaser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
 
-    sourcing_request = (
-        db.query(models.SourcingID)
-        .options(joinedload(models.SourcingID.items))
-        .filter(models.SourcingID.id == sourcing_id)
-        .first()
-    )
-    if not sourcing_request:
-        raise HTTPException(status_code=404, detail="Sourcing ID not found")
-    if sourcing_request.status != models.SourcingItemStatus.Pending:
+    # Conditional UPDATE, so two purchasers assigning at once cannot both win
+    if await _claim(db, sourcing_id, current_user) is None:
+        exists = await db.scalar(select(models.SourcingID.id).where(models.SourcingID.id == sourcing_id))
+        if exists is None:
+            raise HTTPException(status_code=404, detail="Sourcing ID not found")
         raise HTTPException(status_code=400, detail="Request is not pending and cannot be assigned")
-    sourcing_request.status = models.SourcingItemStatus.Assigned
-    sourcing_request.purchaser_id = current_user.id
-    sourcing_request.assigned_at = datetime.now(timezone.utc)
-    db.commit()
-    db.refresh(sourcing_request)
-    return sourcing_request
+    return model_response(schemas.SourcingID, await _load_order(db, sourcing_id, refresh=True))
 
 
 @router.put("/{sourcing_id}", response_model=schemas.SourcingID)
-def update_sourcing_order_by_purchaser(
+async def update_sourcing_order_by_purchaser(
     sourcing_id: int,
     sourcing_in: schemas.SourcingIDUpdate,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
-    order = (
-        db.query(models.SourcingID)
-          .options(joinedload(models.SourcingID.items))
-          .filter(models.SourcingID.id == sourcing_id)
-          .first()
-    )
+    order = await _load_order(db, sourcing_id)
     if not order:
         raise HTTPException(status_code=404, detail="Sourcing ID not found")
     if current_user.role == models.UserRole.purchaser and order.purchaser_id != current_user.id:
@@ -154,41 +438,28 @@ def update_sourcing_order_by_purchaser(
         if hasattr(order, field):
             setattr(order, field, val)
 
-    # recompute totals immediately on update
-    total_target = sum(
-        Decimal(str(item.target_cost_per_unit or 0)) * Decimal(item.quantity_needed or 1)
-        for item in order.items
-    )
-    total_actual = (
-        Decimal(str(order.sellers_price or 0))
-      + Decimal(str(order.shipping_price or 0))
-      + Decimal(str(order.tax or 0))
-    )
-
-    order.target_total  = total_target
-    order.sourced_price = total_actual
-    order.savings       = total_target - total_actual
-
+    # totals are recomputed on flush unless is_manual_override is set
     order.purchaser_action_time = datetime.now(timezone.utc)
+    if order.status in report_service.CLOSED_STATUSES and order.finalized_at is None:
+        order.finalized_at = order.purchaser_action_time
 
     db.add(order)
-    db.commit()
-    db.refresh(order)
-    return order
+    await db.commit()
+    report_service.forget_purchaser_stats(order.purchaser_id)
+    return model_response(schemas.SourcingID, await _load_order(db, sourcing_id, refresh=True))
 
 
 @router.patch("/items/{item_id}", response_model=schemas.SourcingItem)
-def update_sourcing_item(
+async def update_sourcing_item(
     item_id: int,
     item_in: schemas.SourcingItemUpdate,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
-    item_obj = (
-        db.query(models.SourcingItem)
-          .join(models.SourcingID)
-          .filter(models.SourcingItem.id == item_id)
-          .first()
+    item_obj = await db.scalar(
+        select(models.SourcingItem)
+          .options(*loaders.ITEM_WITH_ORDER)
+          .where(models.SourcingItem.id == item_id)
     )
     if not item_obj:
         raise HTTPException(status_code=404, detail="Sourcing item not found")
@@ -197,116 +468,105 @@ def update_sourcing_item(
     # Get all PATCHed values (only sent fields)
     update_data = item_in.model_dump(exclude_unset=True)
 
-    # If SKU is present, validate and auto-populate only missing (not user-sent) fields from MasterProduct
+    prod = None
     if "sku" in update_data:
-        prod = db.query(models.MasterProduct).filter_by(sku=update_data["sku"]).first()
+        prod = await product_service.get_product_by_sku(db, update_data["sku"])
         if not prod:
             raise HTTPException(status_code=404, detail=f"Product with SKU {update_data['sku']} not found")
-        # Only set from master if not PATCHed by user and only if attribute exists
-        possible_fields = [
-            "product_name", "type_code", "brnd_cod", "model_code", "abbr_code",
-            "color_code", "cnd_code", "regular_price", "price",
-            "target_cost_per_unit", "product_type", "category"
-        ]
-        for k in possible_fields:
-            if hasattr(prod, k):
-                update_data.setdefault(k, getattr(prod, k))
-        update_data["product_id"] = prod.id
-        update_data["uid"] = prod.id
+    _apply_item_update(item_obj, update_data, prod)
 
-    # Apply all user PATCHed values (overwrite everything)
-    for field, value in update_data.items():
-        setattr(item_obj, field, value)
-
-    # --- Recalculate per-item totals & efficiency ---
-        item_obj.item_target_total = (
-        Decimal(item_obj.target_cost_per_unit or 0)
-        * Decimal(item_obj.quantity_needed or 1)
-    )
-    item_obj.sku_efficiency = (
-        Decimal(item_obj.item_target_total or 0)
-        - (Decimal(item_obj.sourced_price or 0) + Decimal(item_obj.shipping_charges or 0) + Decimal(item_obj.tax or 0))
-    )
-    item_obj.shipping_charges = item_obj.shipping_charges or Decimal("0")
-    item_obj.tax = item_obj.tax or Decimal("0")
-
-
-
-    # update order-level if no manual override
-    order = item_obj.sourcing_order
+    # order-level totals are recomputed on flush unless is_manual_override is set
     order.purchaser_action_time = datetime.now(timezone.utc)
-    if not order.is_manual_override:
-        order.target_total = sum(
-            Decimal(i.target_cost_per_unit or 0) * Decimal(i.quantity_needed or 1)
-            for i in order.items
-        )
-        order.sourced_price = sum(
-            (Decimal(i.sourced_price or 0) + Decimal(i.shipping_charges or 0) + Decimal(i.tax or 0))
-            * Decimal(i.quantity_needed or 1)
-            for i in order.items
-        )
-        order.savings = order.target_total - order.sourced_price
 
     db.add(item_obj)
-    db.commit()
-    db.refresh(item_obj)
-    return item_obj
-
-@router.get("/assigned/me", response_model=List[schemas.SourcingID])
-def list_my_assigned_requests(
+    await db.commit()
+    await db.refresh(item_obj)
+    return model_response(schemas.SourcingItem, item_obj)
+
+@router.get(
+    "/assigned/me",
+    response_model=List[schemas.SourcingID],
+    responses={200: {"description": "`view=summary` returns a list of SourcingIDSummary instead"}},
+)
+async def list_my_assigned_requests(
+    response: Response,
     status_filter: Optional[str] = None,
     start_date: Optional[datetime] = Query(None),
     end_date: Optional[datetime] = Query(None),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    view: Literal["full", "summary"] = "full",
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
     if current_user.role != models.UserRole.purchaser:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not enough permissions")
-    query = (
-        db.query(models.SourcingID)
-        .options(joinedload(models.SourcingID.items))
-        .filter(models.SourcingID.purchaser_id == current_user.id)
-    )
+    conditions = [models.SourcingID.purchaser_id == current_user.id]
     if status_filter:
-        query = query.filter(models.SourcingID.status == status_filter)
+        conditions.append(models.SourcingID.status == status_filter)
     if start_date and end_date:
-        query = query.filter(models.SourcingID.created_at.between(start_date, end_date))
+        conditions.append(models.SourcingID.created_at.between(start_date, end_date))
     elif start_date:
-        query = query.filter(models.SourcingID.created_at >= start_date)
+        conditions.append(models.SourcingID.created_at >= start_date)
     elif end_date:
-        query = query.filter(models.SourcingID.created_at <= end_date)
-    return query.all()
+        conditions.append(models.SourcingID.created_at <= end_date)
+    return await _order_page(db, response, conditions, cursor, limit, view)
+
+
+def _check_can_view(current_user, order):
+    # allow purchasers to view pending orders
+    if current_user.role == models.UserRole.purchaser and order.status == models.SourcingItemStatus.Pending:
+        return
+    if order.sourcer_id != current_user.id and order.purchaser_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized to view this request")
 
 
 @router.get("/{sourcing_id}", response_model=schemas.SourcingID)
-def read_sourcing_request(
+async def read_sourcing_request(
     sourcing_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
-    sourcing_request = (
-        db.query(models.SourcingID)
-        .options(joinedload(models.SourcingID.items))
-        .filter(models.SourcingID.id == sourcing_id)
-        .first()
-    )
-    # allow purchasers to view pending orders
-    if current_user.role == models.UserRole.purchaser and sourcing_request.status == models.SourcingItemStatus.Pending:
-        return sourcing_request
-    if sourcing_request.sourcer_id != current_user.id and sourcing_request.purchaser_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized to view this request")
-    return sourcing_request
+    """
+    The ETag follows the order's version counter, which every write to the
+    order or its items bumps. A matching If-None-Match gets a 304 after one
+    single-row lookup, without loading the items.
+    """
+    if if_none_match:
+        head = (await db.execute(
+            select(
+                models.SourcingID.version,
+                models.SourcingID.status,
+                models.SourcingID.sourcer_id,
+                models.SourcingID.purchaser_id,
+            ).where(models.SourcingID.id == sourcing_id)
+        )).one_or_none()
+        if head is None:
+            raise HTTPException(status_code=404, detail="Sourcing ID not found")
+        _check_can_view(current_user, head)
+        etag = make_etag("sourcing", sourcing_id, head.version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    sourcing_request = await _load_order(db, sourcing_id)
+    if not sourcing_request:
+        raise HTTPException(status_code=404, detail="Sourcing ID not found")
+    _check_can_view(current_user, sourcing_request)
+    response.headers[ETAG_HEADER] = make_etag("sourcing", sourcing_id, sourcing_request.version)
+    return model_response(schemas.SourcingID, sourcing_request, response)
 
 
 @router.post("/{sourcing_id}/items", response_model=schemas.SourcingItem)
-def add_sourcing_item(
+async def add_sourcing_item(
     sourcing_id: int,
     item_in: schemas.SourcingItemCreate,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
     # Check if sourcing order exists
-    sourcing_order = db.query(models.SourcingID).filter(models.SourcingID.id == sourcing_id).first()
+    sourcing_order = await db.get(models.SourcingID, sourcing_id, options=loaders.ORDER_KEY_ONLY)
     if not sourcing_order:
         raise HTTPException(status_code=404, detail="Sourcing order not found")
 
@@ -315,80 +575,85 @@ def add_sourcing_item(
         raise HTTPException(status_code=403, detail="Not authorized to add items")
 
     # Get product by SKU
-    prod = db.query(models.MasterProduct).filter_by(sku=item_in.sku).first()
+    prod = await product_service.get_product_by_sku(db, item_in.sku)
     if not prod:
         raise HTTPException(status_code=404, detail=f"Product with SKU {item_in.sku} not found")
 
-    # Extract fields with defaults
-    quantity_needed = item_in.quantity_needed or 1
-    sourced_price = item_in.sourced_price or 0
-    shipping_charges = item_in.shipping_charges or 0
-    product_condition = item_in.product_condition or "Excellent"
-
-    # Create new sourcing item
-    new_item = models.SourcingItem(
-        sourcing_id=sourcing_id,
-        product_id=prod.id,
-        product_name=prod.product_name,
-        target_cost_per_unit=prod.target_cost_per_unit,
-        product_type=prod.product_type,
-        category=prod.category,
-        sku=item_in.sku,
-        quantity_needed=quantity_needed,
-        sourced_price=sourced_price,
-        shipping_charges=shipping_charges,
-        product_condition=product_condition,
-        sku_efficiency=(sourced_price - prod.target_cost_per_unit)
-    )
+    new_item = _new_item(sourcing_id, item_in, prod)
 
+    # Order totals are recomputed on flush unless is_manual_override is set
     db.add(new_item)
-    db.flush()  # So sourcing_order.items includes the new item
+    await db.commit()
+    await db.refresh(new_item)
 
-    # Recalculate totals if no manual override
-    if not sourcing_order.is_manual_override:
-        sourcing_order.target_total = sum(
-            (i.target_cost_per_unit or 0) * (i.quantity_needed or 1) for i in sourcing_order.items
-        )
-        sourcing_order.total_actual_cost = sum(
-            ((i.sourced_price or 0) + (i.shipping_charges or 0) + (i.tax or 0)) * (i.quantity_needed or 1)
-            for i in sourcing_order.items
-        )
-        sourcing_order.savings = sourcing_order.target_total - sourcing_order.total_actual_cost
-        db.add(sourcing_order)
+    return model_response(schemas.SourcingItem, new_item)
 
-    db.commit()
-    db.refresh(new_item)
 
-    return new_item
+@router.patch("/{sourcing_id}/items", response_model=schemas.SourcingID)
+async def batch_update_sourcing_items(
+    sourcing_id: int,
+    batch: schemas.SourcingItemBatch,
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
+):
+    """
+    Adds, updates and deletes items of one order in a single transaction.
+    Every referenced SKU is resolved in one query and the order totals are
+    recomputed once, on the final flush. Nothing is applied if any item id or
+    SKU is unknown.
+    """
+    order = await _load_order(db, sourcing_id)
+    if not order:
+        raise HTTPException(status_code=404, detail="Sourcing order not found")
+    if current_user.id not in [order.sourcer_id, order.purchaser_id]:
+        raise HTTPException(status_code=403, detail="Not authorized to edit items")
+
+    items_by_id = {item.id: item for item in order.items}
+    updated_ids = [item_in.id for item_in in batch.update]
+    unknown_ids = sorted(set(updated_ids + batch.delete) - items_by_id.keys())
+    if unknown_ids:
+        raise HTTPException(status_code=404, detail=f"Sourcing items not found on this order: {unknown_ids}")
+    if len(set(updated_ids)) != len(updated_ids) or set(updated_ids) & set(batch.delete):
+        raise HTTPException(status_code=400, detail="Each item may be updated or deleted at most once")
+
+    updates = [(item_in.id, item_in.model_dump(exclude_unset=True, exclude={"id"})) for item_in in batch.update]
+    skus = {item_in.sku for item_in in batch.add}
+    skus.update(data["sku"] for _, data in updates if "sku" in data)
+    products = await product_service.get_products_by_sku(db, skus)
+    unknown_skus = sorted(str(sku) for sku in skus - products.keys())
+    if unknown_skus:
+        raise HTTPException(status_code=404, detail=f"Products not found for SKUs: {unknown_skus}")
+
+    for item_id in batch.delete:
+        await db.delete(items_by_id[item_id])
+    for item_id, update_data in updates:
+        prod = products[update_data["sku"]] if "sku" in update_data else None
+        _apply_item_update(items_by_id[item_id], update_data, prod)
+    for item_in in batch.add:
+        db.add(_new_item(sourcing_id, item_in, products[item_in.sku]))
+
+    # order-level totals are recomputed on flush unless is_manual_override is set
+    order.purchaser_action_time = datetime.now(timezone.utc)
+    await db.commit()
+    return model_response(schemas.SourcingID, await _load_order(db, sourcing_id, refresh=True))
 
 
 @router.delete("/items/{item_id}", status_code=204)
-def delete_sourcing_item(
+async def delete_sourcing_item(
     item_id: int,
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_async_db),
+    current_user: models.User = Depends(deps.get_current_user_async),
 ):
-    item = db.query(models.SourcingItem).get(item_id)
+    item = await db.get(
+        models.SourcingItem, item_id, options=loaders.ITEM_WITH_ORDER_OWNERS
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     order = item.sourcing_order
     # authorization: only sourcer or purchaser on that order
     if current_user.id not in [order.sourcer_id, order.purchaser_id]:
         raise HTTPException(status_code=403, detail="Not authorized to delete item")
-    db.delete(item)
-    db.flush()
-    # update totals if no manual override
-    if not order.is_manual_override:
-        order.target_total = sum(
-            Decimal(i.target_cost_per_unit or 0) * Decimal(i.quantity_needed or 1)
-            for i in order.items
-        )
-        order.sourced_price = sum(
-            (Decimal(i.sourced_price or 0) + Decimal(i.shipping_charges or 0) + Decimal(i.tax or 0))
-            * Decimal(i.quantity_needed or 1)
-            for i in order.items
-        )
-        order.savings = order.target_total - order.sourced_price
-        db.add(order)
-    db.commit()
-    return
\ No newline at end of file
+    # totals are recomputed on flush unless is_manual_override is set
+    await db.delete(item)
+    await db.commit()
+    return
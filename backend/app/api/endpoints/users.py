@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
 from ... import schemas
 from ...db import models
 from .. import deps
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, keyset_page
 from ...core import security
 
 router = APIRouter()
@@ -43,18 +44,23 @@ def create_user(user: schemas.UserCreate, db: Session = Depends(deps.get_db)):
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
     current_user: models.User = Depends(deps.get_current_user)
 ):
     """
     Retrieve all users. Accessible only by admins.
+    Pass the X-Next-Cursor header back as `cursor` to page by key instead of `skip`.
     """
     if current_user.role != models.UserRole.admin:
         raise HTTPException(status_code=403, detail="Not enough permissions")
     
-    users = db.query(models.User).offset(skip).limit(limit).all()
+    users = keyset_page(
+        db.query(models.User), response, [models.User.id], cursor=cursor, limit=limit, skip=skip
+    )
     return users
 
 @router.get("/me", response_model=schemas.User)
@@ -83,6 +89,7 @@ def update_user(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
+    previous_email = user.email
     update_data = user_in.model_dump(exclude_unset=True)
     if "password" in update_data and update_data["password"]:
         update_data["hashed_password"] = security.get_password_hash(update_data["password"])
@@ -94,6 +101,7 @@ def update_user(
     db.add(user)
     db.commit()
     db.refresh(user)
+    deps.forget_user(previous_email, user.email)
     return user
 
 
@@ -119,4 +127,5 @@ def delete_user(
 
     db.delete(user)
     db.commit()
+    deps.forget_user(user.email)
     return user
\ No newline at end of file
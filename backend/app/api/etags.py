@@ -0,0 +1,34 @@
+import hashlib
+
+from fastapi import Response
+
+ETAG_HEADER = "ETag"
+
+
+def make_etag(*parts) -> str:
+    """Strong entity tag over `parts` (ids and version counters)."""
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    True when an If-None-Match header value names `etag`. Uses the weak
+    comparison RFC 9110 prescribes for If-None-Match, so a W/ prefix added by a
+    proxy still matches; `*` matches any current representation.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    if "*" in candidates:
+        return True
+    return etag.removeprefix("W/") in (tag.removeprefix("W/") for tag in candidates)
+
+
+def not_modified(etag: str, response: Response | None = None) -> Response:
+    """Empty 304 carrying the ETag and any headers already set on the injected `response`."""
+    headers = {}
+    if response is not None:
+        headers.update((k, v) for k, v in response.headers.items() if k != "content-length")
+    headers[ETAG_HEADER] = etag
+    return Response(status_code=304, headers=headers)
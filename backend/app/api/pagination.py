@@ -0,0 +1,82 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+
+from fastapi import HTTPException, Response
+from sqlalchemy import DateTime, literal, tuple_
+
+# Clients read the cursor for the following page from this header, so the
+# list endpoints can keep returning a plain JSON array.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def encode_cursor(*values) -> str:
+    """Packs the sort-key values of the last row into an opaque token."""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, columns) -> list:
+    """Unpacks a cursor produced by encode_cursor for the given sort columns."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError(cursor)
+        return [
+            datetime.fromisoformat(v) if isinstance(col.type, DateTime) else v
+            for col, v in zip(columns, values)
+        ]
+    except (ValueError, TypeError, binascii.Error):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def keyset_query(query, columns, cursor: str | None = None, limit: int = DEFAULT_PAGE_SIZE, skip: int = 0, descending: bool = False):
+    """
+    Orders `query` (a legacy Query or a 2.0 select) by `columns` and seeks past
+    `cursor` with a row-value comparison instead of OFFSET, so every page costs
+    the same regardless of depth. `skip` is only honoured without a cursor, for
+    the older offset-style callers. Fetches one extra row to detect a next page
+    (just that row when `limit` is below 1, which finish_page then drops).
+    """
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        key = tuple_(*columns)
+        after = tuple_(*(literal(v, col.type) for col, v in zip(columns, values)))
+        query = query.filter(key < after if descending else key > after)
+
+    query = query.order_by(*(col.desc() if descending else col for col in columns))
+    if skip and not cursor:
+        query = query.offset(skip)
+    return query.limit(max(limit, 0) + 1)
+
+
+def finish_page(rows, response: Response, columns, limit: int = DEFAULT_PAGE_SIZE):
+    """Trims the look-ahead row from a keyset_query result and sets the next-page cursor header."""
+    rows = list(rows)
+    if limit < 1:
+        return []
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(*(getattr(last, col.key) for col in columns))
+    return rows
+
+
+def keyset_page(
+    query,
+    response: Response,
+    columns,
+    cursor: str | None = None,
+    limit: int = DEFAULT_PAGE_SIZE,
+    skip: int = 0,
+    descending: bool = False,
+):
+    """Runs keyset_query on a sync Query and returns one page of rows."""
+    rows = keyset_query(query, columns, cursor=cursor, limit=limit, skip=skip, descending=descending).all()
+    return finish_page(rows, response, columns, limit)
@@ -0,0 +1,27 @@
+from functools import lru_cache
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def _adapter(schema) -> TypeAdapter:
+    return TypeAdapter(schema)
+
+
+def model_response(schema, content, response: Response | None = None, status_code: int = 200) -> Response:
+    """
+    Serialises `content` (ORM objects, dicts or schema instances) as `schema`
+    straight to JSON bytes with pydantic-core. FastAPI's own path for a
+    response_model validates the value, dumps it back to Python objects and
+    then runs json.dumps; this validates once and encodes once. Keep
+    `response_model=` on the route for the OpenAPI schema. Headers set on the
+    injected `response` (e.g. X-Next-Cursor) are carried over, since FastAPI
+    drops them when an endpoint returns its own Response.
+    """
+    adapter = _adapter(schema)
+    body = adapter.dump_json(adapter.validate_python(content, from_attributes=True), by_alias=True)
+    headers = None
+    if response is not None:
+        headers = {k: v for k, v in response.headers.items() if k != "content-length"}
+    return Response(body, status_code=status_code, media_type="application/json", headers=headers)
@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any
+
+# Put on a subscriber's queue when it is dropped, so its stream can end
+CLOSED = None
+
+
+@dataclass(frozen=True)
+class Event:
+    id: int
+    type: str
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+class Broadcaster:
+    """
+    In-process fan-out of events to async subscribers, one bounded queue each.
+
+    `publish` may be called from any thread; delivery always happens on the
+    event loop the subscribers live on. A subscriber whose queue fills up is
+    dropped rather than slowing the publisher down, and can reconnect with the
+    last id it saw to replay what it missed from the recent history. Only
+    reaches clients of the same process.
+    """
+
+    def __init__(self, queue_size: int = 256, history: int = 1024, idle_grace: float = 60):
+        self.queue_size = queue_size
+        self.idle_grace = idle_grace
+        self._history: deque[Event] = deque(maxlen=history)
+        self._last_id = 0
+        self._subscribers: set[asyncio.Queue] = set()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._lock = threading.Lock()
+        self._idle_since = float("-inf")
+        self.dropped = 0
+
+    @property
+    def listening(self) -> bool:
+        """
+        True while anyone is subscribed, or recently was and may reconnect.
+        Publishers can skip building events otherwise.
+        """
+        return bool(self._subscribers) or time.monotonic() - self._idle_since < self.idle_grace
+
+    def publish(self, type: str, **data) -> Event:
+        with self._lock:
+            self._last_id += 1
+            event = Event(self._last_id, type, data)
+            self._history.append(event)
+            loop = self._loop
+        if loop is None or loop.is_closed():
+            return event
+        try:
+            on_loop = asyncio.get_running_loop() is loop
+        except RuntimeError:
+            on_loop = False
+        if on_loop:
+            self._deliver(event)
+        else:
+            try:
+                loop.call_soon_threadsafe(self._deliver, event)
+            except RuntimeError:
+                pass  # loop closed in the meantime
+        return event
+
+    def _deliver(self, event: Event):
+        for queue in list(self._subscribers):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                self._drop(queue)
+
+    def _drop(self, queue: asyncio.Queue):
+        self.unsubscribe(queue)
+        self.dropped += 1
+        while not queue.empty():
+            queue.get_nowait()
+        queue.put_nowait(CLOSED)
+
+    def subscribe(self, last_event_id: int | None = None) -> tuple[asyncio.Queue, bool]:
+        """
+        Registers a subscriber on the running loop. With `last_event_id`,
+        events after it are queued first from the history; the second value
+        is False when some of them have already been evicted from it.
+        """
+        queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        complete = True
+        with self._lock:
+            self._loop = asyncio.get_running_loop()
+            if last_event_id is not None:
+                missed = [e for e in self._history if e.id > last_event_id]
+                oldest = self._history[0].id if self._history else self._last_id + 1
+                # An id from the future means this process restarted since the client's last event
+                complete = (
+                    oldest <= last_event_id + 1 <= self._last_id + 1 and len(missed) <= self.queue_size
+                )
+                for event in missed[-self.queue_size:]:
+                    queue.put_nowait(event)
+            self._subscribers.add(queue)
+        return queue, complete
+
+    def unsubscribe(self, queue: asyncio.Queue):
+        with self._lock:
+            if queue in self._subscribers:
+                self._subscribers.discard(queue)
+                if not self._subscribers:
+                    self._idle_since = time.monotonic()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "subscribers": len(self._subscribers),
+                "published": self._last_id,
+                "dropped": self.dropped,
+                "history": len(self._history),
+            }
+
@@ -3,12 +3,49 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     # Database settings
     DATABASE_URL: str
+    # Defaults to DATABASE_URL with the asyncio driver swapped in
+    ASYNC_DATABASE_URL: str | None = None
+
+    # Connection pool settings (ignored for SQLite), applied to both engines
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30           # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = -1           # seconds before a connection is replaced; -1 never
+    DB_POOL_PRE_PING: bool = False
+    DB_STATEMENT_TIMEOUT_MS: int | None = None  # PostgreSQL statement_timeout per connection
 
     # JWT settings
     SECRET_KEY: str
     ALGORITHM: str
     ACCESS_TOKEN_EXPIRE_MINUTES: int
 
+    # In-process cache of the authenticated user and decoded tokens; 0 disables both
+    AUTH_CACHE_TTL_SECONDS: int = 60
+    AUTH_CACHE_MAX_ENTRIES: int = 1024
+
+    # In-process SKU -> master product cache used by the sourcing item endpoints; 0 disables it
+    PRODUCT_CACHE_TTL_SECONDS: int = 300
+    PRODUCT_CACHE_MAX_ENTRIES: int = 5000
+
+    # Per-process cache of each purchaser's dashboard counts; 0 disables it
+    PURCHASER_STATS_CACHE_TTL_SECONDS: int = 10
+    PURCHASER_STATS_CACHE_MAX_ENTRIES: int = 1024
+
+    # Per-process order event feed (GET /sourcing/events): per-client queue length,
+    # events kept for Last-Event-ID replay, and seconds between keep-alive comments
+    EVENTS_QUEUE_SIZE: int = 256
+    EVENTS_HISTORY_SIZE: int = 1024
+    EVENTS_HEARTBEAT_SECONDS: int = 15
+
+    # Background report jobs (POST /reports/jobs): worker threads per process, where
+    # finished files are written, how long they are kept (0 keeps them forever), and
+    # how long a running job may go without a heartbeat before a restarted worker
+    # picks it up again
+    REPORT_JOB_WORKERS: int = 2
+    REPORT_JOB_DIR: str = "report_jobs"
+    REPORT_JOB_RESULT_TTL_SECONDS: int = 86400
+    REPORT_JOB_STALE_SECONDS: int = 300
+
     # Load settings from the .env file
     model_config = SettingsConfigDict(env_file=".env")
 
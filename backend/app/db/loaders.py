@@ -0,0 +1,40 @@
+"""
+Named loader option sets for the sourcing endpoints. Relationships are lazy by
+default and lazy loads cannot run under asyncio anyway, so each endpoint opts
+into what its response schema serialises and raiseload() turns anything else
+into an immediate error instead of a hidden query.
+
+raiseload(sql_only=True) still lets a many-to-one resolve from the identity
+map (e.g. item.sourcing_order when the order is already in the session).
+"""
+from sqlalchemy.orm import joinedload, load_only, raiseload, selectinload
+
+from .models import SourcingID, SourcingItem
+
+# Order list and detail views (schemas.SourcingID): every order column plus
+# its items in one SELECT ... WHERE sourcing_id IN (...) per page.
+ORDER_WITH_ITEMS = (
+    selectinload(SourcingID.items).raiseload("*", sql_only=True),
+    raiseload("*", sql_only=True),
+)
+
+# Item edit views: the item and its order in one row; the order is updated
+# alongside the item (purchaser_action_time) so all its columns are loaded.
+ITEM_WITH_ORDER = (
+    joinedload(SourcingItem.sourcing_order).raiseload("*", sql_only=True),
+    raiseload("*", sql_only=True),
+)
+
+# Authorisation checks on an item's order: only the ownership columns.
+ITEM_WITH_ORDER_OWNERS = (
+    joinedload(SourcingItem.sourcing_order)
+    .load_only(SourcingID.id, SourcingID.sourcer_id, SourcingID.purchaser_id)
+    .raiseload("*", sql_only=True),
+    raiseload("*", sql_only=True),
+)
+
+# Existence checks before adding to an order: the key only.
+ORDER_KEY_ONLY = (
+    load_only(SourcingID.id),
+    raiseload("*", sql_only=True),
+)
@@ -9,9 +9,15 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Numeric,
-    event
+    Date,
+    Float,
+    JSON,
+    UniqueConstraint,
+    Index,
+    DDL,
+    event,
+    text
 )
-from decimal import Decimal
 
 from sqlalchemy.orm import relationship, declarative_base
 from sqlalchemy.sql import func
@@ -76,6 +82,12 @@ class Carrier(str, enum.Enum):
     USPS = "USPS"
     UPS = "UPS"
 
+class JobStatus(str, enum.Enum):
+    queued = "queued"
+    running = "running"
+    succeeded = "succeeded"
+    failed = "failed"
+
 # ---------------- Models ----------------
 class User(Base):
     __tablename__ = "users"
@@ -92,8 +104,23 @@ class User(Base):
     purchased_items = relationship("SourcingID", foreign_keys="SourcingID.purchaser_id", back_populates="purchaser")
 
 
+def _trigram_index(column: str) -> Index:
+    """GIN trigram index (PostgreSQL only) serving ILIKE '%term%' and similarity search."""
+    return Index(
+        f"ix_master_products_{column}_trgm",
+        column,
+        postgresql_using="gin",
+        postgresql_ops={column: "gin_trgm_ops"},
+    ).ddl_if(dialect="postgresql")
+
+
 class MasterProduct(Base):
     __tablename__ = "master_products"
+    __table_args__ = (
+        _trigram_index("sku"),
+        _trigram_index("product_name"),
+        _trigram_index("category"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sku = Column(String, unique=True, index=True)
@@ -101,10 +128,39 @@ class MasterProduct(Base):
     target_cost_per_unit = Column(Numeric(10, 2), default=0)
     category = Column(String)
     product_type = Column(Enum(ProductType))
+    # Bumped on every write (see bump_versions); the catalogue ETags derive from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
+
+event.listen(
+    MasterProduct.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
 
 
 class SourcingID(Base):
     __tablename__ = "sourcing_ids"
+    # Matched to the list/dashboard queries; see scripts/explain_hot_queries.py
+    __table_args__ = (
+        Index("ix_sourcing_ids_purchaser_created", "purchaser_id", "created_at", "id"),
+        Index("ix_sourcing_ids_purchaser_status_created", "purchaser_id", "status", "created_at"),
+        Index(
+            "ix_sourcing_ids_purchaser_awaiting", "purchaser_id",
+            postgresql_where=text("tracking_status = 'Awaiting'"),
+            sqlite_where=text("tracking_status = 'Awaiting'"),
+        ),
+        Index("ix_sourcing_ids_sourcer_created", "sourcer_id", text("created_at DESC"), text("id DESC")),
+        Index(
+            "ix_sourcing_ids_pending_created", "created_at", "id",
+            postgresql_where=text("status = 'Pending'"),
+            sqlite_where=text("status = 'Pending'"),
+        ),
+        Index("ix_sourcing_ids_created_at", "created_at"),
+        # report_service.rebuild_series buckets by these
+        Index("ix_sourcing_ids_assigned_at", "assigned_at"),
+        Index("ix_sourcing_ids_finalized_at", "finalized_at"),
+    )
     id = Column(Integer, primary_key=True, index=True)
     seller_name = Column(String, nullable=True)
     listing_link = Column(String, nullable=True)
@@ -126,7 +182,7 @@ class SourcingID(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     assigned_at = Column(DateTime(timezone=True), nullable=True)
     purchaser_action_time = Column(DateTime(timezone=True), nullable=True)
-    finalized_at = Column(DateTime(timezone=True), nullable=True)
+    finalized_at = Column(DateTime(timezone=True), nullable=True)   # first moved to Purchased or Dropshipped
 
     sourcer_id = Column(Integer, ForeignKey("users.id"))
     purchaser_id = Column(Integer, ForeignKey("users.id"), nullable=True)
@@ -135,6 +191,8 @@ class SourcingID(Base):
     sourced_price = Column(Numeric(10, 2), default=0)
     savings = Column(Numeric(10, 2), default=0)
     is_manual_override = Column(Boolean, default=False)
+    # Bumped on every write to the order or its items (see bump_versions); the order ETag derives from it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     sourcer = relationship("User", foreign_keys=[sourcer_id], back_populates="sourcing_ids")
     purchaser = relationship("User", foreign_keys=[purchaser_id], back_populates="purchased_items")
@@ -147,7 +205,7 @@ from ..db.models import ProductType, ProductCondition  # Ensure enums are import
 class SourcingItem(Base):
     __tablename__ = "sourcing_items"
     id = Column(Integer, primary_key=True, index=True)
-    sourcing_id = Column(Integer, ForeignKey("sourcing_ids.id"))
+    sourcing_id = Column(Integer, ForeignKey("sourcing_ids.id"), index=True)
     product_id = Column(Integer, ForeignKey("master_products.id"), nullable=True)
 
     uid = Column(String, nullable=True)
@@ -180,44 +238,189 @@ class SourcingItem(Base):
     product_condition = Column(Enum(ProductCondition), nullable=True)
 
     sourcing_order = relationship("SourcingID", back_populates="items")
-    product = relationship("MasterProduct", backref="sourcing_items", lazy="joined")
+    product = relationship("MasterProduct", backref="sourcing_items")
+
+class ReportRollup(Base):
+    """
+    Daily summary of orders per reporting dimension, bucketed by the day the
+    order was created. Maintained by app.services.report_service.
+    """
+    __tablename__ = "report_daily_rollups"
+    __table_args__ = (UniqueConstraint("day", "dimension", "dimension_key", name="uq_report_rollup_bucket"),)
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False, index=True)
+    dimension = Column(String(16), nullable=False)   # sourcer, purchaser, market or category
+    dimension_key = Column(String, nullable=False)   # user id, market or category; "" when unset
+    orders = Column(Integer, default=0)
+    closed_orders = Column(Integer, default=0)       # Purchased or Dropshipped
+    savings = Column(Numeric(14, 2), default=0)      # catalogue target minus actual cost, closed orders only
+    response_seconds = Column(Float, default=0)      # sum of assigned_at - created_at
+    responded_orders = Column(Integer, default=0)
+
+
+class ReportJob(Base):
+    """
+    A report export or rebuild run in the background by
+    app.services.job_service; the row is the job's durable state, so queued
+    work survives a restart.
+    """
+    __tablename__ = "report_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(32), nullable=False)              # export or rebuild
+    params = Column(JSON, nullable=False, default=dict)
+    status = Column(Enum(JobStatus), nullable=False, default=JobStatus.queued, index=True)
+    requested_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)   # refreshed while running
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    progress = Column(Integer, nullable=False, default=0)           # rows written or days rebuilt
+    total = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    result_path = Column(String, nullable=True)                      # file under REPORT_JOB_DIR
+    result_size = Column(Integer, nullable=True)
+
+
+class ReportSeriesPoint(Base):
+    """
+    Daily value of one time-series metric, bucketed by the day the measured
+    event happened (creation, assignment or finalization). Duration metrics
+    store a histogram: one row per non-empty bucket of
+    report_service.DURATION_BUCKETS. Maintained by app.services.report_service.
+    """
+    __tablename__ = "report_daily_series"
+    __table_args__ = (UniqueConstraint("day", "metric", "bucket", name="uq_report_series_point"),)
+
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False, index=True)
+    metric = Column(String(32), nullable=False)
+    bucket = Column(Integer, nullable=False, default=-1)   # histogram bucket index; -1 for plain metrics
+    value = Column(Float, default=0)                       # count or sum for the day
+
 # ---------------- Event Listeners ----------------
-from sqlalchemy import select
-@event.listens_for(SourcingItem, "after_insert")
-@event.listens_for(SourcingItem, "after_update")
-@event.listens_for(SourcingItem, "after_delete")
-def update_sourcing_totals(mapper, connection, target):
-    sourcing_id = target.sourcing_id
+from sqlalchemy import inspect, select
+from sqlalchemy.orm import Session
+
+# Order columns that feed into the stored totals besides the items themselves.
+_ORDER_TOTAL_INPUTS = ("sellers_price", "shipping_price", "tax", "is_manual_override")
+
+
+def recompute_sourcing_totals(connection, sourcing_ids):
+    """
+    Recomputes target_total, sourced_price and savings for the given orders
+    with one UPDATE ... FROM over an aggregate of their items. The target is
+    the sum of item target cost x quantity; the actual cost is the order-level
+    sellers_price + shipping_price + tax. Orders with is_manual_override set
+    are left alone.
+    """
+    if not sourcing_ids:
+        return
     sourcing_table = SourcingID.__table__
     item_table = SourcingItem.__table__
-
-    sourcing_row = connection.execute(
-        select(sourcing_table).where(sourcing_table.c.id == sourcing_id)
-    ).fetchone()
-
-    if sourcing_row and not sourcing_row.is_manual_override:
-        items = connection.execute(
-            select(item_table).where(item_table.c.sourcing_id == sourcing_id)
-        ).fetchall()
-
-        total_target = sum(
-            Decimal(i.target_cost_per_unit or 0) * (i.quantity_needed or 1)
-            for i in items
+    order_alias = sourcing_table.alias("o")
+
+    targets = (
+        select(
+            order_alias.c.id.label("sourcing_id"),
+            func.coalesce(
+                func.sum(item_table.c.target_cost_per_unit * func.coalesce(item_table.c.quantity_needed, 1)),
+                0,
+            ).label("target_total"),
         )
-        # include sellers_price, shipping_price, and tax
-        total_actual = sum(
-            (Decimal(i.sourced_price or 0) + Decimal(i.shipping_charges or 0) + Decimal(i.tax or 0))
-            * Decimal(i.quantity_needed or 1)
-            for i in items
+        .select_from(order_alias.outerjoin(item_table, item_table.c.sourcing_id == order_alias.c.id))
+        .where(order_alias.c.id.in_(sorted(sourcing_ids)))
+        .group_by(order_alias.c.id)
+        .subquery("targets")
+    )
+    actual_cost = (
+        func.coalesce(sourcing_table.c.sellers_price, 0)
+        + func.coalesce(sourcing_table.c.shipping_price, 0)
+        + func.coalesce(sourcing_table.c.tax, 0)
+    )
+    connection.execute(
+        sourcing_table.update()
+        .where(sourcing_table.c.id == targets.c.sourcing_id)
+        .where(sourcing_table.c.is_manual_override.isnot(True))
+        .values(
+            target_total=targets.c.target_total,
+            sourced_price=actual_cost,
+            savings=targets.c.target_total - actual_cost,
         )
-        savings = total_target - total_actual
-
+    )
+
+
+def _sourcing_ids_touched(session):
+    """Collects the ids of every order whose totals may be stale after this flush."""
+    touched = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, SourcingItem):
+            history = inspect(obj).attrs.sourcing_id.history
+            touched.update(i for i in (obj.sourcing_id, *history.deleted) if i is not None)
+        elif isinstance(obj, SourcingID) and obj not in session.deleted:
+            state = inspect(obj)
+            if obj in session.new or any(state.attrs[k].history.has_changes() for k in _ORDER_TOTAL_INPUTS):
+                touched.add(obj.id)
+    return touched
+
+
+@event.listens_for(Session, "after_flush")
+def update_sourcing_totals(session, flush_context):
+    sourcing_ids = _sourcing_ids_touched(session)
+    if sourcing_ids:
+        recompute_sourcing_totals(session.connection(), sourcing_ids)
+        session.info.setdefault("stale_sourcing_totals", set()).update(sourcing_ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def expire_sourcing_totals(session, flush_context):
+    # The UPDATE above bypasses the ORM, so drop any in-memory copies of the totals.
+    for sourcing_id in session.info.pop("stale_sourcing_totals", ()):
+        order = session.identity_map.get(session.identity_key(SourcingID, sourcing_id))
+        if order is not None:
+            session.expire(order, ["target_total", "sourced_price", "savings"])
+
+
+def _versions_to_bump(session):
+    """
+    Ids of existing orders and products written by this flush. An order counts
+    as written when any of its items is added, changed or removed, since the
+    order detail response includes them.
+    """
+    orders, products = set(), set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, SourcingItem):
+            history = inspect(obj).attrs.sourcing_id.history
+            orders.update(i for i in (obj.sourcing_id, *history.deleted) if i is not None)
+        elif obj in session.new or obj in session.deleted:
+            continue
+        elif isinstance(obj, SourcingID) and session.is_modified(obj, include_collections=False):
+            orders.add(obj.id)
+        elif isinstance(obj, MasterProduct) and session.is_modified(obj, include_collections=False):
+            products.add(obj.id)
+    # Orders created in this flush start at version 1
+    orders.difference_update(o.id for o in session.new if isinstance(o, SourcingID))
+    return orders, products
+
+
+@event.listens_for(Session, "after_flush")
+def bump_versions(session, flush_context):
+    orders, products = _versions_to_bump(session)
+    connection = session.connection()
+    for model, ids in ((SourcingID, orders), (MasterProduct, products)):
+        if not ids:
+            continue
+        table = model.__table__
         connection.execute(
-            sourcing_table.update()
-            .where(sourcing_table.c.id == sourcing_id)
-            .values(
-                target_total=total_target,
-                sourced_price=total_actual,
-                savings=savings
-            )
-        )
\ No newline at end of file
+            table.update().where(table.c.id.in_(sorted(ids))).values(version=table.c.version + 1)
+        )
+        session.info.setdefault("stale_versions", []).extend((model, i) for i in ids)
+
+
+@event.listens_for(Session, "after_flush_postexec")
+def expire_versions(session, flush_context):
+    for model, ident in session.info.pop("stale_versions", ()):
+        obj = session.identity_map.get(session.identity_key(model, ident))
+        if obj is not None:
+            session.expire(obj, ["version"])
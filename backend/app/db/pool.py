@@ -0,0 +1,116 @@
+import threading
+import time
+from bisect import bisect_left
+
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Upper bounds (ms) of the checkout wait-time histogram buckets; the last bucket is open-ended.
+WAIT_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class PoolMetrics:
+    """Counters and a checkout wait-time histogram for one engine's pool."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool = None
+        self._lock = threading.Lock()
+        self.connects = 0
+        self.checkouts = 0
+        self.checkins = 0
+        self.invalidations = 0
+        self.wait_counts = [0] * (len(WAIT_BUCKETS_MS) + 1)
+        self.wait_sum_ms = 0.0
+        self.wait_max_ms = 0.0
+
+    def observe_wait(self, seconds: float):
+        waited_ms = seconds * 1000
+        with self._lock:
+            self.wait_counts[bisect_left(WAIT_BUCKETS_MS, waited_ms)] += 1
+            self.wait_sum_ms += waited_ms
+            self.wait_max_ms = max(self.wait_max_ms, waited_ms)
+
+    def _count(self, attr: str):
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def attach(self, pool):
+        """Hooks the pool's connect/checkout/checkin/invalidate events."""
+        self.pool = pool
+        event.listen(pool, "connect", lambda *args: self._count("connects"))
+        event.listen(pool, "checkout", lambda *args: self._count("checkouts"))
+        event.listen(pool, "checkin", lambda *args: self._count("checkins"))
+        event.listen(pool, "invalidate", lambda *args: self._count("invalidations"))
+
+    def snapshot(self) -> dict:
+        pool = self.pool
+        queue_pool = isinstance(pool, QueuePool)
+        with self._lock:
+            waits = sum(self.wait_counts)
+            return {
+                "name": self.name,
+                "pool_class": type(pool).__name__ if pool is not None else None,
+                "size": pool.size() if queue_pool else None,
+                "checked_out": pool.checkedout() if queue_pool else None,
+                "idle": pool.checkedin() if queue_pool else None,
+                "overflow": pool.overflow() if queue_pool else None,
+                "connects": self.connects,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "invalidations": self.invalidations,
+                "wait_count": waits,
+                "wait_avg_ms": (self.wait_sum_ms / waits) if waits else None,
+                "wait_max_ms": self.wait_max_ms,
+                "wait_histogram": [
+                    {"le_ms": bound, "count": count}
+                    for bound, count in zip(list(WAIT_BUCKETS_MS) + [None], self.wait_counts)
+                ],
+            }
+
+
+# One PoolMetrics per engine, keyed by name ("sync", "async")
+registry: dict[str, PoolMetrics] = {}
+
+
+class _TimedCheckout:
+    """
+    Times how long each checkout waits for a free connection (including opening
+    a new one). The pool events only fire after a connection is handed out, so
+    the wait has to be measured around the pool's internal get.
+    """
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.observe_wait(time.perf_counter() - started)
+
+    def recreate(self):
+        # engine.dispose() swaps in a fresh pool; keep reporting on it
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_TimedCheckout, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckout, AsyncAdaptedQueuePool):
+    pass
+
+
+def instrument(engine, name: str) -> PoolMetrics:
+    """Registers metrics for `engine`'s pool under `name`."""
+    metrics = registry[name] = PoolMetrics(name)
+    pool = engine.pool
+    if isinstance(pool, _TimedCheckout):
+        pool.metrics = metrics
+    metrics.attach(pool)
+    return metrics
@@ -1,9 +1,64 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from ..core.config import settings
+from .pool import InstrumentedAsyncQueuePool, InstrumentedQueuePool, instrument
+from .trigram import register_sqlite_functions
+
+
+def engine_options(url: str, asyncio: bool = False) -> dict:
+    """Pool and connection settings from Settings, for the given database URL."""
+    backend = make_url(url).get_backend_name()
+    if backend == "sqlite":
+        # SQLite picks its own pool per driver and has no server-side statement timeout
+        return {}
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if asyncio else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if backend == "postgresql" and settings.DB_STATEMENT_TIMEOUT_MS:
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def async_database_url(url: str) -> str:
+    """Maps a sync DATABASE_URL onto the matching asyncio driver (psycopg 3 / aiosqlite)."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        url = url.set(drivername="postgresql+psycopg")
+    elif backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+def _register_functions(engine):
+    # Product search calls pg_trgm functions; SQLite gets Python stand-ins
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", register_sqlite_functions)
+
 
 # Create the database engine using the URL from our settings
-engine = create_engine(settings.DATABASE_URL)
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+instrument(engine, "sync")
+_register_functions(engine)
 
 # Create a session maker that will be used to create individual database sessions
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# Async engine for the routers served by `async def` handlers. psycopg 3 picks its
+# async connection class automatically under create_async_engine.
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, asyncio=True))
+instrument(async_engine, "async")
+_register_functions(async_engine.sync_engine)
+
+# expire_on_commit is off because attribute access after commit cannot lazy-load
+# under asyncio; handlers re-select what they return instead.
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
@@ -0,0 +1,42 @@
+"""
+Pure-Python versions of pg_trgm's `similarity` and `word_similarity`, registered
+as SQL functions on SQLite connections so product search runs the same query
+on both backends. Scores follow pg_trgm's trigram extraction; word_similarity
+is approximated as the share of the search term's trigrams found in the text.
+"""
+import re
+from functools import lru_cache
+
+_WORD = re.compile(r"[^\W_]+")
+
+
+@lru_cache(maxsize=4096)
+def trigrams(text: str | None) -> frozenset:
+    """pg_trgm trigrams: each lower-cased word padded with two leading and one trailing space."""
+    if not text:
+        return frozenset()
+    grams = set()
+    for word in _WORD.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+def similarity(a: str | None, b: str | None) -> float:
+    left, right = trigrams(a), trigrams(b)
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def word_similarity(term: str | None, text: str | None) -> float:
+    wanted = trigrams(term)
+    if not wanted:
+        return 0.0
+    return len(wanted & trigrams(text)) / len(wanted)
+
+
+def register_sqlite_functions(dbapi_connection, connection_record=None):
+    """`connect` event listener for SQLite engines."""
+    dbapi_connection.create_function("similarity", 2, similarity, deterministic=True)
+    dbapi_connection.create_function("word_similarity", 2, word_similarity, deterministic=True)
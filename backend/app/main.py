@@ -1,15 +1,29 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .db.session import engine
 from .db import models
-from .api.endpoints import auth, users, sourcing, products, reports
+from .api.endpoints import auth, users, sourcing, products, reports, admin
+from .api.etags import ETAG_HEADER
+from .api.pagination import NEXT_CURSOR_HEADER
+from .services import job_service
 
 # This line creates all the database tables based on your models.py file
 models.Base.metadata.create_all(bind=engine)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Pick up report jobs left queued or stalled by a previous run
+    job_service.runner.resume()
+    yield
+    job_service.runner.shutdown()
+
+
 # Create the FastAPI application instance
-app = FastAPI(title="SourceHub API")
+app = FastAPI(title="SourceHub API", lifespan=lifespan)
 
 # Set up CORS (Cross-Origin Resource Sharing)
 origins = [
@@ -23,6 +37,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER],
 )
 
 # A simple test endpoint to make sure the server is running
@@ -35,4 +50,5 @@ app.include_router(auth.router, prefix="/api/v1", tags=["Authentication"])
 app.include_router(users.router, prefix="/api/v1/users", tags=["Users"])
 app.include_router(sourcing.router, prefix="/api/v1/sourcing", tags=["Sourcing"])
 app.include_router(products.router, prefix="/api/v1/products", tags=["Master Products"])
-app.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports"])
\ No newline at end of file
+app.include_router(reports.router, prefix="/api/v1/reports", tags=["Reports"])
+app.include_router(admin.router, prefix="/api/v1/admin", tags=["Admin"])
\ No newline at end of file
@@ -1,5 +1,6 @@
 from .token import Token, TokenData
 from .user import User, UserCreate, UserBase, UserUpdate
-from .sourcing import SourcingID, SourcingIDCreate, SourcingItem, SourcingItemCreate, SourcingItemUpdate, SourcingIDUpdate
+from .sourcing import SourcingID, SourcingIDCreate, SourcingItem, SourcingItemCreate, SourcingItemUpdate, SourcingIDUpdate, SourcingItemBatch, SourcingItemBatchUpdate, SourcingBulkResult, SourcingIDSummary
 from .product import Product, ProductCreate, ProductUpdate
-from .reports import DashboardStats, SourcerPerformance, CountByUser, EfficiencyBreakdown, SourcerDashboardStats, RecentSourcingRequest, ItemSummary, PurchaserDashboardStats
+from .reports import DashboardStats, SourcerPerformance, CountByUser, EfficiencyBreakdown, SourcerDashboardStats, RecentSourcingRequest, ItemSummary, PurchaserDashboardStats, TimeseriesPoint, Timeseries, ReportJobCreate, ReportJob
+from .admin import PoolStats, WaitBucket, CacheStats
@@ -0,0 +1,30 @@
+from pydantic import BaseModel
+from typing import List, Optional
+
+class WaitBucket(BaseModel):
+    le_ms: Optional[float] = None  # None for the open-ended last bucket
+    count: int
+
+class PoolStats(BaseModel):
+    name: str
+    pool_class: Optional[str] = None
+    size: Optional[int] = None
+    checked_out: Optional[int] = None
+    idle: Optional[int] = None
+    overflow: Optional[int] = None
+    connects: int
+    checkouts: int
+    checkins: int
+    invalidations: int
+    wait_count: int
+    wait_avg_ms: Optional[float] = None
+    wait_max_ms: float
+    wait_histogram: List[WaitBucket]
+
+class CacheStats(BaseModel):
+    name: str
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
@@ -1,6 +1,8 @@
-from pydantic import BaseModel
-from typing import List
-from datetime import datetime
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional
+from datetime import date, datetime
+
+from ..db.models import JobStatus, SourcingItemStatus
 
 class SourcerPerformance(BaseModel):
     sourcer_email: str
@@ -8,6 +10,7 @@ class SourcerPerformance(BaseModel):
 
 class CountByUser(BaseModel):
     user_email: str
+    count: int
 
 class EfficiencyBreakdown(BaseModel):
     dimension: str  # e.g., "Market", "Category"
@@ -35,18 +38,61 @@ class RecentSourcingRequest(BaseModel):
     created_at: datetime
     items: List[ItemSummary] 
     savings: float | None = None
+    target_total: float = 0                 # catalogue target cost of the order's items
 
 class SourcerDashboardStats(BaseModel):
     total_requests_created: int
     total_savings: float
+    total_baseline: float = 0               # catalogue target cost of all the sourcer's orders
+    overall_efficiency_pct: float = 0       # total_savings as a percentage of total_baseline
     requests_pending: int
     requests_assigned: int
     requests_purchased: int
     recent_requests: List[RecentSourcingRequest] 
+    all_requests: List[RecentSourcingRequest] = []
 
 class PurchaserDashboardStats(BaseModel):
     requests_assigned: int
     awaiting_tracking: int
     items_purchased: int    
+    requests_by_status: Dict[str, int] = {}
+    requests_by_tracking_status: Dict[str, int] = {}   # "" for orders without a tracking status
+
+
+class TimeseriesPoint(BaseModel):
+    start: date                                      # first day of the day or ISO week
+    value: float | None = None                       # count or sum metrics
+    count: int | None = None                         # duration metrics: orders measured
+    percentiles: Dict[str, float | None] | None = None   # duration metrics, hours, keyed "p50", "p95", ...
+
+class Timeseries(BaseModel):
+    metric: str
+    bucket: str
+    unit: str
+    points: List[TimeseriesPoint]
+
 
+class ReportJobCreate(BaseModel):
+    kind: Literal["export", "rebuild"]
+    start_date: Optional[datetime] = None      # export: created_at range; rebuild: day range (all days if unset)
+    end_date: Optional[datetime] = None
+    status_filter: Optional[List[SourcingItemStatus]] = None   # export only
+    gzip: bool = False                                          # export only, csv only
+    format: Literal["csv", "parquet", "arrow"] = "csv"          # export only
+    month: Optional[str] = Field(None, pattern=r"^\d{4}-(0[1-9]|1[0-2])$")   # export only: YYYY-MM
 
+class ReportJob(BaseModel):
+    id: int
+    kind: str
+    status: JobStatus
+    params: dict
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    progress: int = 0
+    total: Optional[int] = None
+    error: Optional[str] = None
+    result_size: Optional[int] = None
+
+    class Config:
+        from_attributes = True
@@ -81,6 +81,14 @@ class SourcingIDCreate(SourcingIDBase):
     items: List[SourcingItemCreate]
 
 
+class SourcingBulkResult(BaseModel):
+    """Outcome for one order of a bulk create, in request order."""
+    index: int
+    id: Optional[int] = None
+    created: bool
+    detail: Optional[str] = None
+
+
 class SourcingID(SourcingIDBase):
     id: int
     status: SourcingItemStatus
@@ -114,6 +122,31 @@ class SourcingID(SourcingIDBase):
     }
 
 
+class SourcingIDSummary(SourcingIDBase):
+    """Order header for the queue and "my orders" lists (`view=summary`): no item rows."""
+    id: int
+    status: SourcingItemStatus
+    sourcer_id: int
+    purchaser_id: Optional[int] = None
+
+    created_on: datetime = Field(..., alias="created_at")
+    assigned_at: Optional[datetime] = None
+    tracking_status: Optional[TrackingStatus] = None
+
+    target_total: float = 0
+    sourced_price: float = 0
+    savings: float = 0
+
+    item_count: int = 0
+    first_product_name: Optional[str] = None
+
+    model_config = {
+        "from_attributes": True,
+        "populate_by_name": True,
+        "protected_namespaces": ()
+    }
+
+
 class SourcingIDUpdate(BaseModel):
     status: Optional[SourcingItemStatus] = None
     market_order_num: Optional[str] = None
@@ -174,3 +207,18 @@ class SourcingItemUpdate(BaseModel):
         "protected_namespaces": (),
         "extra": "ignore"
     }
+
+
+class SourcingItemBatchUpdate(SourcingItemUpdate):
+    id: int
+
+
+class SourcingItemBatch(BaseModel):
+    """Adds, updates and deletes applied to one order's items in a single transaction."""
+    add: List[SourcingItemCreate] = Field(default_factory=list)
+    update: List[SourcingItemBatchUpdate] = Field(default_factory=list)
+    delete: List[int] = Field(default_factory=list)
+
+    model_config = {
+        "protected_namespaces": ()
+    }
@@ -0,0 +1,173 @@
+import enum
+import io
+from datetime import datetime
+
+from sqlalchemy import select
+
+from ..db import models
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: only needed for the Parquet/Arrow export
+    pa = pq = None
+
+PARQUET = "parquet"
+ARROW = "arrow"
+
+# format -> (file extension, media type)
+FORMATS = {
+    PARQUET: (".parquet", "application/vnd.apache.parquet"),
+    ARROW: (".arrows", "application/vnd.apache.arrow.stream"),
+}
+
+# Rows fetched per server-side cursor batch. Each batch becomes one Parquet
+# row group or Arrow record batch, which bounds the memory an export holds.
+BATCH_SIZE = 50_000
+
+_order = models.SourcingID
+_item = models.SourcingItem
+
+# (column, SQL expression, type). Types are "int32", "int64", "string",
+# "timestamp", ("decimal", precision, scale) or an Enum class, which is
+# dictionary-encoded against all of its members so every batch shares one
+# dictionary.
+COLUMNS = [
+    ("sourcing_id", _order.id, "int64"),
+    ("created_at", _order.created_at, "timestamp"),
+    ("assigned_at", _order.assigned_at, "timestamp"),
+    ("finalized_at", _order.finalized_at, "timestamp"),
+    ("status", _order.status, models.SourcingItemStatus),
+    ("market", _order.market, models.Market),
+    ("tracking_status", _order.tracking_status, models.TrackingStatus),
+    ("destination_warehouse", _order.destination_warehouse, models.DestinationWarehouse),
+    ("sourcer_id", _order.sourcer_id, "int64"),
+    ("purchaser_id", _order.purchaser_id, "int64"),
+    ("sellers_price", _order.sellers_price, ("decimal", 10, 2)),
+    ("shipping_price", _order.shipping_price, ("decimal", 10, 2)),
+    ("order_tax", _order.tax, ("decimal", 10, 2)),
+    ("total_actual_cost", (_order.sellers_price + _order.shipping_price + _order.tax), ("decimal", 12, 2)),
+    ("item_id", _item.id, "int64"),
+    ("product_id", _item.product_id, "int64"),
+    ("sku", _item.sku, "string"),
+    ("product_name", _item.product_name, "string"),
+    ("category", _item.category, "string"),
+    ("product_type", _item.product_type, models.ProductType),
+    ("quantity_needed", _item.quantity_needed, "int32"),
+    ("target_cost_per_unit", _item.target_cost_per_unit, ("decimal", 10, 2)),
+    ("item_target_total", _item.item_target_total, ("decimal", 10, 2)),
+    ("sourced_price", _item.sourced_price, ("decimal", 10, 2)),
+    ("regular_price", _item.regular_price, ("decimal", 10, 2)),
+    ("price", _item.price, ("decimal", 10, 2)),
+    ("shipping_charges", _item.shipping_charges, ("decimal", 10, 2)),
+    ("item_tax", _item.tax, ("decimal", 10, 2)),
+    ("sku_efficiency", _item.sku_efficiency, ("decimal", 10, 2)),
+]
+_CREATED_AT = 1
+
+
+def available() -> bool:
+    return pa is not None
+
+
+def month_bounds(month: str) -> tuple[datetime, datetime]:
+    """[start, end) of a "YYYY-MM" month; raises ValueError for anything else."""
+    start = datetime.strptime(month, "%Y-%m")
+    end = start.replace(year=start.year + 1, month=1) if start.month == 12 else start.replace(month=start.month + 1)
+    return start, end
+
+
+def analytics_statement(start_date: datetime | None = None, end_date: datetime | None = None, status_filter=None, month: str | None = None):
+    """
+    One row per order item with the order's and the item's columns, in COLUMNS
+    order. `month` restricts it to orders created that month, the unit the
+    `month` column of the output is partitioned by.
+    """
+    statement = select(*(expression for _, expression, _ in COLUMNS)).join(
+        _item, _order.id == _item.sourcing_id
+    ).order_by(_order.id, _item.id)
+    if start_date:
+        statement = statement.where(_order.created_at >= start_date)
+    if end_date:
+        statement = statement.where(_order.created_at <= end_date)
+    if status_filter:
+        statement = statement.where(_order.status.in_(status_filter))
+    if month:
+        start, end = month_bounds(month)
+        statement = statement.where(_order.created_at >= start, _order.created_at < end)
+    return statement
+
+
+def _arrow_type(kind):
+    if isinstance(kind, type) and issubclass(kind, enum.Enum):
+        return pa.dictionary(pa.int16(), pa.string())
+    if isinstance(kind, tuple):
+        return pa.decimal128(kind[1], kind[2])
+    if kind == "timestamp":
+        return pa.timestamp("us", tz="UTC")
+    return {"int32": pa.int32(), "int64": pa.int64(), "string": pa.string()}[kind]
+
+
+def schema():
+    return pa.schema(
+        [pa.field(name, _arrow_type(kind)) for name, _, kind in COLUMNS]
+        + [pa.field("month", pa.string())]   # "YYYY-MM" of created_at, for partitioning
+    )
+
+
+def _array(values, kind):
+    if isinstance(kind, type) and issubclass(kind, enum.Enum):
+        members = list(kind)
+        position = {member: n for n, member in enumerate(members)}
+        indices = pa.array([None if v is None else position[v] for v in values], pa.int16())
+        return pa.DictionaryArray.from_arrays(indices, pa.array([m.value for m in members], pa.string()))
+    return pa.array(values, _arrow_type(kind))
+
+
+def record_batch(rows):
+    """Converts a batch of analytics_statement rows to an Arrow record batch."""
+    columns = list(zip(*rows)) if rows else [() for _ in COLUMNS]
+    arrays = [_array(values, kind) for (_, _, kind), values in zip(COLUMNS, columns)]
+    arrays.append(pa.array([v.strftime("%Y-%m") if v else None for v in columns[_CREATED_AT]], pa.string()))
+    return pa.RecordBatch.from_arrays(arrays, schema=schema())
+
+
+class ChunkSink(io.RawIOBase):
+    """Write-only file object that collects what is written until drained, for streaming a writer's output."""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ColumnarWriter:
+    """Writes analytics rows to a binary file object as Parquet or an Arrow IPC stream, one batch at a time."""
+
+    def __init__(self, format: str, sink):
+        if format == PARQUET:
+            self._writer = pq.ParquetWriter(sink, schema(), compression="zstd")
+        else:
+            self._writer = pa.ipc.new_stream(sink, schema())
+
+    def write(self, rows):
+        if rows:
+            self._writer.write_batch(record_batch(rows))
+
+    def close(self):
+        self._writer.close()
@@ -0,0 +1,110 @@
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from ..core.broadcast import Broadcaster
+from ..core.config import settings
+from ..db import models
+
+# Order events pushed to GET /sourcing/events
+broadcaster = Broadcaster(
+    queue_size=settings.EVENTS_QUEUE_SIZE,
+    history=settings.EVENTS_HISTORY_SIZE,
+)
+
+CREATED = "order.created"
+ASSIGNED = "order.assigned"
+STATUS_CHANGED = "order.status_changed"
+ITEMS_CHANGED = "order.items_changed"
+UPDATED = "order.updated"
+
+# When one transaction makes several changes to an order, a single event of
+# the most significant kind is published.
+_PRECEDENCE = {CREATED: 0, ASSIGNED: 1, STATUS_CHANGED: 2, ITEMS_CHANGED: 3, UPDATED: 4}
+
+
+def publish_order_event(kind: str, sourcing_id: int, status, sourcer_id: int, purchaser_id: int | None):
+    if not broadcaster.listening:
+        return
+    broadcaster.publish(
+        kind,
+        sourcing_id=sourcing_id,
+        status=status.value if status is not None else None,
+        sourcer_id=sourcer_id,
+        purchaser_id=purchaser_id,
+    )
+
+
+def can_see(user, event_type: str, data: dict) -> bool:
+    """
+    Whether `user` may receive an event about the order described by `data`.
+    Purchasers also get every event about unassigned orders and every
+    assignment, so their pending queue can drop orders taken elsewhere.
+    """
+    if user.role in (models.UserRole.admin, models.UserRole.manager):
+        return True
+    if user.role == models.UserRole.purchaser and (
+        event_type == ASSIGNED
+        or data["purchaser_id"] is None
+        or data["status"] == models.SourcingItemStatus.Pending.value
+    ):
+        return True
+    return user.id in (data["sourcer_id"], data["purchaser_id"])
+
+
+def _most_significant(kind, other):
+    return min(kind, other, key=_PRECEDENCE.__getitem__)
+
+
+def _order_changes(session) -> dict:
+    """Event kind per order id for the changes in this flush."""
+    changes = {}
+
+    def note(sourcing_id, kind):
+        if sourcing_id is not None:
+            changes[sourcing_id] = _most_significant(kind, changes.get(sourcing_id, kind))
+
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.SourcingItem):
+            history = inspect(obj).attrs.sourcing_id.history
+            for sourcing_id in (obj.sourcing_id, *history.deleted):
+                note(sourcing_id, ITEMS_CHANGED)
+        elif isinstance(obj, models.SourcingID):
+            if obj in session.new:
+                note(obj.id, CREATED)
+            elif obj in session.deleted or not session.is_modified(obj, include_collections=False):
+                continue
+            elif inspect(obj).attrs.status.history.has_changes():
+                note(obj.id, ASSIGNED if obj.status == models.SourcingItemStatus.Assigned else STATUS_CHANGED)
+            else:
+                note(obj.id, UPDATED)
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def collect_order_events(session, flush_context):
+    if not broadcaster.listening:
+        return
+    changes = _order_changes(session)
+    if not changes:
+        return
+    pending = session.info.setdefault("order_events", {})
+    for sourcing_id in changes.keys() & pending.keys():
+        changes[sourcing_id] = _most_significant(changes[sourcing_id], pending[sourcing_id][0])
+    # Read the flushed state, since items do not carry their order's owners
+    orders = models.SourcingID.__table__
+    for row in session.connection().execute(
+        select(orders.c.id, orders.c.status, orders.c.sourcer_id, orders.c.purchaser_id)
+        .where(orders.c.id.in_(sorted(changes)))
+    ):
+        pending[row.id] = (changes[row.id], row.status, row.sourcer_id, row.purchaser_id)
+
+
+@event.listens_for(Session, "after_commit")
+def publish_order_events(session):
+    for sourcing_id, (kind, status, sourcer_id, purchaser_id) in session.info.pop("order_events", {}).items():
+        publish_order_event(kind, sourcing_id, status, sourcer_id, purchaser_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def discard_order_events(session):
+    session.info.pop("order_events", None)
@@ -0,0 +1,309 @@
+import csv
+import io
+import logging
+import os
+import threading
+import time
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import func, or_, select, update
+
+from ..core.config import settings
+from ..db import models
+from ..db.session import SessionLocal
+from . import analytics_export, report_service
+
+logger = logging.getLogger(__name__)
+
+EXPORT = "export"
+REBUILD = "rebuild"
+
+EXPORT_BATCH_SIZE = 1000
+# Days rebuilt per transaction by a ranged rebuild job
+REBUILD_CHUNK_DAYS = 31
+# Progress is written at most this often (seconds)
+PROGRESS_INTERVAL = 1.0
+# Expired result files are looked for at most this often (seconds)
+SWEEP_INTERVAL = 600
+
+
+def _now():
+    return datetime.now(timezone.utc)
+
+
+def _parse_datetime(value):
+    return datetime.fromisoformat(value) if value else None
+
+
+def result_file(job: models.ReportJob) -> str:
+    return os.path.join(settings.REPORT_JOB_DIR, job.result_path)
+
+
+def result_type(job: models.ReportJob) -> tuple[str, str]:
+    """(file extension, media type) of a finished job's file."""
+    for extension, media_type in analytics_export.FORMATS.values():
+        if job.result_path.endswith(extension):
+            return extension, media_type
+    if job.result_path.endswith(".gz"):
+        return ".csv.gz", "application/gzip"
+    return ".csv", "text/csv"
+
+
+class JobRunner:
+    """
+    Runs report jobs on a thread pool inside the web process. The report_jobs
+    row is the source of truth: a job is claimed with a conditional UPDATE, so
+    each runs once even with several workers, and `resume` picks up queued
+    jobs and running jobs whose worker stopped heartbeating. Result files are
+    deleted `result_ttl` seconds after their job finished (never when 0).
+    """
+
+    def __init__(self, workers: int, stale_after: float, result_ttl: float = 0):
+        self.workers = workers
+        self.stale_after = stale_after
+        self.result_ttl = result_ttl
+        self._executor: ThreadPoolExecutor | None = None
+        self._sweeper: threading.Thread | None = None
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+
+    def submit(self, job_id: int):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="report-job")
+            self._executor.submit(self._run, job_id)
+
+    def resume(self):
+        """
+        Re-queues stalled jobs, submits everything queued and starts sweeping
+        expired result files; call at startup.
+        """
+        job = models.ReportJob
+        stale = _now() - timedelta(seconds=self.stale_after)
+        with SessionLocal() as db:
+            db.execute(
+                update(job)
+                .where(job.status == models.JobStatus.running, or_(job.heartbeat_at.is_(None), job.heartbeat_at < stale))
+                .values(status=models.JobStatus.queued)
+            )
+            queued = db.scalars(select(job.id).where(job.status == models.JobStatus.queued).order_by(job.id)).all()
+            db.commit()
+        for job_id in queued:
+            self.submit(job_id)
+        with self._lock:
+            if self.result_ttl and self._sweeper is None:
+                self._stopped.clear()
+                self._sweeper = threading.Thread(target=self._sweep_loop, name="report-job-sweep", daemon=True)
+                self._sweeper.start()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                # Unstarted jobs stay queued in the table for the next resume
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+            if self._sweeper is not None:
+                self._stopped.set()
+                self._sweeper = None
+
+    def sweep(self) -> int:
+        """
+        Deletes the files of jobs that finished more than `result_ttl` seconds
+        ago and clears their result_path; returns how many were expired. The
+        UPDATE is conditional, so concurrent sweeps in other workers are safe.
+        """
+        job = models.ReportJob
+        expired_before = _now() - timedelta(seconds=self.result_ttl)
+        with SessionLocal() as db:
+            expired = db.execute(
+                select(job.id, job.result_path)
+                .where(job.result_path.is_not(None), job.finished_at < expired_before)
+                .order_by(job.id)
+            ).all()
+            for job_id, result_path in expired:
+                db.execute(
+                    update(job)
+                    .where(job.id == job_id, job.result_path == result_path)
+                    .values(result_path=None, result_size=None)
+                )
+                db.commit()
+                try:
+                    os.remove(os.path.join(settings.REPORT_JOB_DIR, result_path))
+                except FileNotFoundError:
+                    pass
+        return len(expired)
+
+    def _sweep_loop(self):
+        interval = min(SWEEP_INTERVAL, self.result_ttl)
+        while True:
+            try:
+                self.sweep()
+            except Exception:
+                logger.exception("Report job result sweep failed")
+            if self._stopped.wait(interval):
+                return
+
+    def _claim(self, db, job_id: int):
+        job = models.ReportJob
+        now = _now()
+        claimed = db.execute(
+            update(job)
+            .where(job.id == job_id, job.status == models.JobStatus.queued)
+            .values(status=models.JobStatus.running, started_at=now, heartbeat_at=now, progress=0, error=None)
+        ).rowcount
+        db.commit()
+        return db.get(job, job_id) if claimed else None
+
+    def _run(self, job_id: int):
+        with SessionLocal() as db:
+            job = self._claim(db, job_id)
+            if job is None:
+                return  # finished, or claimed by another worker
+            try:
+                HANDLERS[job.kind](db, job, _Progress(job.id))
+                job.status = models.JobStatus.succeeded
+            except Exception as e:
+                logger.exception("Report job %s failed", job_id)
+                db.rollback()
+                job.status = models.JobStatus.failed
+                job.error = str(e) or type(e).__name__
+            job.finished_at = _now()
+            job.heartbeat_at = job.finished_at
+            db.commit()
+
+
+class _Progress:
+    """
+    Writes a job's progress and heartbeat from a separate short session, as
+    the job's own session is busy streaming inside its transaction.
+    """
+
+    def __init__(self, job_id: int):
+        self.job_id = job_id
+        self._last = 0.0
+
+    def __call__(self, progress: int, total: int | None = None, force: bool = False):
+        if not force and time.monotonic() - self._last < PROGRESS_INTERVAL:
+            return
+        self._last = time.monotonic()
+        values = {"progress": progress, "heartbeat_at": _now()}
+        if total is not None:
+            values["total"] = total
+        with SessionLocal() as db:
+            db.execute(update(models.ReportJob).where(models.ReportJob.id == self.job_id).values(values))
+            db.commit()
+
+
+def _export(db, job, progress):
+    """Writes the order export as CSV (optionally gzipped), Parquet or Arrow to REPORT_JOB_DIR."""
+    params = job.params
+    start_date = _parse_datetime(params.get("start_date"))
+    end_date = _parse_datetime(params.get("end_date"))
+    export_format = params.get("format", "csv")
+    if export_format == "csv":
+        statement = report_service.export_statement(start_date, end_date, params.get("status_filter"))
+        if params.get("month"):
+            month_start, month_end = analytics_export.month_bounds(params["month"])
+            statement = statement.where(
+                models.SourcingID.created_at >= month_start, models.SourcingID.created_at < month_end
+            )
+        extension = ".csv" + (".gz" if params.get("gzip") else "")
+    else:
+        statement = analytics_export.analytics_statement(
+            start_date, end_date, params.get("status_filter"), params.get("month")
+        )
+        extension = analytics_export.FORMATS[export_format][0]
+    total = db.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+    progress(0, total, force=True)
+
+    os.makedirs(settings.REPORT_JOB_DIR, exist_ok=True)
+    filename = f"report-job-{job.id}{extension}"
+    path = os.path.join(settings.REPORT_JOB_DIR, filename)
+    try:
+        with open(path + ".part", "wb") as out:
+            if export_format == "csv":
+                written = _write_csv(db, statement, out, params.get("gzip"), progress)
+            else:
+                written = _write_columnar(db, statement, out, export_format, progress)
+        os.replace(path + ".part", path)
+    except Exception:
+        # The job is marked failed; don't leave the partial file behind for good
+        try:
+            os.remove(path + ".part")
+        except FileNotFoundError:
+            pass
+        raise
+
+    job.result_path = filename
+    job.result_size = os.path.getsize(path)
+    job.progress = written
+    job.total = written
+
+
+def _write_csv(db, statement, out, gzip, progress) -> int:
+    compressor = zlib.compressobj(wbits=31) if gzip else None  # gzip container
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(report_service.EXPORT_HEADER)
+    written = 0
+
+    def flush():
+        data = buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate(0)
+        out.write(compressor.compress(data) if compressor else data)
+
+    for rows in db.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE)).partitions():
+        writer.writerows(rows)
+        written += len(rows)
+        flush()
+        progress(written)
+    flush()
+    if compressor:
+        out.write(compressor.flush())
+    return written
+
+
+def _write_columnar(db, statement, out, export_format, progress) -> int:
+    writer = analytics_export.ColumnarWriter(export_format, out)
+    written = 0
+    for rows in db.execute(statement.execution_options(yield_per=analytics_export.BATCH_SIZE)).partitions():
+        writer.write(rows)
+        written += len(rows)
+        progress(written)
+    writer.close()
+    return written
+
+
+def _rebuild(db, job, progress):
+    """Rebuilds the dashboard rollups and time series for a day range, or for all history."""
+    start = _parse_datetime(job.params.get("start_date"))
+    end = _parse_datetime(job.params.get("end_date"))
+    if not (start or end):
+        progress(0, 1, force=True)
+        report_service.rebuild_rollups(db.connection(), None)
+        report_service.rebuild_series(db.connection(), None)
+        db.commit()
+        job.progress = job.total = 1
+        return
+
+    first: date = report_service.utc_day(start or end)
+    last: date = report_service.utc_day(end or start)
+    days = [first + timedelta(days=n) for n in range((last - first).days + 1)]
+    progress(0, len(days), force=True)
+    for offset in range(0, len(days), REBUILD_CHUNK_DAYS):
+        chunk = set(days[offset:offset + REBUILD_CHUNK_DAYS])
+        report_service.rebuild_rollups(db.connection(), chunk)
+        report_service.rebuild_series(db.connection(), chunk)
+        db.commit()
+        progress(offset + len(chunk))
+    job.progress = job.total = len(days)
+
+
+HANDLERS = {EXPORT: _export, REBUILD: _rebuild}
+
+runner = JobRunner(
+    settings.REPORT_JOB_WORKERS, settings.REPORT_JOB_STALE_SECONDS, settings.REPORT_JOB_RESULT_TTL_SECONDS
+)
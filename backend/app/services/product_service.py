@@ -0,0 +1,126 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from sqlalchemy import func, literal, or_, select
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..db import models
+
+# pg_trgm's default pg_trgm.similarity_threshold / word_similarity_threshold;
+# the SQLite fallback applies the same cut-offs to the Python scores.
+SIMILARITY_THRESHOLD = 0.3
+WORD_SIMILARITY_THRESHOLD = 0.6
+
+
+def _contains(column, term: str):
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return column.ilike(f"%{escaped}%", escape="\\")
+
+
+def contains_filter(q: str):
+    """
+    Substring match on SKU or name. On PostgreSQL the trigram GIN indexes serve
+    this leading-wildcard ILIKE (for terms of 3+ characters).
+    """
+    product = models.MasterProduct
+    return _contains(product.sku, q) | _contains(product.product_name, q)
+
+
+def category_filter(category: str):
+    return _contains(models.MasterProduct.category, category)
+
+
+def relevance(q: str, dialect_name: str):
+    """Trigram relevance of a product to `q`: the better of SKU similarity and name word-similarity."""
+    product = models.MasterProduct
+    greatest = func.greatest if dialect_name == "postgresql" else func.max  # SQLite's scalar max()
+    return greatest(
+        func.coalesce(func.similarity(product.sku, q), 0),
+        func.coalesce(func.word_similarity(q, product.product_name), 0),
+    )
+
+
+def fuzzy_search(query, q: str, dialect_name: str):
+    """
+    Restricts `query` to products matching `q` as a substring or by trigram
+    similarity, ordered by relevance. PostgreSQL uses pg_trgm's indexable
+    `%` / `<%` operators; other backends call the registered Python functions.
+    """
+    product = models.MasterProduct
+    if dialect_name == "postgresql":
+        similar = or_(
+            product.sku.op("%")(q),
+            literal(q).op("<%")(product.product_name),
+        )
+    else:
+        similar = or_(
+            func.similarity(product.sku, q) >= SIMILARITY_THRESHOLD,
+            func.word_similarity(q, product.product_name) >= WORD_SIMILARITY_THRESHOLD,
+        )
+    return (
+        query.filter(contains_filter(q) | similar)
+        .order_by(relevance(q, dialect_name).desc(), product.id)
+    )
+
+
+@dataclass(frozen=True)
+class CachedProduct:
+    """Detached copy of the master product fields the sourcing item endpoints copy onto items."""
+    id: int
+    sku: str
+    product_name: str | None
+    target_cost_per_unit: Decimal | None
+    product_type: models.ProductType | None
+    category: str | None
+
+    @classmethod
+    def from_product(cls, product: models.MasterProduct) -> "CachedProduct":
+        return cls(
+            id=product.id,
+            sku=product.sku,
+            product_name=product.product_name,
+            target_cost_per_unit=product.target_cost_per_unit,
+            product_type=product.product_type,
+            category=product.category,
+        )
+
+
+# Unknown SKUs are not cached, so a product created elsewhere is seen immediately.
+product_cache = TTLCache(settings.PRODUCT_CACHE_MAX_ENTRIES, settings.PRODUCT_CACHE_TTL_SECONDS)
+
+
+async def get_product_by_sku(db, sku: str) -> CachedProduct | None:
+    """Read-through lookup of a master product by SKU on an AsyncSession."""
+    cached = product_cache.get(sku)
+    if cached is not None:
+        return cached
+    product = await db.scalar(select(models.MasterProduct).filter_by(sku=sku))
+    if product is None:
+        return None
+    cached = CachedProduct.from_product(product)
+    product_cache.set(sku, cached)
+    return cached
+
+
+async def get_products_by_sku(db, skus) -> dict[str, CachedProduct]:
+    """Resolves many SKUs at once: cache hits first, then one IN query for the rest."""
+    found = {}
+    for sku in set(skus):
+        cached = product_cache.get(sku)
+        if cached is not None:
+            found[sku] = cached
+    missing = set(skus) - found.keys()
+    if missing:
+        products = await db.scalars(select(models.MasterProduct).where(models.MasterProduct.sku.in_(missing)))
+        for product in products:
+            cached = found[product.sku] = CachedProduct.from_product(product)
+            product_cache.set(product.sku, cached)
+    return found
+
+
+def forget_products(*skus: str | None) -> None:
+    """Drops cached products; call after creating, changing or deleting a master product."""
+    for sku in skus:
+        if sku is not None:
+            product_cache.pop(sku)
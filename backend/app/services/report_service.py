@@ -0,0 +1,704 @@
+from dataclasses import dataclass, field
+from bisect import bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+from sqlalchemy import Date, String, and_, case, cast, delete, distinct, event, func, inspect, literal, or_, select, text, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..db import models
+
+CLOSED_STATUSES = [models.SourcingItemStatus.Purchased, models.SourcingItemStatus.Dropshipped]
+
+# Order columns that change which report rows an order lands in or what it contributes.
+_REPORT_INPUTS = (
+    "created_at", "assigned_at", "finalized_at", "status", "sourcer_id", "purchaser_id", "market",
+    "sellers_price", "shipping_price", "tax", "savings", "is_manual_override",
+)
+
+# Rows per multi-row upsert or IN list
+_BATCH_SIZE = 1000
+
+
+def seconds_between(dialect_name: str, start, end):
+    """SQL expression for `end - start` in seconds."""
+    if dialect_name == "postgresql":
+        return func.extract("epoch", end - start)
+    return (func.julianday(end) - func.julianday(start)) * 86400
+
+
+def utc_date(dialect_name: str, column):
+    """
+    SQL expression for the UTC day of a timestamp column, the day the report
+    tables bucket it under whatever the session TimeZone is. SQLite stores
+    the UTC wall time already.
+    """
+    if dialect_name == "postgresql":
+        return cast(func.timezone("UTC", column), Date)
+    return func.date(column)
+
+
+def _utc(value: datetime) -> datetime:
+    """Timestamps are stored in UTC; SQLite hands them back naive."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def utc_day(value: datetime) -> date:
+    """The UTC day of a timestamp, matching utc_date in SQL."""
+    return _utc(value).date()
+
+
+def _on_days(column, days):
+    """Range predicate on a timestamp column covering the given UTC days (all days if None)."""
+    if days is None:
+        return literal(True)
+    return or_(*(
+        and_(
+            column >= datetime.combine(d, time.min, tzinfo=timezone.utc),
+            column < datetime.combine(d + timedelta(days=1), time.min, tzinfo=timezone.utc),
+        )
+        for d in sorted(days)
+    ))
+
+
+def _created_on(days):
+    """Range predicate on sourcing_ids.created_at covering the given days (all days if None)."""
+    return _on_days(models.SourcingID.__table__.c.created_at, days)
+
+
+def _lock_for_rebuild(connection, table):
+    """
+    On PostgreSQL, makes writers' delta upserts on `table` wait until the
+    rebuilding transaction commits, so a rebuild neither loses nor double
+    counts a concurrent write. Readers are not blocked. Rebuild rollups
+    before series, the order apply_report_changes writes them in.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(f"LOCK TABLE {table.name} IN EXCLUSIVE MODE"))
+
+
+def rollup_summary(dimension: str, start_date: date | None = None, end_date: date | None = None):
+    """
+    Statement summing the rollup rows of one dimension over an optional day
+    range, yielding (dimension_key, orders, closed_orders, savings,
+    response_seconds, responded_orders) per key.
+    """
+    rollup = models.ReportRollup
+    statement = select(
+        rollup.dimension_key,
+        func.sum(rollup.orders),
+        func.sum(rollup.closed_orders),
+        func.sum(rollup.savings),
+        func.sum(rollup.response_seconds),
+        func.sum(rollup.responded_orders),
+    ).where(rollup.dimension == dimension)
+    if start_date:
+        statement = statement.where(rollup.day >= start_date)
+    if end_date:
+        statement = statement.where(rollup.day <= end_date)
+    return statement.group_by(rollup.dimension_key)
+
+
+EXPORT_HEADER = [
+    "SourcingID", "CreatedAt", "AssignedAt",
+    "ProductName", "SKU", "Market",
+    "Category", "Status", "TotalActualCost"
+]
+
+
+def export_statement(start_date: datetime | None = None, end_date: datetime | None = None, status_filter=None):
+    """Statement for the order export: one row per order item, in EXPORT_HEADER order."""
+    statement = select(
+        models.SourcingID.id,
+        models.SourcingID.created_at,
+        models.SourcingID.assigned_at,
+        models.SourcingItem.product_name,
+        models.SourcingItem.sku,
+        models.SourcingID.market,
+        models.SourcingItem.category,
+        models.SourcingID.status,
+        (models.SourcingID.sellers_price + models.SourcingID.shipping_price + models.SourcingID.tax).label("total_actual_cost")
+    ).join(
+        models.SourcingItem, models.SourcingID.id == models.SourcingItem.sourcing_id
+    ).order_by(
+        models.SourcingID.id, models.SourcingItem.id
+    )
+    if start_date:
+        statement = statement.where(models.SourcingID.created_at >= start_date)
+    if end_date:
+        statement = statement.where(models.SourcingID.created_at <= end_date)
+    if status_filter:
+        statement = statement.where(models.SourcingID.status.in_(status_filter))
+    return statement
+
+
+# Purchaser id -> schemas.PurchaserDashboardStats
+purchaser_stats_cache = TTLCache(
+    settings.PURCHASER_STATS_CACHE_MAX_ENTRIES, settings.PURCHASER_STATS_CACHE_TTL_SECONDS
+)
+
+
+def purchaser_status_counts(purchaser_id: int):
+    """
+    Statement counting a purchaser's orders per (status, tracking_status)
+    pair: one grouped scan of the purchaser's index range that every
+    dashboard figure is summed from.
+    """
+    order = models.SourcingID
+    return (
+        select(order.status, order.tracking_status, func.count())
+        .where(order.purchaser_id == purchaser_id)
+        .group_by(order.status, order.tracking_status)
+    )
+
+
+def forget_purchaser_stats(*purchaser_ids: int | None) -> None:
+    """Drops cached dashboard counts after a write that changes a purchaser's orders."""
+    for purchaser_id in purchaser_ids:
+        if purchaser_id is not None:
+            purchaser_stats_cache.pop(purchaser_id)
+
+
+def rebuild_rollups(connection, days=None):
+    """
+    Recomputes the report_daily_rollups rows for the given days from the raw
+    sourcing tables, or every day when `days` is None. Each call is one DELETE
+    plus one INSERT ... SELECT per dimension. This is for backfills and
+    repairs; ordinary writes move the rows by deltas (see apply_report_changes).
+
+    Savings price items at the current catalogue target cost, matching the live
+    reports; catalogue writes move the closed orders of the repriced SKUs by
+    deltas too (see orders_priced_by).
+    """
+    if days is not None and not days:
+        return
+    orders = models.SourcingID.__table__
+    items = models.SourcingItem.__table__
+    products = models.MasterProduct.__table__
+    rollups = models.ReportRollup.__table__
+    in_days = _created_on(days)
+
+    # Catalogue target and item count per (order, category)
+    per_category = (
+        select(
+            items.c.sourcing_id,
+            func.coalesce(items.c.category, "").label("category"),
+            func.sum(func.coalesce(products.c.target_cost_per_unit, 0) * func.coalesce(items.c.quantity_needed, 1)).label("target"),
+            func.count(items.c.id).label("item_count"),
+        )
+        .select_from(
+            items.join(orders, orders.c.id == items.c.sourcing_id)
+            .outerjoin(products, products.c.sku == items.c.sku)
+        )
+        .where(in_days)
+        .group_by(items.c.sourcing_id, func.coalesce(items.c.category, ""))
+        .subquery("per_category")
+    )
+    per_order_target = (
+        select(
+            per_category.c.sourcing_id,
+            func.sum(per_category.c.target).label("target"),
+            func.sum(per_category.c.item_count).label("item_count"),
+        )
+        .group_by(per_category.c.sourcing_id)
+        .subquery("per_order_target")
+    )
+
+    closed = orders.c.status.in_(CLOSED_STATUSES)
+    actual_cost = (
+        func.coalesce(orders.c.sellers_price, 0)
+        + func.coalesce(orders.c.shipping_price, 0)
+        + func.coalesce(orders.c.tax, 0)
+    )
+    per_order = (
+        select(
+            orders.c.id,
+            utc_date(connection.dialect.name, orders.c.created_at).label("day"),
+            func.coalesce(cast(orders.c.sourcer_id, String), "").label("sourcer"),
+            func.coalesce(cast(orders.c.purchaser_id, String), "").label("purchaser"),
+            func.coalesce(cast(orders.c.market, String), "").label("market"),
+            case((closed, 1), else_=0).label("closed"),
+            case((closed, func.coalesce(per_order_target.c.target, 0) - actual_cost), else_=0).label("savings"),
+            per_order_target.c.target.label("order_target"),
+            per_order_target.c.item_count.label("order_items"),
+            seconds_between(connection.dialect.name, orders.c.created_at, orders.c.assigned_at).label("response"),
+        )
+        .select_from(orders.outerjoin(per_order_target, per_order_target.c.sourcing_id == orders.c.id))
+        .where(in_days)
+        .subquery("per_order")
+    )
+
+    _lock_for_rebuild(connection, rollups)
+    clear = delete(rollups)
+    if days is not None:
+        clear = clear.where(rollups.c.day.in_(sorted(days)))
+    connection.execute(clear)
+
+    insert_columns = [
+        "day", "dimension", "dimension_key", "orders", "closed_orders",
+        "savings", "response_seconds", "responded_orders",
+    ]
+    for dimension in ("sourcer", "purchaser", "market"):
+        key = per_order.c[dimension]
+        summary = (
+            select(
+                per_order.c.day,
+                literal(dimension),
+                key,
+                func.count(per_order.c.id),
+                func.sum(per_order.c.closed),
+                func.sum(per_order.c.savings),
+                func.coalesce(func.sum(per_order.c.response), 0),
+                func.count(per_order.c.response),
+            )
+            .group_by(per_order.c.day, key)
+        )
+        if dimension == "purchaser":
+            summary = summary.where(key != "")
+        connection.execute(rollups.insert().from_select(insert_columns, summary))
+
+    # An order's savings are split across its categories by share of catalogue
+    # target (or of item count when the order has no target), so the category
+    # rows add up to the same company total as the other dimensions.
+    share = case(
+        (per_order.c.order_target > 0, per_category.c.target / per_order.c.order_target),
+        else_=per_category.c.item_count * 1.0 / per_order.c.order_items,
+    )
+    category_summary = (
+        select(
+            per_order.c.day,
+            literal("category"),
+            per_category.c.category,
+            func.count(distinct(per_order.c.id)),
+            func.sum(per_order.c.closed),
+            func.sum(per_order.c.savings * share),
+            func.coalesce(func.sum(per_order.c.response), 0),
+            func.count(per_order.c.response),
+        )
+        .select_from(per_category.join(per_order, per_order.c.id == per_category.c.sourcing_id))
+        .group_by(per_order.c.day, per_category.c.category)
+    )
+    connection.execute(rollups.insert().from_select(insert_columns, category_summary))
+
+
+# Upper bounds (seconds) of the duration histogram buckets; the last bucket is open-ended.
+DURATION_BUCKETS = (
+    5 * 60, 15 * 60, 30 * 60,
+    *(hours * 3600 for hours in (1, 2, 4, 8, 12, 24, 48, 72, 120, 168, 336, 720)),
+)
+
+# Time-series metric -> unit of its values
+SERIES_METRICS = {
+    "created": "orders",
+    "assigned": "orders",
+    "purchased": "orders",
+    "savings": "amount",
+    "time_to_assign": "hours",
+    "time_to_finalize": "hours",
+}
+DURATION_METRICS = ("time_to_assign", "time_to_finalize")
+
+def _duration_bucket(seconds):
+    return case(
+        *((seconds < bound, index) for index, bound in enumerate(DURATION_BUCKETS)),
+        else_=len(DURATION_BUCKETS),
+    )
+
+
+def rebuild_series(connection, days=None):
+    """
+    Recomputes the report_daily_series rows for the given days from
+    sourcing_ids, or every day when `days` is None. Each metric buckets orders
+    by the UTC day of its own event: created by created_at, assigned and
+    time_to_assign by assigned_at, and purchased, savings and time_to_finalize
+    by finalized_at of closed orders. Savings are the orders' stored totals.
+    """
+    if days is not None and not days:
+        return
+    orders = models.SourcingID.__table__
+    series = models.ReportSeriesPoint.__table__
+    closed = orders.c.status.in_(CLOSED_STATUSES)
+
+    _lock_for_rebuild(connection, series)
+    clear = delete(series)
+    if days is not None:
+        clear = clear.where(series.c.day.in_(sorted(days)))
+    connection.execute(clear)
+
+    insert_columns = ["day", "metric", "bucket", "value"]
+    totals = [
+        ("created", orders.c.created_at, literal(True), func.count()),
+        ("assigned", orders.c.assigned_at, literal(True), func.count()),
+        ("purchased", orders.c.finalized_at, closed, func.count()),
+        ("savings", orders.c.finalized_at, closed, func.coalesce(func.sum(orders.c.savings), 0)),
+    ]
+    for metric, at, condition, value in totals:
+        day = utc_date(connection.dialect.name, at)
+        summary = (
+            select(day, literal(metric), literal(-1), value)
+            .where(at.isnot(None), condition, _on_days(at, days))
+            .group_by(day)
+        )
+        connection.execute(series.insert().from_select(insert_columns, summary))
+
+    durations = [
+        ("time_to_assign", orders.c.assigned_at, literal(True)),
+        ("time_to_finalize", orders.c.finalized_at, closed),
+    ]
+    for metric, at, condition in durations:
+        # Bucket in a subquery so GROUP BY can name the CASE instead of repeating its parameters
+        measured = (
+            select(
+                utc_date(connection.dialect.name, at).label("day"),
+                _duration_bucket(seconds_between(connection.dialect.name, orders.c.created_at, at)).label("bucket"),
+            )
+            .where(at.isnot(None), orders.c.created_at.isnot(None), condition, _on_days(at, days))
+            .subquery("measured")
+        )
+        histogram = (
+            select(measured.c.day, literal(metric), measured.c.bucket, func.count())
+            .group_by(measured.c.day, measured.c.bucket)
+        )
+        connection.execute(series.insert().from_select(insert_columns, histogram))
+
+
+def _percentile(histogram: dict, total: int, percentile: float):
+    """
+    Estimates a percentile (in seconds) from bucket counts by interpolating
+    inside the bucket holding it; the open-ended last bucket reports its
+    lower bound.
+    """
+    rank = total * percentile / 100
+    seen = 0
+    for index in sorted(histogram):
+        count = histogram[index]
+        if seen + count >= rank and count:
+            lower = DURATION_BUCKETS[index - 1] if index else 0
+            if index >= len(DURATION_BUCKETS):
+                return float(lower)
+            return lower + (DURATION_BUCKETS[index] - lower) * (rank - seen) / count
+        seen += count
+    return None
+
+
+def series_points(rows, metric: str, bucket: str, start: date, end: date, percentiles):
+    """
+    Folds (day, bucket, value) rows of one metric into consecutive day or
+    ISO-week points from `start` to `end`, filling empty periods. Plain
+    metrics sum their values; duration metrics merge their histograms and
+    report a count plus the requested percentiles in hours.
+    """
+    def period(day):
+        return day - timedelta(days=day.weekday()) if bucket == "week" else day
+
+    step = timedelta(days=7 if bucket == "week" else 1)
+    periods = {}
+    current = period(start)
+    while current <= end:
+        periods[current] = {}
+        current += step
+    for day, index, value in rows:
+        histogram = periods[period(day)]
+        histogram[index] = histogram.get(index, 0) + (value or 0)
+
+    points = []
+    for period_start, histogram in periods.items():
+        if metric not in DURATION_METRICS:
+            points.append({"start": period_start, "value": histogram.get(-1, 0)})
+            continue
+        total = int(sum(histogram.values()))
+        points.append({
+            "start": period_start,
+            "count": total,
+            "percentiles": {
+                f"p{p:g}": (seconds / 3600 if (seconds := _percentile(histogram, total, p)) is not None else None)
+                for p in percentiles
+            },
+        })
+    return points
+
+
+def series_rows(metric: str, start: date, end: date):
+    """Statement for the stored (day, bucket, value) rows of a metric over a day range."""
+    point = models.ReportSeriesPoint
+    return (
+        select(point.day, point.bucket, point.value)
+        .where(point.metric == metric, point.day >= start, point.day <= end)
+    )
+
+
+@dataclass
+class ReportOrder:
+    """The columns of one order that the report tables are derived from."""
+    id: int
+    created_at: datetime | None
+    assigned_at: datetime | None
+    finalized_at: datetime | None
+    status: models.SourcingItemStatus | None
+    sourcer_id: int | None
+    purchaser_id: int | None
+    market: models.Market | None
+    sellers_price: Decimal | None
+    shipping_price: Decimal | None
+    tax: Decimal | None
+    savings: Decimal | None
+    # (category, catalogue target, item count) per item category
+    categories: list = field(default_factory=list)
+
+
+@dataclass
+class Contributions:
+    """What a set of orders adds to the report tables, keyed like the tables' unique constraints."""
+    # (day, dimension, dimension_key) -> [orders, closed_orders, savings, response_seconds, responded_orders]
+    rollups: dict = field(default_factory=dict)
+    # (day, metric, bucket) -> value
+    series: dict = field(default_factory=dict)
+
+
+_REPORT_ORDER_COLUMNS = [
+    "id", "created_at", "assigned_at", "finalized_at", "status", "sourcer_id", "purchaser_id", "market",
+    "sellers_price", "shipping_price", "tax", "savings",
+]
+
+
+def load_report_orders(connection, order_ids) -> list[ReportOrder]:
+    """Reads the report inputs of the given orders, items priced from the catalogue, in one query per batch."""
+    orders = models.SourcingID.__table__
+    items = models.SourcingItem.__table__
+    products = models.MasterProduct.__table__
+    order_ids = sorted(set(order_ids))
+    loaded = {}
+    for offset in range(0, len(order_ids), _BATCH_SIZE):
+        batch = order_ids[offset:offset + _BATCH_SIZE]
+        per_category = (
+            select(
+                items.c.sourcing_id,
+                func.coalesce(items.c.category, "").label("category"),
+                func.sum(func.coalesce(products.c.target_cost_per_unit, 0) * func.coalesce(items.c.quantity_needed, 1)).label("target"),
+                func.count(items.c.id).label("item_count"),
+            )
+            .select_from(items.outerjoin(products, products.c.sku == items.c.sku))
+            .where(items.c.sourcing_id.in_(batch))
+            .group_by(items.c.sourcing_id, func.coalesce(items.c.category, ""))
+            .subquery("per_category")
+        )
+        rows = connection.execute(
+            select(
+                *(orders.c[name] for name in _REPORT_ORDER_COLUMNS),
+                per_category.c.category, per_category.c.target, per_category.c.item_count,
+            )
+            .select_from(orders.outerjoin(per_category, per_category.c.sourcing_id == orders.c.id))
+            .where(orders.c.id.in_(batch))
+        )
+        for row in rows:
+            order = loaded.get(row.id)
+            if order is None:
+                order = loaded[row.id] = ReportOrder(*row[:len(_REPORT_ORDER_COLUMNS)])
+            if row.category is not None:
+                order.categories.append((row.category, _decimal(row.target), row.item_count))
+    return list(loaded.values())
+
+
+def _decimal(value) -> Decimal:
+    return value if isinstance(value, Decimal) else Decimal(str(value or 0))
+
+
+def contributions(orders) -> Contributions:
+    """
+    Computes what the given orders add to the report tables, by the same rules
+    as rebuild_rollups and rebuild_series: rollups by created day, savings only
+    for closed orders and split across categories by catalogue target share
+    (or item count share when the order has no target), and each series
+    metric by the day of its own event.
+    """
+    result = Contributions()
+
+    def add_rollup(key, values):
+        current = result.rollups.setdefault(key, [0, 0, Decimal(0), 0.0, 0])
+        for index, value in enumerate(values):
+            current[index] += value
+
+    def add_point(at, metric, bucket, value=1):
+        key = (utc_day(at), metric, bucket)
+        result.series[key] = result.series.get(key, 0) + value
+
+    for order in orders:
+        closed = order.status in CLOSED_STATUSES
+        if order.assigned_at is not None:
+            add_point(order.assigned_at, "assigned", -1)
+        if closed and order.finalized_at is not None:
+            add_point(order.finalized_at, "purchased", -1)
+            add_point(order.finalized_at, "savings", -1, float(order.savings or 0))
+        if order.created_at is None:
+            continue
+
+        created_at = _utc(order.created_at)
+        add_point(created_at, "created", -1)
+        if order.assigned_at is not None:
+            seconds = (_utc(order.assigned_at) - created_at).total_seconds()
+            add_point(order.assigned_at, "time_to_assign", bisect_right(DURATION_BUCKETS, seconds))
+        if closed and order.finalized_at is not None:
+            seconds = (_utc(order.finalized_at) - created_at).total_seconds()
+            add_point(order.finalized_at, "time_to_finalize", bisect_right(DURATION_BUCKETS, seconds))
+
+        day = created_at.date()
+        order_target = sum((target for _, target, _ in order.categories), Decimal(0))
+        order_items = sum(count for _, _, count in order.categories)
+        actual_cost = _decimal(order.sellers_price) + _decimal(order.shipping_price) + _decimal(order.tax)
+        savings = order_target - actual_cost if closed else Decimal(0)
+        response = (_utc(order.assigned_at) - created_at).total_seconds() if order.assigned_at else None
+        measured = (response or 0.0, 0 if response is None else 1)
+
+        add_rollup((day, "sourcer", "" if order.sourcer_id is None else str(order.sourcer_id)), (1, int(closed), savings, *measured))
+        if order.purchaser_id is not None:
+            add_rollup((day, "purchaser", str(order.purchaser_id)), (1, int(closed), savings, *measured))
+        add_rollup((day, "market", order.market.name if order.market else ""), (1, int(closed), savings, *measured))
+        for category, target, count in order.categories:
+            share = target / order_target if order_target > 0 else Decimal(count) / order_items
+            add_rollup((day, "category", category), (1, int(closed), savings * share, *measured))
+    return result
+
+
+def _upsert_adding(connection, table, key_columns, rows):
+    """Multi-row INSERT ... ON CONFLICT DO UPDATE that adds each row's values onto the stored row with its key."""
+    insert = postgresql.insert if connection.dialect.name == "postgresql" else sqlite.insert
+    for offset in range(0, len(rows), _BATCH_SIZE):
+        statement = insert(table).values(rows[offset:offset + _BATCH_SIZE])
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={name: table.c[name] + statement.excluded[name] for name in rows[0] if name not in key_columns},
+        ))
+
+
+def apply_report_changes(connection, before: Contributions, after: Contributions):
+    """
+    Moves the report tables from the `before` to the `after` contributions of
+    some orders with delta upserts, touching only the keys that changed.
+    Rollup rows left without orders are deleted.
+
+    Every write path goes through here, and it always writes rollups before
+    series and each table's rows in key order, so concurrent writers on
+    PostgreSQL queue on shared rows instead of deadlocking. Transactions
+    rebuilding both tables lock them in the same order.
+    """
+    rollups = models.ReportRollup.__table__
+    series = models.ReportSeriesPoint.__table__
+    zero = [0, 0, Decimal(0), 0.0, 0]
+    rows, emptied = [], []
+    for key in sorted(before.rollups.keys() | after.rollups.keys()):
+        old, new = before.rollups.get(key, zero), after.rollups.get(key, zero)
+        delta = [n - o for n, o in zip(new, old)]
+        if not any(delta):
+            continue
+        day, dimension, dimension_key = key
+        rows.append({
+            "day": day, "dimension": dimension, "dimension_key": dimension_key,
+            "orders": delta[0], "closed_orders": delta[1], "savings": delta[2],
+            "response_seconds": delta[3], "responded_orders": delta[4],
+        })
+        if delta[0] < 0:
+            emptied.append(key)
+    if rows:
+        _upsert_adding(connection, rollups, ["day", "dimension", "dimension_key"], rows)
+    for offset in range(0, len(emptied), _BATCH_SIZE):
+        connection.execute(
+            delete(rollups)
+            .where(tuple_(rollups.c.day, rollups.c.dimension, rollups.c.dimension_key).in_(emptied[offset:offset + _BATCH_SIZE]))
+            .where(rollups.c.orders <= 0)
+        )
+
+    points = []
+    for key in sorted(before.series.keys() | after.series.keys()):
+        delta = after.series.get(key, 0) - before.series.get(key, 0)
+        if delta:
+            day, metric, bucket = key
+            points.append({"day": day, "metric": metric, "bucket": bucket, "value": delta})
+    if points:
+        _upsert_adding(connection, series, ["day", "metric", "bucket"], points)
+
+
+def update_reports(connection, order_ids, before: Contributions | None = None):
+    """Applies the change from `before` (nothing, for new orders) to the orders' current contributions."""
+    apply_report_changes(connection, before or Contributions(), contributions(load_report_orders(connection, order_ids)))
+
+
+def orders_priced_by(connection, skus) -> set:
+    """
+    Ids of the closed orders with items of the given SKUs. Their savings and
+    category split follow those SKUs' catalogue target, so a catalogue write
+    snapshots their contributions before it and passes them to update_reports
+    after it, in the same transaction. Open orders carry no savings.
+    """
+    orders = models.SourcingID.__table__
+    items = models.SourcingItem.__table__
+    skus = sorted(set(skus))
+    order_ids = set()
+    for offset in range(0, len(skus), _BATCH_SIZE):
+        order_ids.update(connection.execute(
+            select(items.c.sourcing_id)
+            .join(orders, orders.c.id == items.c.sourcing_id)
+            .where(items.c.sku.in_(skus[offset:offset + _BATCH_SIZE]), orders.c.status.in_(CLOSED_STATUSES))
+            .distinct()
+        ).scalars())
+    return order_ids
+
+
+def _repriced_skus(session) -> set:
+    """SKUs whose catalogue target this flush may change: priced, repriced, renamed or deleted products."""
+    skus = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, models.MasterProduct):
+            continue
+        state = inspect(obj)
+        if obj in session.dirty and not (
+            state.attrs.sku.history.has_changes() or state.attrs.target_cost_per_unit.history.has_changes()
+        ):
+            continue
+        skus.update(sku for sku in (obj.sku, *state.attrs.sku.history.deleted) if sku is not None)
+    return skus
+
+
+def _stored_orders_touched(session) -> set:
+    """Ids of the already stored orders whose report contributions this flush may change."""
+    order_ids = set()
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, models.SourcingItem):
+            state = inspect(obj)
+            history = state.attrs.sourcing_id.history
+            order_ids.update(i for i in (obj.sourcing_id, *history.deleted) if i is not None)
+            # Items attached through the relationship get their sourcing_id during the flush
+            moved = state.attrs.sourcing_order.history
+            order_ids.update(o.id for o in (*moved.added, *moved.deleted) if o is not None and o.id is not None)
+        elif isinstance(obj, models.SourcingID) and obj not in session.new:
+            state = inspect(obj)
+            if obj in session.deleted or state.attrs["items"].history.has_changes() or any(
+                state.attrs[k].history.has_changes() for k in _REPORT_INPUTS
+            ):
+                order_ids.add(obj.id)
+    skus = _repriced_skus(session)
+    if skus:
+        order_ids |= orders_priced_by(session.connection(), skus)
+    return order_ids
+
+
+@event.listens_for(Session, "before_flush")
+def snapshot_reports(session, flush_context, instances):
+    order_ids = _stored_orders_touched(session)
+    before = contributions(load_report_orders(session.connection(), order_ids)) if order_ids else Contributions()
+    session.info["report_before"] = (order_ids, before)
+
+
+@event.listens_for(Session, "after_flush")
+def maintain_reports(session, flush_context):
+    order_ids, before = session.info.pop("report_before", (set(), Contributions()))
+    order_ids = set(order_ids)
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, models.SourcingID) and obj in session.new:
+            order_ids.add(obj.id)
+        elif isinstance(obj, models.SourcingItem) and obj.sourcing_id is not None:
+            order_ids.add(obj.sourcing_id)
+    if order_ids:
+        update_reports(session.connection(), order_ids, before)
@@ -0,0 +1,98 @@
+from dataclasses import replace
+from datetime import datetime
+
+from sqlalchemy import exists, select, update
+from sqlalchemy.orm import aliased
+
+from ..db import models
+from . import report_service
+
+# Picks retried when the picked order changes before the claim's UPDATE
+CLAIM_ATTEMPTS = 5
+
+
+def next_pending_order(market: models.Market | None = None, category: str | None = None):
+    """
+    Scalar subquery for the id of the oldest pending order matching the
+    filters, locked with FOR UPDATE SKIP LOCKED so concurrent claimers each
+    get a different row instead of queueing on the same one. Backends without
+    row locks (SQLite) drop the locking clause and rely on the claim's
+    status and version check, as their writers are serialised anyway.
+    """
+    candidate = aliased(models.SourcingID, name="candidate")
+    statement = select(candidate.id).where(candidate.status == models.SourcingItemStatus.Pending)
+    if market:
+        statement = statement.where(candidate.market == market)
+    if category:
+        item = models.SourcingItem
+        statement = statement.where(exists().where(item.sourcing_id == candidate.id, item.category == category))
+    return (
+        statement
+        .order_by(candidate.created_at, candidate.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+
+
+def claim_order(sourcing_id: int, version: int, purchaser_id: int, now: datetime):
+    """
+    UPDATE ... RETURNING that assigns the order to the purchaser only if it is
+    still pending and still at `version`. Returns no row when someone else got
+    there first. It bypasses the flush hooks, so it bumps the version itself.
+    """
+    order = models.SourcingID
+    return (
+        update(order)
+        .where(
+            order.id == sourcing_id,
+            order.status == models.SourcingItemStatus.Pending,
+            order.version == version,
+        )
+        .values(
+            status=models.SourcingItemStatus.Assigned,
+            purchaser_id=purchaser_id,
+            assigned_at=now,
+            version=order.version + 1,
+        )
+        .returning(order.id, order.sourcer_id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def claim(connection, target, purchaser_id: int, now: datetime):
+    """
+    Assigns the order selected by `target` (an id or next_pending_order()) to
+    the purchaser and moves its report rows by the resulting deltas, as the
+    skipped flush hooks would have. Returns the claimed (id, sourcer_id), or
+    None when there is nothing pending to claim.
+
+    The order's report inputs are read before the UPDATE, which only applies
+    if the version is unchanged since, so the deltas are exact. On PostgreSQL
+    the pick holds the row lock; on SQLite a concurrent edit makes the
+    version check fail and the pick is retried. Only the order's own rows are
+    locked: no day-wide lock serialises claims or same-day writes.
+    """
+    order = models.SourcingID
+    pick = select(order.id, order.version).where(
+        order.id == target, order.status == models.SourcingItemStatus.Pending
+    )
+    if isinstance(target, int):
+        pick = pick.with_for_update()
+    for _ in range(CLAIM_ATTEMPTS):
+        picked = connection.execute(pick).one_or_none()
+        if picked is None:
+            return None
+        reported = report_service.load_report_orders(connection, [picked.id])
+        claimed = connection.execute(claim_order(picked.id, picked.version, purchaser_id, now)).one_or_none()
+        if claimed is None:
+            continue
+        assigned = [
+            replace(o, status=models.SourcingItemStatus.Assigned, purchaser_id=purchaser_id, assigned_at=now)
+            for o in reported
+        ]
+        report_service.apply_report_changes(
+            connection, report_service.contributions(reported), report_service.contributions(assigned)
+        )
+        return claimed
+    return None
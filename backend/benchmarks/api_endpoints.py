@@ -0,0 +1,426 @@
+"""
+Latency percentiles, throughput and SQL query counts for every API endpoint,
+served in-process through httpx's ASGI transport from a database seeded by
+datagen.py (never point this at production: it drops and recreates every
+table).
+
+Each endpoint first gets `--warmup` sequential requests, each with the
+in-process caches cleared, which count the SQL statements a cold request
+issues; then `--requests` requests `--concurrency` at a time, which are timed.
+Counts for the report job endpoints include work of the jobs they start. Results go to stdout and, with
+`--output`, to a JSON file that compare.py diffs against another run:
+
+    python benchmarks/api_endpoints.py --url sqlite:///bench.db --output before.json
+    python benchmarks/api_endpoints.py --url postgresql://localhost/hector_bench --orders 50000 --output after.json
+    python benchmarks/compare.py before.json after.json
+
+`--only sourcing` runs the endpoints whose name contains "sourcing".
+GET /sourcing/events is left out, as it streams for as long as the client
+stays connected. Latencies include the in-process client, not a network.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import datagen
+
+API = "/api/v1"
+
+
+@dataclass
+class Request:
+    method: str
+    path: str
+    user: str | None = None      # email the request is authenticated as
+    json: object = None
+    params: dict | None = None
+    data: dict | None = None
+
+
+@dataclass
+class Scenario:
+    name: str                                           # "METHOD /path/{template}"
+    build: Callable[["Context", random.Random], Request]
+    expect: tuple = (200,)
+    # Called with each response, e.g. to remember what it created for later scenarios
+    record: Callable[["Context", object], None] | None = None
+
+
+@dataclass
+class Context:
+    """Ids sampled from the seeded database; write scenarios consume them."""
+    users: dict
+    orders: list                    # (id, sourcer email, purchaser email or None, status)
+    items: list                     # (id, order id, sourcer email)
+    pending: list
+    products: list                  # (id, sku)
+    created_products: list = field(default_factory=list)
+    created_users: list = field(default_factory=list)
+    jobs: list = field(default_factory=list)
+    serial: int = 0
+
+    def user(self, role, rng) -> str:
+        return datagen.email(role, rng.randrange(len(self.users[role])))
+
+    def take(self, pool: list):
+        return pool.pop() if pool else 0     # id 0 never exists, so an empty pool shows up as errors
+
+    def next_serial(self) -> int:
+        self.serial += 1
+        return self.serial
+
+
+class QueryCounter:
+    """Counts statements executed on the app's engines."""
+
+    def __init__(self, engines):
+        from sqlalchemy import event
+
+        self.count = 0
+        self._lock = threading.Lock()
+        for engine in engines:
+            event.listen(engine, "before_cursor_execute", self._count)
+
+    def _count(self, *args):
+        with self._lock:
+            self.count += 1
+
+
+def _item_body(ctx, rng):
+    product_id, sku = rng.choice(ctx.products)
+    return {
+        "product_name": f"Bench item {product_id}", "sku": sku, "quantity_needed": rng.randint(1, 4),
+        "product_type": "Game", "category": "Bench", "target_cost_per_unit": 25,
+    }
+
+
+def _order_body(ctx, rng):
+    return {
+        "seller_name": "bench", "market": "eBay", "sellers_price": 40, "shipping_price": 5, "tax": 3,
+        "items": [_item_body(ctx, rng) for _ in range(rng.randint(1, 3))],
+    }
+
+
+def _assigned(ctx, rng):
+    while True:
+        order = rng.choice(ctx.orders)
+        if order[2] is not None:
+            return order
+
+
+def _recent_range(days: int) -> dict:
+    today = date.today()
+    return {"from": str(today - timedelta(days=days)), "to": str(today)}
+
+
+def scenarios(roles) -> list[Scenario]:
+    admin, manager, sourcer, purchaser = (
+        roles.admin, roles.manager, roles.sourcer, roles.purchaser
+    )
+    first_admin = datagen.email(admin, 0)
+    first_manager = datagen.email(manager, 0)
+    month = date.today().strftime("%Y-%m")
+
+    def remember(pool_name):
+        def record(ctx, response):
+            if response.status_code in (200, 201, 202):
+                getattr(ctx, pool_name).append(response.json()["id"])
+        return record
+
+    return [
+        # Reads
+        Scenario("POST /login/token", lambda ctx, rng: Request(
+            "POST", "/login/token", data={"username": ctx.user(sourcer, rng), "password": datagen.PASSWORD})),
+        Scenario("GET /users/me", lambda ctx, rng: Request("GET", "/users/me", ctx.user(sourcer, rng))),
+        Scenario("GET /users/", lambda ctx, rng: Request("GET", "/users/", first_admin)),
+        Scenario("GET /products/", lambda ctx, rng: Request("GET", "/products/", ctx.user(sourcer, rng))),
+        Scenario("GET /products/?q=", lambda ctx, rng: Request(
+            "GET", "/products/", ctx.user(sourcer, rng), params={"q": rng.choice(datagen.WORDS)})),
+        Scenario("GET /products/?q=&fuzzy=true", lambda ctx, rng: Request(
+            "GET", "/products/", ctx.user(sourcer, rng), params={"q": "contoller", "fuzzy": "true"})),
+        Scenario("GET /sourcing/pending", lambda ctx, rng: Request("GET", "/sourcing/pending", ctx.user(purchaser, rng))),
+        Scenario("GET /sourcing/pending?view=summary", lambda ctx, rng: Request(
+            "GET", "/sourcing/pending", ctx.user(purchaser, rng), params={"view": "summary"})),
+        Scenario("GET /sourcing/assigned/me", lambda ctx, rng: Request(
+            "GET", "/sourcing/assigned/me", _assigned(ctx, rng)[2])),
+        Scenario("GET /sourcing/{sourcing_id}", lambda ctx, rng: (lambda order: Request(
+            "GET", f"/sourcing/{order[0]}", order[1]))(rng.choice(ctx.orders))),
+        Scenario("GET /reports/dashboard", lambda ctx, rng: Request("GET", "/reports/dashboard", first_manager)),
+        Scenario("GET /reports/dashboard?start_date=", lambda ctx, rng: Request(
+            "GET", "/reports/dashboard", first_manager,
+            params={"start_date": str(date.today() - timedelta(days=30)), "end_date": str(date.today())})),
+        Scenario("GET /reports/timeseries", lambda ctx, rng: Request(
+            "GET", "/reports/timeseries", first_manager, params={"metric": "created", **_recent_range(90)})),
+        Scenario("GET /reports/timeseries?metric=time_to_assign", lambda ctx, rng: Request(
+            "GET", "/reports/timeseries", first_manager,
+            params={"metric": "time_to_assign", "bucket": "week", **_recent_range(90)})),
+        Scenario("GET /reports/sourcer/me", lambda ctx, rng: Request("GET", "/reports/sourcer/me", ctx.user(sourcer, rng))),
+        Scenario("GET /reports/purchaser/me", lambda ctx, rng: Request("GET", "/reports/purchaser/me", ctx.user(purchaser, rng))),
+        Scenario("GET /reports/dashboard/export", lambda ctx, rng: Request(
+            "GET", "/reports/dashboard/export", first_manager, params={"month": month})),
+        Scenario("GET /admin/db-pool", lambda ctx, rng: Request("GET", "/admin/db-pool", first_admin)),
+        Scenario("GET /admin/caches", lambda ctx, rng: Request("GET", "/admin/caches", first_admin)),
+        # Writes
+        Scenario("POST /sourcing/", lambda ctx, rng: Request(
+            "POST", "/sourcing/", ctx.user(sourcer, rng), json=_order_body(ctx, rng))),
+        Scenario("POST /sourcing/bulk", lambda ctx, rng: Request(
+            "POST", "/sourcing/bulk", ctx.user(sourcer, rng), json=[_order_body(ctx, rng) for _ in range(20)])),
+        Scenario("POST /sourcing/{sourcing_id}/assign", lambda ctx, rng: Request(
+            "POST", f"/sourcing/{ctx.take(ctx.pending)}/assign", ctx.user(purchaser, rng))),
+        Scenario("POST /sourcing/claim-next", lambda ctx, rng: Request(
+            "POST", "/sourcing/claim-next", ctx.user(purchaser, rng)), expect=(200, 404)),
+        Scenario("PUT /sourcing/{sourcing_id}", lambda ctx, rng: (lambda order: Request(
+            "PUT", f"/sourcing/{order[0]}", order[2],
+            json={"tracking_status": rng.choice(["Awaiting", "In Transit", "Received"])}))(_assigned(ctx, rng))),
+        Scenario("PATCH /sourcing/items/{item_id}", lambda ctx, rng: (lambda item: Request(
+            "PATCH", f"/sourcing/items/{item[0]}", item[2], json={"quantity_needed": rng.randint(1, 4)}))(rng.choice(ctx.items))),
+        Scenario("POST /sourcing/{sourcing_id}/items", lambda ctx, rng: (lambda order: Request(
+            "POST", f"/sourcing/{order[0]}/items", order[1], json=_item_body(ctx, rng)))(rng.choice(ctx.orders))),
+        Scenario("PATCH /sourcing/{sourcing_id}/items", lambda ctx, rng: (lambda order: Request(
+            "PATCH", f"/sourcing/{order[0]}/items", order[1],
+            json={"add": [_item_body(ctx, rng)]}))(rng.choice(ctx.orders))),
+        Scenario("DELETE /sourcing/items/{item_id}", lambda ctx, rng: (lambda item: Request(
+            "DELETE", f"/sourcing/items/{item[0]}", item[2]))(ctx.items.pop()), expect=(204,)),
+        Scenario("POST /products/", lambda ctx, rng: Request("POST", "/products/", first_admin, json={
+            "sku": f"BENCH-{ctx.next_serial()}", "product_name": "Bench product", "target_cost_per_unit": 10,
+            "category": "Bench", "product_type": "Game",
+        }), record=remember("created_products")),
+        Scenario("PUT /products/{product_id}", lambda ctx, rng: (lambda product: Request(
+            "PUT", f"/products/{product[0]}", first_admin, json={
+                "sku": product[1], "product_name": f"Renamed {ctx.next_serial()}", "target_cost_per_unit": 12,
+                "category": "Bench", "product_type": "Game",
+            }))(rng.choice(ctx.products))),
+        Scenario("DELETE /products/{product_id}", lambda ctx, rng: Request(
+            "DELETE", f"/products/{ctx.take(ctx.created_products)}", first_admin)),
+        Scenario("POST /users/", lambda ctx, rng: Request("POST", "/users/", first_admin, json={
+            "email": f"new{ctx.next_serial()}@{datagen.EMAIL_DOMAIN}", "first_name": "New", "last_name": "User",
+            "password": datagen.PASSWORD, "role": "sourcer",
+        }), expect=(201,), record=remember("created_users")),
+        Scenario("PUT /users/{user_id}", lambda ctx, rng: Request(
+            "PUT", f"/users/{rng.choice(ctx.users[sourcer])}", first_admin, json={"first_name": f"Renamed{ctx.next_serial()}"})),
+        Scenario("DELETE /users/{user_id}", lambda ctx, rng: Request(
+            "DELETE", f"/users/{ctx.take(ctx.created_users)}", first_admin)),
+        Scenario("POST /reports/jobs", lambda ctx, rng: Request(
+            "POST", "/reports/jobs", first_manager, json={"kind": "export", "month": month}),
+            expect=(202,), record=remember("jobs")),
+        Scenario("GET /reports/jobs/{job_id}", lambda ctx, rng: Request(
+            "GET", f"/reports/jobs/{rng.choice(ctx.jobs)}", first_manager)),
+    ]
+
+
+def _percentile(ordered: list, q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def run_scenario(client, tokens, ctx, scenario, counter, clear_caches, warmup: int, requests: int, concurrency: int, seed: int):
+    rng = random.Random(f"{seed}:{scenario.name}")
+    statuses = Counter()
+    errors = []
+
+    async def send(request: Request):
+        headers = {"Authorization": f"Bearer {tokens(request.user)}"} if request.user else {}
+        response = await client.request(
+            request.method, API + request.path, headers=headers,
+            json=request.json, params=request.params, data=request.data,
+        )
+        statuses[response.status_code] += 1
+        if response.status_code not in scenario.expect and len(errors) < 3:
+            errors.append(f"{response.status_code} {response.text[:200]}")
+        if scenario.record:
+            scenario.record(ctx, response)
+
+    queries = []
+    for _ in range(warmup):
+        # Cold caches, so the count does not depend on which endpoints ran before
+        clear_caches()
+        before = counter.count
+        await send(scenario.build(ctx, rng))
+        queries.append(counter.count - before)
+
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(request):
+        async with gate:
+            started = time.perf_counter()
+            await send(request)
+            latencies.append(time.perf_counter() - started)
+
+    # Requests are built up front, so consumed ids are handed out in a fixed order
+    batch = [scenario.build(ctx, rng) for _ in range(requests)]
+    started = time.perf_counter()
+    await asyncio.gather(*(one(request) for request in batch))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    failed = sum(n for code, n in statuses.items() if code not in scenario.expect)
+    result = {
+        "requests": warmup + requests,
+        "errors": failed,
+        "statuses": {str(code): n for code, n in sorted(statuses.items())},
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else None,
+        "mean_ms": None, "p50_ms": None, "p95_ms": None, "p99_ms": None, "max_ms": None,
+        "queries_per_request": round(statistics.mean(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+    if latencies:
+        result.update({
+            "mean_ms": round(statistics.mean(latencies) * 1000, 3),
+            "p50_ms": round(_percentile(latencies, 0.50) * 1000, 3),
+            "p95_ms": round(_percentile(latencies, 0.95) * 1000, 3),
+            "p99_ms": round(_percentile(latencies, 0.99) * 1000, 3),
+            "max_ms": round(latencies[-1] * 1000, 3),
+        })
+    if errors:
+        result["sample_errors"] = errors
+    return result
+
+
+def _context(SessionLocal, models, users: dict, seed: int) -> Context:
+    from sqlalchemy import select
+
+    rng = random.Random(seed)
+    emails = {}
+    with SessionLocal() as db:
+        for user_id, email in db.execute(select(models.User.id, models.User.email)):
+            emails[user_id] = email
+        order = models.SourcingID
+        orders = [
+            (row.id, emails[row.sourcer_id], emails.get(row.purchaser_id), row.status)
+            for row in db.execute(select(order.id, order.sourcer_id, order.purchaser_id, order.status).order_by(order.id))
+        ]
+        owners = {order_id: sourcer for order_id, sourcer, _, _ in orders}
+        item = models.SourcingItem
+        items = [(row.id, row.sourcing_id, owners[row.sourcing_id])
+                 for row in db.execute(select(item.id, item.sourcing_id).order_by(item.id))]
+        products = [tuple(row) for row in db.execute(
+            select(models.MasterProduct.id, models.MasterProduct.sku).order_by(models.MasterProduct.id))]
+        # A finished job for GET /reports/jobs/{job_id}, should POST /reports/jobs not run
+        job = models.ReportJob(
+            kind="export", params={}, status=models.JobStatus.succeeded,
+            requested_by=users[models.UserRole.manager][0],
+        )
+        db.add(job)
+        db.commit()
+        jobs = [job.id]
+    rng.shuffle(items)
+    pending = [order_id for order_id, _, _, status in orders if status == models.SourcingItemStatus.Pending]
+    rng.shuffle(pending)
+    return Context(users=users, orders=orders, items=items, pending=pending, products=products, jobs=jobs)
+
+
+def _git_commit() -> dict:
+    here = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = bool(subprocess.run(["git", "status", "--porcelain"], cwd=here, capture_output=True, text=True).stdout.strip())
+    except (OSError, subprocess.CalledProcessError):
+        return {"commit": None, "dirty": None}
+    return {"commit": commit, "dirty": dirty}
+
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy import create_engine
+
+    from app.core import security
+    from app.core.config import settings
+
+    # The engines are created from these when app.db.session is first imported, just below
+    settings.DATABASE_URL = args.url
+    settings.ASYNC_DATABASE_URL = None
+    from app.db import models
+    from app.db.session import SessionLocal, async_engine, engine
+    from app.api import deps
+    from app.main import app
+    from app.services import job_service, product_service, report_service
+
+    volumes = datagen.volumes_from(args)
+    started = time.perf_counter()
+    users = datagen.generate(create_engine(args.url), volumes, args.seed)
+    print(f"seeded {engine.dialect.name} in {time.perf_counter() - started:.1f}s: {asdict(volumes)}")
+
+    ctx = _context(SessionLocal, models, users, args.seed)
+    counter = QueryCounter([engine, async_engine.sync_engine])
+    token_cache = {}
+
+    def clear_caches():
+        for cache in (deps.user_cache, product_service.product_cache, report_service.purchaser_stats_cache):
+            cache.clear()
+
+    def tokens(email):
+        if email not in token_cache:
+            token_cache[email] = security.create_access_token({"sub": email})
+        return token_cache[email]
+
+    selected = [s for s in scenarios(models.UserRole) if not args.only or any(o in s.name for o in args.only)]
+    results = {}
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            for scenario in selected:
+                result = await run_scenario(
+                    client, tokens, ctx, scenario, counter, clear_caches,
+                    args.warmup, args.requests, args.concurrency, args.seed,
+                )
+                results[scenario.name] = result
+                print(
+                    f"{scenario.name:<50} p50 {result['p50_ms']:>8.2f}ms  p95 {result['p95_ms']:>8.2f}ms  "
+                    f"p99 {result['p99_ms']:>8.2f}ms  {result['throughput_rps']:>8.1f} req/s  "
+                    f"{result['queries_per_request']:>5} queries  errors {result['errors']}"
+                )
+                for error in result.get("sample_errors", []):
+                    print(f"    {error}")
+    finally:
+        job_service.runner.shutdown()
+
+    return {
+        "meta": {
+            **_git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "seed": args.seed,
+            "volumes": asdict(volumes),
+            "warmup": args.warmup,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+        },
+        "endpoints": results,
+    }
+
+
+def main(args) -> int:
+    result = asyncio.run(run(args))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2, sort_keys=True)
+        print(f"wrote {args.output}")
+    return 1 if any(r["errors"] for r in result["endpoints"].values()) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", required=True, help="scratch database URL")
+    parser.add_argument("--requests", type=int, default=200, help="timed requests per endpoint")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--warmup", type=int, default=10, help="sequential requests per endpoint, used for query counts")
+    parser.add_argument("--only", nargs="+", help="run endpoints whose name contains any of these")
+    parser.add_argument("--output", help="write results as JSON here")
+    datagen.add_arguments(parser)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,99 @@
+"""
+Side-by-side throughput of the same order-detail read served by a sync `def`
+handler (threadpool + sync engine) and an `async def` handler (async engine).
+
+Runs both apps in-process through httpx's ASGI transport against the
+configured DATABASE_URL, which must already contain at least one order:
+
+    python benchmarks/async_vs_sync.py --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app import schemas
+from app.api import deps
+from app.db import loaders, models
+from app.db.session import SessionLocal, async_engine, engine
+
+sync_app = FastAPI()
+async_app = FastAPI()
+
+
+@sync_app.get("/orders/{sourcing_id}", response_model=schemas.SourcingID)
+def read_order_sync(sourcing_id: int, db: Session = Depends(deps.get_db)):
+    return (
+        db.query(models.SourcingID)
+        .options(*loaders.ORDER_WITH_ITEMS)
+        .filter(models.SourcingID.id == sourcing_id)
+        .first()
+    )
+
+
+@async_app.get("/orders/{sourcing_id}", response_model=schemas.SourcingID)
+async def read_order_async(sourcing_id: int, db: AsyncSession = Depends(deps.get_async_db)):
+    return await db.scalar(
+        select(models.SourcingID)
+        .options(*loaders.ORDER_WITH_ITEMS)
+        .where(models.SourcingID.id == sourcing_id)
+    )
+
+
+async def run(app, path: str, requests: int, concurrency: int):
+    latencies = []
+    gate = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one():
+            async with gate:
+                started = time.perf_counter()
+                response = await client.get(path)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "throughput_rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+
+async def main(requests: int, concurrency: int):
+    with SessionLocal() as db:
+        sourcing_id = db.scalar(select(models.SourcingID.id).limit(1))
+    if sourcing_id is None:
+        print("No orders found; seed the database first.")
+        return
+    path = f"/orders/{sourcing_id}"
+
+    print(f"{requests} requests, concurrency {concurrency}, {engine.dialect.name}")
+    for name, app in (("sync", sync_app), ("async", async_app)):
+        await run(app, path, min(requests, 50), concurrency)  # warm up pools
+        result = await run(app, path, requests, concurrency)
+        print(f"{name:>5}: {result['throughput_rps']:8.1f} req/s  p50 {result['p50_ms']:7.2f} ms  p95 {result['p95_ms']:7.2f} ms")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
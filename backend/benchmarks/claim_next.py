@@ -0,0 +1,152 @@
+"""
+Concurrency check and throughput of POST /sourcing/claim-next's claim, run
+from many threads at once, each acting as a different purchaser.
+
+Seeds a scratch database (never point this at production: it claims every
+pending order) with pending orders, lets the threads claim until none are
+left, and checks that every order was claimed exactly once:
+
+    python benchmarks/claim_next.py --url postgresql://localhost/hector_bench --threads 1 2 4 8 16
+
+`--naive` also runs the old read-then-write assignment for comparison and
+counts the orders it hands to more than one purchaser. SQLite serialises
+writers, so only PostgreSQL shows how the claim scales.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, delete, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.services import report_service, sourcing_service
+
+MARKER = "claim-next-bench"
+
+
+def seed(engine, orders: int, purchasers: int):
+    """Recreates the bench users and `orders` pending orders; returns (sourcer id, purchaser ids)."""
+    with engine.begin() as conn:
+        conn.execute(delete(models.SourcingID).where(models.SourcingID.seller_name == MARKER))
+        users = models.User.__table__
+        ids = []
+        for n in range(purchasers + 1):
+            email = f"{MARKER}-{n}@example.com"
+            user_id = conn.scalar(select(users.c.id).where(users.c.email == email))
+            if user_id is None:
+                user_id = conn.scalar(insert(users).returning(users.c.id), {
+                    "email": email, "first_name": "Bench", "last_name": str(n), "hashed_password": "!",
+                    "role": models.UserRole.sourcer if n == 0 else models.UserRole.purchaser, "is_active": True,
+                })
+            ids.append(user_id)
+        now = datetime.now(timezone.utc)
+        conn.execute(insert(models.SourcingID), [
+            {"sourcer_id": ids[0], "seller_name": MARKER, "status": models.SourcingItemStatus.Pending, "created_at": now}
+            for _ in range(orders)
+        ])
+    return ids[0], ids[1:]
+
+
+def claim_loop(engine, purchaser_id: int, claimed: list):
+    with Session(engine) as db:
+        while True:
+            row = sourcing_service.claim(
+                db.connection(), sourcing_service.next_pending_order(), purchaser_id, datetime.now(timezone.utc)
+            )
+            if row is None:
+                db.rollback()
+                return
+            db.commit()
+            claimed.append((row.id, purchaser_id))
+
+
+def naive_loop(engine, purchaser_id: int, claimed: list):
+    """The previous assign flow: read the oldest pending order, check it in Python, then write."""
+    order = models.SourcingID
+    with Session(engine) as db:
+        while True:
+            row = db.execute(
+                select(order.id, order.status)
+                .where(order.status == models.SourcingItemStatus.Pending)
+                .order_by(order.created_at, order.id)
+                .limit(1)
+            ).one_or_none()
+            if row is None:
+                db.rollback()
+                return
+            if row.status == models.SourcingItemStatus.Pending:
+                before = report_service.contributions(report_service.load_report_orders(db.connection(), [row.id]))
+                db.execute(
+                    update(order).where(order.id == row.id).values(
+                        status=models.SourcingItemStatus.Assigned, purchaser_id=purchaser_id,
+                        assigned_at=datetime.now(timezone.utc),
+                    )
+                )
+                report_service.update_reports(db.connection(), [row.id], before)
+                db.commit()
+                claimed.append((row.id, purchaser_id))
+
+
+def run(engine, loop, orders: int, threads: int):
+    _, purchasers = seed(engine, orders, threads)
+    claimed = []
+    workers = [threading.Thread(target=loop, args=(engine, p, claimed)) for p in purchasers]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    with engine.connect() as conn:
+        owners = dict(conn.execute(
+            select(models.SourcingID.id, models.SourcingID.purchaser_id)
+            .where(models.SourcingID.seller_name == MARKER)
+        ).all())
+    counts = Counter(order_id for order_id, _ in claimed)
+    return {
+        "claims_per_s": len(claimed) / elapsed,
+        "unclaimed": sum(1 for owner in owners.values() if owner is None),
+        "double_claimed": sum(1 for n in counts.values() if n > 1),
+        # a purchaser told they won an order now owned by someone else
+        "lost_updates": sum(1 for order_id, purchaser in claimed if owners[order_id] != purchaser),
+    }
+
+
+def main(url: str, orders: int, thread_counts: list[int], naive: bool):
+    engine = create_engine(url, pool_size=max(thread_counts) + 1)
+    models.Base.metadata.create_all(engine)
+    print(f"{engine.dialect.name}, {orders} pending orders")
+    loops = [("claim-next", claim_loop)] + ([("naive", naive_loop)] if naive else [])
+    failed = False
+    for threads in sorted(thread_counts):
+        for name, loop in loops:
+            result = run(engine, loop, orders, threads)
+            print(
+                f"{name:<10} {threads:>3} threads  {result['claims_per_s']:9.1f} claims/s  "
+                f"unclaimed {result['unclaimed']}  double-claimed {result['double_claimed']}  "
+                f"lost updates {result['lost_updates']}"
+            )
+            if loop is claim_loop:
+                failed |= any(result[k] for k in ("unclaimed", "double_claimed", "lost_updates"))
+    with engine.begin() as conn:
+        conn.execute(delete(models.SourcingID).where(models.SourcingID.seller_name == MARKER))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", required=True, help="scratch database URL")
+    parser.add_argument("--orders", type=int, default=2000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--naive", action="store_true", help="also run the read-then-write assignment")
+    args = parser.parse_args()
+    sys.exit(main(args.url, args.orders, args.threads, args.naive))
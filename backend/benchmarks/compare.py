@@ -0,0 +1,69 @@
+"""
+Diffs two api_endpoints.py result files, endpoint by endpoint:
+
+    python benchmarks/compare.py before.json after.json --threshold 10
+
+An endpoint regresses when its p95 latency grows by more than `--threshold`
+percent, or when it issues more SQL statements per request. Exits with 1 if
+any endpoint regressed, so it can gate a CI job.
+"""
+import argparse
+import json
+import sys
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps", "queries_per_request")
+
+
+def _change(old, new) -> str:
+    if old is None or new is None:
+        return "n/a"
+    if not old:
+        return "+inf%" if new else "0%"
+    return f"{(new - old) / old * 100:+.0f}%"
+
+
+def compare(before: dict, after: dict, threshold: float) -> list[str]:
+    """Prints one line per endpoint; returns the names of those that regressed."""
+    for label, run in (("before", before), ("after", after)):
+        meta = run["meta"]
+        print(
+            f"{label}: {meta.get('commit') or '?'}{' (dirty)' if meta.get('dirty') else ''} "
+            f"{meta['database']} {meta['volumes']} x{meta['concurrency']}"
+        )
+    if (before["meta"]["volumes"], before["meta"]["database"]) != (after["meta"]["volumes"], after["meta"]["database"]):
+        print("warning: the runs used different databases or data volumes")
+
+    regressed = []
+    for name in sorted(before["endpoints"].keys() | after["endpoints"].keys()):
+        old, new = before["endpoints"].get(name), after["endpoints"].get(name)
+        if old is None or new is None:
+            print(f"{name:<50} only in {'after' if old is None else 'before'}")
+            continue
+        cells = "  ".join(f"{metric} {new[metric]} ({_change(old[metric], new[metric])})" for metric in METRICS)
+        slower = (
+            old["p95_ms"] and new["p95_ms"] is not None
+            and (new["p95_ms"] - old["p95_ms"]) / old["p95_ms"] * 100 > threshold
+        )
+        more_queries = (new["queries_per_request"] or 0) > (old["queries_per_request"] or 0)
+        flag = ""
+        if slower or more_queries or new["errors"] > old["errors"]:
+            regressed.append(name)
+            flag = "  REGRESSED"
+        print(f"{name:<50} {cells}{flag}")
+    return regressed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="allowed p95 growth, in percent")
+    args = parser.parse_args()
+    with open(args.before) as f:
+        before = json.load(f)
+    with open(args.after) as f:
+        after = json.load(f)
+    regressed = compare(before, after, args.threshold)
+    if regressed:
+        print(f"{len(regressed)} endpoint(s) regressed")
+    sys.exit(1 if regressed else 0)
@@ -0,0 +1,211 @@
+"""
+Seeded synthetic data for the benchmarks: users of every role, master
+products, and orders with items, in whatever volumes and proportions are
+asked for. The same seed and volumes always produce the same rows, so runs on
+different commits measure the same database.
+
+Drops and recreates every table first (never point this at production):
+
+    python benchmarks/datagen.py --url sqlite:///bench.db --products 20000 --orders 50000 --items-per-order 3
+    python benchmarks/datagen.py --url postgresql://localhost/hector_bench --sourcers 50 --purchasers 200
+
+Dates are spread over the `--days` before midnight UTC of the current day.
+"""
+import argparse
+import os
+import random
+import sys
+from dataclasses import asdict, dataclass
+from datetime import datetime, time, timedelta, timezone
+from decimal import Decimal
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, insert, text
+
+from app.core import security
+from app.db import models
+from app.services import report_service
+
+EMAIL_DOMAIN = "bench.example.com"
+PASSWORD = "bench-password"
+BATCH_SIZE = 5000
+
+WORDS = (
+    "wireless controller console handheld cable charger dock stand case grip "
+    "edition limited classic mini pro slim portable adapter memory card"
+).split()
+CATEGORIES = ["Nintendo", "Sony", "Microsoft", "Sega", "Atari"]
+# Relative share of orders in each status; statuses not listed get 2
+STATUS_WEIGHTS = {
+    models.SourcingItemStatus.Pending: 15,
+    models.SourcingItemStatus.Assigned: 20,
+    models.SourcingItemStatus.Offer: 5,
+    models.SourcingItemStatus.Purchased: 30,
+    models.SourcingItemStatus.Disapproved: 5,
+}
+
+
+@dataclass
+class Volumes:
+    sourcers: int = 20
+    purchasers: int = 20
+    managers: int = 3
+    admins: int = 1
+    products: int = 2000
+    orders: int = 5000
+    items_per_order: float = 2.0     # mean; each order gets 1 to 2 * mean - 1 items
+    days: int = 180
+
+
+def email(role: models.UserRole, n: int) -> str:
+    return f"{role.value}{n}@{EMAIL_DOMAIN}"
+
+
+def _insert(conn, model, rows) -> list[int]:
+    """Multi-row INSERT ... RETURNING id in batches; ids come back in row order."""
+    ids = []
+    table = model.__table__
+    for offset in range(0, len(rows), BATCH_SIZE):
+        result = conn.execute(
+            insert(table).returning(table.c.id, sort_by_parameter_order=True), rows[offset:offset + BATCH_SIZE]
+        )
+        ids.extend(result.scalars())
+    return ids
+
+
+def _money(rng: random.Random, low: float, high: float) -> Decimal:
+    return Decimal(rng.uniform(low, high)).quantize(Decimal("0.01"))
+
+
+def _users(conn, volumes: Volumes) -> dict:
+    hashed_password = security.get_password_hash(PASSWORD)
+    counts = {
+        models.UserRole.admin: volumes.admins,
+        models.UserRole.manager: volumes.managers,
+        models.UserRole.sourcer: volumes.sourcers,
+        models.UserRole.purchaser: volumes.purchasers,
+    }
+    rows = [
+        {
+            "email": email(role, n), "first_name": role.value.title(), "last_name": str(n),
+            "hashed_password": hashed_password, "role": role, "is_active": True,
+        }
+        for role, count in counts.items() for n in range(count)
+    ]
+    ids = iter(_insert(conn, models.User, rows))
+    return {role: [next(ids) for _ in range(count)] for role, count in counts.items()}
+
+
+def _products(conn, rng: random.Random, volumes: Volumes) -> list[dict]:
+    rows = [
+        {
+            "sku": f"SKU-{n:07d}",
+            "product_name": " ".join(rng.sample(WORDS, 4)).title(),
+            "category": rng.choice(CATEGORIES),
+            "product_type": rng.choice(list(models.ProductType)),
+            "target_cost_per_unit": _money(rng, 5, 500),
+        }
+        for n in range(volumes.products)
+    ]
+    for row, product_id in zip(rows, _insert(conn, models.MasterProduct, rows)):
+        row["id"] = product_id
+    return rows
+
+
+def _orders(conn, rng: random.Random, volumes: Volumes, users: dict, products: list[dict]) -> list[int]:
+    end = datetime.combine(datetime.now(timezone.utc).date(), time(), tzinfo=timezone.utc)
+    statuses = list(models.SourcingItemStatus)
+    weights = [STATUS_WEIGHTS.get(s, 2) for s in statuses]
+    # Oldest first, so ids follow creation time as they do in production
+    offsets = sorted((rng.uniform(0, volumes.days * 86400) for _ in range(volumes.orders)), reverse=True)
+
+    orders = []
+    for offset in offsets:
+        created_at = end - timedelta(seconds=offset)
+        status = rng.choices(statuses, weights)[0]
+        row = {
+            "sourcer_id": rng.choice(users[models.UserRole.sourcer]),
+            "purchaser_id": None, "status": status,
+            "seller_name": f"seller-{rng.randrange(1000)}",
+            "market": rng.choice(list(models.Market)),
+            "sellers_price": _money(rng, 5, 300),
+            "shipping_price": _money(rng, 0, 25),
+            "tax": _money(rng, 0, 20),
+            "created_at": created_at,
+            "assigned_at": None, "purchaser_action_time": None, "finalized_at": None,
+            "tracking_status": None, "destination_warehouse": None,
+        }
+        if status != models.SourcingItemStatus.Pending:
+            row["purchaser_id"] = rng.choice(users[models.UserRole.purchaser])
+            row["assigned_at"] = min(created_at + timedelta(seconds=rng.expovariate(1 / 14400)), end)
+            row["purchaser_action_time"] = min(row["assigned_at"] + timedelta(seconds=rng.expovariate(1 / 86400)), end)
+        if status in report_service.CLOSED_STATUSES:
+            row["finalized_at"] = row["purchaser_action_time"]
+            row["tracking_status"] = rng.choice(list(models.TrackingStatus))
+            row["destination_warehouse"] = rng.choice(list(models.DestinationWarehouse))
+        orders.append(row)
+    order_ids = _insert(conn, models.SourcingID, orders)
+
+    most_items = max(1, round(2 * volumes.items_per_order - 1))
+    items = []
+    for order_id in order_ids:
+        for _ in range(rng.randint(1, most_items)):
+            product = rng.choice(products)
+            quantity = rng.randint(1, 4)
+            items.append({
+                "sourcing_id": order_id, "product_id": product["id"],
+                "sku": product["sku"], "product_name": product["product_name"],
+                "category": product["category"], "product_type": product["product_type"],
+                "quantity_needed": quantity,
+                "target_cost_per_unit": product["target_cost_per_unit"],
+                "item_target_total": product["target_cost_per_unit"] * quantity,
+                "sourced_price": 0, "shipping_charges": 0, "tax": 0,
+            })
+    _insert(conn, models.SourcingItem, items)
+    return order_ids
+
+
+def generate(engine, volumes: Volumes, seed: int = 0) -> dict:
+    """
+    Recreates the schema and fills it. Returns the user ids per role; users
+    log in as email(role, n) with PASSWORD.
+    """
+    rng = random.Random(seed)
+    models.Base.metadata.drop_all(engine)
+    models.Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        users = _users(conn, volumes)
+        products = _products(conn, rng, volumes)
+        order_ids = _orders(conn, rng, volumes, users, products)
+        # Multi-row INSERTs skip the flush hooks, so fill in what they maintain
+        for offset in range(0, len(order_ids), BATCH_SIZE):
+            models.recompute_sourcing_totals(conn, order_ids[offset:offset + BATCH_SIZE])
+        report_service.rebuild_rollups(conn, None)
+        report_service.rebuild_series(conn, None)
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            conn.execution_options(isolation_level="AUTOCOMMIT").execute(text("ANALYZE"))
+    return users
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    """Adds one option per Volumes field, plus --seed."""
+    for name, default in asdict(Volumes()).items():
+        parser.add_argument("--" + name.replace("_", "-"), type=type(default), default=default)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def volumes_from(args) -> Volumes:
+    return Volumes(**{name: getattr(args, name) for name in asdict(Volumes())})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", required=True, help="scratch database URL")
+    add_arguments(parser)
+    args = parser.parse_args()
+    volumes = volumes_from(args)
+    users = generate(create_engine(args.url), volumes, args.seed)
+    print(f"seeded {sum(map(len, users.values()))} users, {volumes.products} products, {volumes.orders} orders")
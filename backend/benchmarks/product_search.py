@@ -0,0 +1,113 @@
+"""
+Latency of the product picker's search at growing catalogue sizes: the
+substring (ILIKE) filter with and without the trigram indexes, and the ranked
+fuzzy search.
+
+Seeds a scratch database (never point this at production) with synthetic
+products up to each size, then times a fixed set of search terms:
+
+    python benchmarks/product_search.py --url postgresql://localhost/hector_bench
+    python benchmarks/product_search.py --url sqlite:///bench.db --rows 10000 100000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, event, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.trigram import register_sqlite_functions
+from app.services import product_service
+
+WORDS = (
+    "wireless controller console handheld cable charger dock stand case grip "
+    "edition limited classic mini pro slim portable adapter memory card"
+).split()
+TERMS = ["controller", "contoller", "slim console", "SKU-0042", "charg", "portabel dock"]
+TRIGRAM_INDEXES = [f"ix_master_products_{c}_trgm" for c in ("sku", "product_name", "category")]
+
+
+def seed(engine, rows: int):
+    with engine.begin() as conn:
+        have = conn.scalar(select(func.count()).select_from(models.MasterProduct))
+        rng = random.Random(have)
+        batch = []
+        for i in range(have, rows):
+            batch.append({
+                "sku": f"SKU-{i:07d}",
+                "product_name": " ".join(rng.sample(WORDS, 4)).title(),
+                "category": rng.choice(["Nintendo", "Sony", "Microsoft", "Sega", "Atari"]),
+                "target_cost_per_unit": rng.randint(5, 500),
+            })
+            if len(batch) == 10000:
+                conn.execute(insert(models.MasterProduct), batch)
+                batch = []
+        if batch:
+            conn.execute(insert(models.MasterProduct), batch)
+        if engine.dialect.name == "postgresql":
+            conn.execute(text("ANALYZE master_products"))
+
+
+def set_trigram_indexes(engine, present: bool):
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for index in models.MasterProduct.__table__.indexes:
+            if index.name in TRIGRAM_INDEXES:
+                if present:
+                    index.create(conn, checkfirst=True)
+                else:
+                    conn.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def timed(engine, build, repeats: int):
+    latencies = []
+    with Session(engine) as db:
+        for _ in range(repeats):
+            for term in TERMS:
+                started = time.perf_counter()
+                build(db.query(models.MasterProduct), term).limit(50).all()
+                latencies.append(time.perf_counter() - started)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.95) - 1] * 1000
+
+
+def main(url: str, sizes: list[int], repeats: int):
+    engine = create_engine(url)
+    dialect = engine.dialect.name
+    if dialect == "sqlite":
+        event.listen(engine, "connect", register_sqlite_functions)
+    models.Base.metadata.create_all(engine, tables=[models.MasterProduct.__table__])
+
+    contains = lambda query, term: query.filter(product_service.contains_filter(term)).order_by(models.MasterProduct.id)
+    fuzzy = lambda query, term: product_service.fuzzy_search(query, term, dialect)
+
+    print(f"{dialect}, {len(TERMS)} terms x {repeats}, LIMIT 50")
+    for rows in sorted(sizes):
+        seed(engine, rows)
+        cases = [("ilike, no index", False, contains)]
+        if dialect == "postgresql":
+            cases += [("ilike, trigram", True, contains), ("fuzzy, trigram", True, fuzzy)]
+        else:
+            cases += [("fuzzy, python", False, fuzzy)]
+        for name, indexed, build in cases:
+            set_trigram_indexes(engine, indexed)
+            p50, p95 = timed(engine, build, repeats)
+            print(f"{rows:>9} rows  {name:<16} p50 {p50:8.2f} ms  p95 {p95:8.2f} ms")
+    set_trigram_indexes(engine, True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--url", required=True, help="scratch database URL")
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+    main(args.url, args.rows, args.repeats)
@@ -0,0 +1,96 @@
+"""
+Cost of serialising a large order list through FastAPI's response_model path
+(validate, dump to Python objects, json.dumps) versus api.responses.model_response
+(validate once, encode straight to bytes with pydantic-core).
+
+Times only the response-building step, on in-memory ORM objects, so no
+database is needed:
+
+    python benchmarks/serialization.py --orders 1000 --items 5
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import List
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app import schemas
+from app.api.responses import model_response
+from app.db import models
+
+
+def build_orders(count: int, items: int) -> list:
+    now = datetime.now(timezone.utc)
+    orders = []
+    for n in range(count):
+        order = models.SourcingID(
+            id=n + 1, status=models.SourcingItemStatus.Pending, sourcer_id=1, created_at=now,
+            market=models.Market.eBay, sellers_price=Decimal("12.50"), shipping_price=Decimal("3.10"),
+            tax=Decimal("1.00"), target_total=Decimal("40.00"), sourced_price=Decimal("16.60"),
+            savings=Decimal("23.40"), is_manual_override=False,
+        )
+        order.items = [
+            models.SourcingItem(
+                id=n * items + i + 1, sourcing_id=n + 1, product_name=f"Product {i}", sku=f"SKU-{i:05d}",
+                quantity_needed=1, sourced_price=Decimal("4.00"), shipping_charges=Decimal("0"), tax=Decimal("0"),
+                product_type=models.ProductType.Game, category="Games", target_cost_per_unit=Decimal("8.00"),
+                sku_efficiency=Decimal("4.00"), tested=False, product_condition=models.ProductCondition.Excellent,
+            )
+            for i in range(items)
+        ]
+        orders.append(order)
+    return orders
+
+
+async def via_response_model(field, orders):
+    # What FastAPI does for `response_model=` (fastapi.routing.get_request_handler)
+    content = await serialize_response(field=field, response_content=orders, is_coroutine=True)
+    return JSONResponse(content)
+
+
+async def via_model_response(orders):
+    return model_response(List[schemas.SourcingID], orders)
+
+
+async def run(render, repeats: int):
+    body = (await render()).body  # warm up
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await render()
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return len(body), statistics.median(timings) * 1000, timings[int(len(timings) * 0.95) - 1] * 1000
+
+
+async def main(orders: int, items: int, repeats: int):
+    payload = build_orders(orders, items)
+    field = create_response_field(name="response", type_=List[schemas.SourcingID])
+    print(f"{orders} orders x {items} items, {repeats} runs each")
+    cases = (
+        ("response_model", lambda: via_response_model(field, payload)),
+        ("model_response", lambda: via_model_response(payload)),
+    )
+    for name, render in cases:
+        size, p50, p95 = await run(render, repeats)
+        print(f"{name:>15}: {size / 1024:8.0f} KiB  p50 {p50:8.2f} ms  p95 {p95:8.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--orders", type=int, default=1000)
+    parser.add_argument("--items", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=30)
+    args = parser.parse_args()
+    asyncio.run(main(args.orders, args.items, args.repeats))
@@ -0,0 +1,121 @@
+import argparse
+import sys
+import os
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.session import engine
+
+# Indexes added by migration c2f95e7a1d68; dropped inside a rolled-back
+# transaction to show the "before" plans.
+HOT_PATH_INDEXES = [
+    "ix_sourcing_items_sourcing_id",
+    "ix_sourcing_ids_purchaser_created",
+    "ix_sourcing_ids_purchaser_status_created",
+    "ix_sourcing_ids_purchaser_awaiting",
+    "ix_sourcing_ids_sourcer_created",
+    "ix_sourcing_ids_pending_created",
+    "ix_sourcing_ids_created_at",
+]
+
+
+def hot_queries(sourcer_id: int, purchaser_id: int, sourcing_id: int) -> dict:
+    """The statements behind the sourcing list and dashboard endpoints, keyed by endpoint."""
+    order = models.SourcingID
+    item = models.SourcingItem
+    newest_first = (order.created_at.desc(), order.id.desc())
+    day = datetime.combine(date.today(), time.min)
+    return {
+        "GET /sourcing/pending": (
+            select(order).where(order.status == models.SourcingItemStatus.Pending)
+            .order_by(order.created_at, order.id).limit(101)
+        ),
+        "GET /sourcing/assigned/me": (
+            select(order).where(order.purchaser_id == purchaser_id)
+            .order_by(order.created_at, order.id).limit(101)
+        ),
+        "GET /sourcing/assigned/me?status_filter=Purchased": (
+            select(order).where(order.purchaser_id == purchaser_id, order.status == models.SourcingItemStatus.Purchased)
+            .order_by(order.created_at, order.id).limit(101)
+        ),
+        "items of an order (selectinload, totals and rollup hooks)": (
+            select(item).where(item.sourcing_id.in_([sourcing_id]))
+        ),
+        "GET /reports/sourcer/me (counts)": (
+            select(func.count(order.id)).where(order.sourcer_id == sourcer_id)
+        ),
+        "GET /reports/sourcer/me (requests page)": (
+            select(order.id, order.status, order.created_at).where(order.sourcer_id == sourcer_id)
+            .order_by(*newest_first).limit(101)
+        ),
+        "GET /reports/purchaser/me (awaiting tracking)": (
+            select(func.count(order.id)).where(
+                order.purchaser_id == purchaser_id, order.tracking_status == models.TrackingStatus.Awaiting
+            )
+        ),
+        "GET /reports/purchaser/me (purchased)": (
+            select(func.count(order.id)).where(
+                order.purchaser_id == purchaser_id, order.status == models.SourcingItemStatus.Purchased
+            )
+        ),
+        "report rollup rebuild (one day of orders)": (
+            select(order.id).where(order.created_at >= day, order.created_at < day + timedelta(days=1))
+        ),
+    }
+
+
+def explain(connection, statement) -> list[str]:
+    compiled = statement.compile(dialect=connection.dialect, compile_kwargs={"literal_binds": True})
+    prefix = "EXPLAIN" if connection.dialect.name == "postgresql" else "EXPLAIN QUERY PLAN"
+    rows = connection.exec_driver_sql(f"{prefix} {compiled}")
+    return [" | ".join(str(v) for v in row) for row in rows]
+
+
+def print_plans(connection, queries: dict, label: str):
+    print(f"=== {label} ===")
+    for name, statement in queries.items():
+        print(f"\n-- {name}")
+        for line in explain(connection, statement):
+            print("   " + line)
+    print()
+
+
+def main(before: bool):
+    with Session(engine) as db:
+        sourcer_id = db.scalar(select(models.SourcingID.sourcer_id).where(models.SourcingID.sourcer_id.is_not(None)).limit(1)) or 0
+        purchaser_id = db.scalar(select(models.SourcingID.purchaser_id).where(models.SourcingID.purchaser_id.is_not(None)).limit(1)) or 0
+        sourcing_id = db.scalar(select(models.SourcingID.id).limit(1)) or 0
+    queries = hot_queries(sourcer_id, purchaser_id, sourcing_id)
+
+    with engine.connect() as connection:
+        if before:
+            # DDL is transactional on PostgreSQL and SQLite, so the drop is undone below
+            transaction = connection.begin()
+            if connection.dialect.name == "sqlite":
+                # pysqlite only opens a transaction implicitly before DML
+                connection.exec_driver_sql("BEGIN")
+            try:
+                for name in HOT_PATH_INDEXES:
+                    connection.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+                print_plans(connection, queries, "without the hot-path indexes")
+            finally:
+                transaction.rollback()
+        print_plans(connection, queries, "current schema")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Print EXPLAIN plans for the sourcing list and dashboard queries.")
+    parser.add_argument(
+        "--before", action="store_true",
+        help="also show the plans with the hot-path indexes dropped in a rolled-back transaction "
+             "(locks the tables while it runs; not for production)"
+    )
+    args = parser.parse_args()
+    main(args.before)
@@ -1,6 +1,9 @@
+import argparse
 import csv
 import sys
 import os
+import time
+from decimal import Decimal, InvalidOperation
 
 # This is a bit of a trick to make the script able to import from the parent 'app' directory
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -8,8 +11,13 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # This is a bit of a trick to make the script able to import from the parent 'app' directory
 # This is a bit of a trick to make the script able to import from the parent 'app' directory
 
-from app.db.session import SessionLocal
-from app.db.models import MasterProduct
+from sqlalchemy import bindparam, select, text
+
+from app.db.session import SessionLocal, engine
+from app.db.models import MasterProduct, ProductType
+from app.services import report_service
+
+PRODUCT_COLUMNS = ("sku", "product_name", "target_cost_per_unit", "category", "product_type")
 
 def import_products_from_csv(file_path: str):
     db = SessionLocal()
@@ -52,9 +60,169 @@ def import_products_from_csv(file_path: str):
     finally:
         db.close()
 
+def _clean_rows(reader, stats):
+    """Yields validated product dicts from the CSV, counting the rows it rejects."""
+    for line_no, row in enumerate(reader, start=2):
+        try:
+            sku = (row.get("sku") or "").strip()
+            product_name = (row.get("product_name") or "").strip()
+            if not sku or not product_name:
+                raise ValueError("sku and product_name are required")
+            yield {
+                "sku": sku,
+                "product_name": product_name,
+                "target_cost_per_unit": Decimal(row["target_cost_per_unit"]).quantize(Decimal("0.01")),
+                "category": row.get("category"),
+                "product_type": ProductType(row["product_type"]).value,
+            }
+        except (KeyError, ValueError, InvalidOperation) as e:
+            stats["rejected"] += 1
+            print(f"Rejected line {line_no}: {e!r}")
+
+
+def _upsert_with_copy(rows, stats):
+    """
+    PostgreSQL path: streams rows into a temp staging table with COPY, then merges
+    them into master_products in one INSERT ... ON CONFLICT (sku) DO UPDATE.
+    When a SKU repeats in the file the last row wins. The report rollups of
+    closed orders using a repriced SKU are moved in the same transaction.
+    """
+    enum_name = MasterProduct.__table__.c.product_type.type.name
+    with engine.begin() as conn:
+        with conn.connection.driver_connection.cursor() as cur:
+            cur.execute(
+                "CREATE TEMP TABLE master_products_staging ("
+                " seq bigint, sku text, product_name text, target_cost_per_unit numeric(10, 2),"
+                " category text, product_type text"
+                ") ON COMMIT DROP"
+            )
+            with cur.copy(
+                "COPY master_products_staging (seq, sku, product_name, target_cost_per_unit, category, product_type)"
+                " FROM STDIN"
+            ) as copy:
+                for seq, row in enumerate(rows):
+                    copy.write_row((seq, *(row[c] for c in PRODUCT_COLUMNS)))
+            repriced = conn.execute(text(
+                "SELECT DISTINCT s.sku FROM master_products_staging s LEFT JOIN master_products p ON p.sku = s.sku"
+                " WHERE p.target_cost_per_unit IS DISTINCT FROM s.target_cost_per_unit"
+            )).scalars().all()
+            order_ids = report_service.orders_priced_by(conn, repriced)
+            before = report_service.contributions(report_service.load_report_orders(conn, order_ids))
+            cur.execute(
+                f"""
+                WITH upserted AS (
+                    INSERT INTO master_products (sku, product_name, target_cost_per_unit, category, product_type)
+                    SELECT DISTINCT ON (sku)
+                        sku, product_name, target_cost_per_unit, category, product_type::{enum_name}
+                    FROM master_products_staging
+                    ORDER BY sku, seq DESC
+                    ON CONFLICT (sku) DO UPDATE SET
+                        product_name = EXCLUDED.product_name,
+                        target_cost_per_unit = EXCLUDED.target_cost_per_unit,
+                        category = EXCLUDED.category,
+                        product_type = EXCLUDED.product_type,
+                        version = master_products.version + 1
+                    RETURNING (xmax = 0) AS inserted
+                )
+                SELECT count(*) FILTER (WHERE inserted), count(*) FILTER (WHERE NOT inserted) FROM upserted
+                """
+            )
+            inserted, updated = cur.fetchone()
+        report_service.update_reports(conn, order_ids, before)
+    stats["inserted"] += inserted
+    stats["updated"] += updated
+
+
+def _upsert_with_executemany(rows, stats, batch_size):
+    """
+    Portable path (SQLite and friends): per batch, looks up which SKUs already
+    exist, then issues one executemany INSERT and one executemany UPDATE.
+    """
+    table = MasterProduct.__table__
+    update_stmt = (
+        table.update()
+        .where(table.c.sku == bindparam("_sku"))
+        .values({
+            **{c: bindparam(c) for c in PRODUCT_COLUMNS if c != "sku"},
+            "version": table.c.version + 1,
+        })
+    )
+    db = SessionLocal()
+    try:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) < batch_size:
+                continue
+            _flush_batch(db, table, update_stmt, batch, stats)
+            batch = []
+        if batch:
+            _flush_batch(db, table, update_stmt, batch, stats)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _flush_batch(db, table, update_stmt, batch, stats):
+    by_sku = {row["sku"]: row for row in batch}
+    existing = dict(db.execute(
+        select(table.c.sku, table.c.target_cost_per_unit).where(table.c.sku.in_(list(by_sku)))
+    ).all())
+    to_insert = [row for sku, row in by_sku.items() if sku not in existing]
+    to_update = [{**row, "_sku": sku} for sku, row in by_sku.items() if sku in existing]
+    # Closed orders using a newly priced or repriced SKU move in the report rollups
+    repriced = [sku for sku, row in by_sku.items() if row["target_cost_per_unit"] != existing.get(sku)]
+    order_ids = report_service.orders_priced_by(db.connection(), repriced)
+    before = report_service.contributions(report_service.load_report_orders(db.connection(), order_ids))
+    if to_insert:
+        db.execute(table.insert(), to_insert)
+    if to_update:
+        db.execute(update_stmt, to_update)
+    report_service.update_reports(db.connection(), order_ids, before)
+    db.commit()
+    stats["inserted"] += len(to_insert)
+    stats["updated"] += len(to_update)
+    print(f"Upserted batch of {len(by_sku)}. Inserted: {stats['inserted']}, updated: {stats['updated']}")
+
+
+def bulk_upsert_products_from_csv(file_path: str, batch_size: int = 5000):
+    """
+    Insert-or-update every product in the CSV keyed on sku, so re-running an
+    import is safe. Uses COPY on PostgreSQL and executemany batches elsewhere.
+    """
+    stats = {"inserted": 0, "updated": 0, "rejected": 0}
+    started = time.perf_counter()
+    try:
+        with open(file_path, mode='r', encoding='utf-8', newline='') as csvfile:
+            rows = _clean_rows(csv.DictReader(csvfile), stats)
+            if engine.dialect.name == "postgresql":
+                _upsert_with_copy(rows, stats)
+            else:
+                _upsert_with_executemany(rows, stats, batch_size)
+    except FileNotFoundError:
+        print(f"Error: The file '{file_path}' was not found.")
+        return None
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return None
+
+    elapsed = time.perf_counter() - started
+    print(
+        f"\nBulk import finished in {elapsed:.2f}s ({engine.dialect.name}). "
+        f"Inserted: {stats['inserted']}, updated: {stats['updated']}, rejected: {stats['rejected']}"
+    )
+    return stats
+
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python import_products.py <path_to_csv_file>")
+    parser = argparse.ArgumentParser(description="Import master products from a CSV file.")
+    parser.add_argument("csv_file_path", help="path to a CSV with sku, product_name, target_cost_per_unit, category, product_type")
+    parser.add_argument("--bulk", action="store_true", help="upsert on sku using COPY (PostgreSQL) or executemany batches")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per batch for the executemany path")
+    args = parser.parse_args()
+
+    if args.bulk:
+        bulk_upsert_products_from_csv(args.csv_file_path, batch_size=args.batch_size)
     else:
-        csv_file_path = sys.argv[1]
-        import_products_from_csv(csv_file_path)
\ No newline at end of file
+        import_products_from_csv(args.csv_file_path)
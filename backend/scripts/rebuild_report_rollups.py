@@ -0,0 +1,39 @@
+import argparse
+import sys
+import os
+from datetime import date, timedelta
+
+# This is a bit of a trick to make the script able to import from the parent 'app' directory
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.db.session import SessionLocal
+from app.services.report_service import rebuild_rollups, rebuild_series
+
+
+def rebuild(start: date | None = None, end: date | None = None):
+    """Rebuilds report_daily_rollups and report_daily_series for a day range, or for all history when no range is given."""
+    days = None
+    if start or end:
+        start = start or end
+        end = end or start
+        days = {start + timedelta(days=n) for n in range((end - start).days + 1)}
+
+    db = SessionLocal()
+    try:
+        rebuild_rollups(db.connection(), days)
+        rebuild_series(db.connection(), days)
+        db.commit()
+        print("Rebuilt rollups for " + (f"{start} .. {end}" if days else "all days"))
+    except Exception as e:
+        db.rollback()
+        print(f"An error occurred: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backfill the daily reporting rollups and time series.")
+    parser.add_argument("--from", dest="start", type=date.fromisoformat, help="first day to rebuild (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=date.fromisoformat, help="last day to rebuild (YYYY-MM-DD)")
+    args = parser.parse_args()
+    rebuild(args.start, args.end)
@@ -0,0 +1,115 @@
+"""
+Runs the app in-process against a throwaway SQLite database. Settings are read
+when app.core.config is first imported, so the environment is set up here,
+before any test module imports the app.
+"""
+import os
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+_scratch = tempfile.mkdtemp(prefix="hector-tests-")
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_scratch}/test.db",
+    "ASYNC_DATABASE_URL": f"sqlite+aiosqlite:///{_scratch}/test.db",
+    "SECRET_KEY": "test-secret",
+    "ALGORITHM": "HS256",
+    "ACCESS_TOKEN_EXPIRE_MINUTES": "60",
+    "REPORT_JOB_DIR": os.path.join(_scratch, "report_jobs"),
+})
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.api import deps
+from app.core.security import create_access_token
+from app.db import models
+from app.db.session import SessionLocal, engine
+from app.main import app
+from app.services import product_service, report_service
+
+models.Base.metadata.create_all(engine)
+
+
+@pytest.fixture(autouse=True)
+def clean_database():
+    """Empties every table and the in-process caches before each test."""
+    with engine.begin() as conn:
+        for table in reversed(models.Base.metadata.sorted_tables):
+            conn.execute(table.delete())
+    for cache in (deps.user_cache, deps._subject_cache, product_service.product_cache, report_service.purchaser_stats_cache):
+        cache.clear()
+
+
+@pytest.fixture
+def db():
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client():
+    return TestClient(app)
+
+
+@pytest.fixture
+def users(db):
+    """One user per role, keyed by role name."""
+    created = {}
+    for role in models.UserRole:
+        user = models.User(
+            email=f"{role.value}@example.com", first_name=role.value.title(), last_name="Test",
+            hashed_password="!", role=role, is_active=True,
+        )
+        db.add(user)
+        created[role.value] = user
+    db.commit()
+    return created
+
+
+@pytest.fixture
+def auth(users):
+    """Authorization headers per role name."""
+    return {
+        role: {"Authorization": f"Bearer {create_access_token({'sub': user.email})}"}
+        for role, user in users.items()
+    }
+
+
+@pytest.fixture
+def products(db):
+    rows = [
+        models.MasterProduct(
+            sku=f"SKU-{n}", product_name=f"Product {n}", category=category,
+            product_type=models.ProductType.Console, target_cost_per_unit=target,
+        )
+        for n, (category, target) in enumerate([("Sony", 40), ("Nintendo", 25), ("Sega", None)])
+    ]
+    db.add_all(rows)
+    db.commit()
+    return rows
+
+
+
+@pytest.fixture
+def order(db, users, products):
+    """An order by the sourcer, assigned to the purchaser, with one item per product."""
+    placed = models.SourcingID(
+        sourcer_id=users["sourcer"].id, purchaser_id=users["purchaser"].id,
+        status=models.SourcingItemStatus.Assigned, market=models.Market.eBay,
+        sellers_price=50, shipping_price=5, tax=2,
+        # Assigned 105 minutes in, clear of the duration bucket bounds, which
+        # SQLite's julianday arithmetic can miss by a few microseconds
+        created_at=datetime.now(timezone.utc) - timedelta(hours=3),
+        assigned_at=datetime.now(timezone.utc) - timedelta(minutes=75),
+        items=[
+            models.SourcingItem(
+                product_id=product.id, sku=product.sku, product_name=product.product_name,
+                category=product.category, product_type=product.product_type,
+                quantity_needed=n + 1, target_cost_per_unit=product.target_cost_per_unit,
+            )
+            for n, product in enumerate(products)
+        ],
+    )
+    db.add(placed)
+    db.commit()
+    return placed
@@ -0,0 +1,147 @@
+"""
+Concurrent claims: many threads, each acting as a different purchaser, claim
+the same pending orders through sourcing_service.claim (what claim-next and
+/{id}/assign run), and every order must be claimed exactly once.
+
+SQLite serialises writers, so there only the status and version check is
+exercised. Set TEST_POSTGRESQL_URL to a scratch database to also run them
+against row locks and SKIP LOCKED:
+
+    TEST_POSTGRESQL_URL=postgresql://localhost/hector_test python -m pytest tests/test_claims.py
+"""
+import os
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import create_engine, delete, select
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.session import engine as sqlite_engine
+from app.services import sourcing_service
+
+THREADS = 8
+ORDERS = 40
+MARKER = "claims-test"
+
+
+@pytest.fixture(params=["sqlite", "postgresql"])
+def engine(request):
+    if request.param == "sqlite":
+        yield sqlite_engine
+        return
+    url = os.environ.get("TEST_POSTGRESQL_URL")
+    if not url:
+        pytest.skip("TEST_POSTGRESQL_URL is not set")
+    engine = create_engine(url, pool_size=THREADS + 1)
+    models.Base.metadata.create_all(engine)
+    _clear(engine)
+    yield engine
+    _clear(engine)
+    engine.dispose()
+
+
+def _clear(engine):
+    with engine.begin() as conn:
+        conn.execute(delete(models.SourcingID).where(models.SourcingID.seller_name == MARKER))
+        conn.execute(delete(models.User).where(models.User.email.like(f"{MARKER}-%")))
+
+
+@pytest.fixture
+def seeded(engine):
+    """A sourcer's ORDERS pending orders and THREADS purchasers; returns (order ids, purchaser ids)."""
+    with Session(engine) as db:
+        users = [
+            models.User(
+                email=f"{MARKER}-{n}@example.com", first_name="Claims", last_name=str(n), hashed_password="!",
+                role=models.UserRole.sourcer if n == 0 else models.UserRole.purchaser, is_active=True,
+            )
+            for n in range(THREADS + 1)
+        ]
+        db.add_all(users)
+        db.flush()
+        orders = [
+            models.SourcingID(
+                sourcer_id=users[0].id, seller_name=MARKER, status=models.SourcingItemStatus.Pending,
+                created_at=datetime.now(timezone.utc),
+            )
+            for _ in range(ORDERS)
+        ]
+        db.add_all(orders)
+        db.commit()
+        return [o.id for o in orders], [u.id for u in users[1:]]
+
+
+def run_threads(target, purchaser_ids):
+    """Runs target(purchaser_id) on one thread per purchaser, started together; re-raises the first error."""
+    barrier = threading.Barrier(len(purchaser_ids))
+    errors = []
+
+    def work(purchaser_id):
+        try:
+            barrier.wait()
+            target(purchaser_id)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=work, args=(p,)) for p in purchaser_ids]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    if errors:
+        raise errors[0]
+
+
+def owners(engine, order_ids):
+    with engine.connect() as conn:
+        return dict(conn.execute(
+            select(models.SourcingID.id, models.SourcingID.purchaser_id).where(models.SourcingID.id.in_(order_ids))
+        ).all())
+
+
+def test_claim_next_claims_each_order_once(engine, seeded):
+    order_ids, purchaser_ids = seeded
+    claimed = []
+
+    def claim_until_empty(purchaser_id):
+        with Session(engine) as db:
+            while True:
+                row = sourcing_service.claim(
+                    db.connection(), sourcing_service.next_pending_order(), purchaser_id, datetime.now(timezone.utc)
+                )
+                if row is None:
+                    db.rollback()
+                    return
+                db.commit()
+                claimed.append((row.id, purchaser_id))
+
+    run_threads(claim_until_empty, purchaser_ids)
+
+    counts = Counter(order_id for order_id, _ in claimed)
+    assert set(order_ids) <= set(counts)
+    assert all(n == 1 for n in counts.values())
+    stored = owners(engine, order_ids)
+    assert all(stored[order_id] == purchaser_id for order_id, purchaser_id in claimed if order_id in stored)
+
+
+def test_assigning_one_order_has_one_winner(engine, seeded):
+    order_ids, purchaser_ids = seeded
+    winners = {order_id: [] for order_id in order_ids[:5]}
+
+    def assign_each(purchaser_id):
+        with Session(engine) as db:
+            for order_id in winners:
+                row = sourcing_service.claim(db.connection(), order_id, purchaser_id, datetime.now(timezone.utc))
+                db.commit()
+                if row is not None:
+                    winners[order_id].append(purchaser_id)
+
+    run_threads(assign_each, purchaser_ids)
+
+    stored = owners(engine, list(winners))
+    for order_id, won in winners.items():
+        assert len(won) == 1
+        assert stored[order_id] == won[0]
@@ -0,0 +1,104 @@
+"""
+Every endpoint that loads orders or items through the named loader options in
+app.db.loaders, on seeded data. The options end in raiseload("*"), so an
+endpoint touching a relationship its option set does not load raises instead
+of returning, and the test client re-raises it here.
+"""
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import InvalidRequestError
+
+from app.db import loaders, models
+
+API = "/api/v1/sourcing"
+
+
+def item_payload(product, quantity=1):
+    return {
+        "product_name": product.product_name, "sku": product.sku, "quantity_needed": quantity,
+        "product_type": product.product_type.value, "category": product.category,
+    }
+
+
+@pytest.fixture
+def pending(db, users, products):
+    placed = models.SourcingID(
+        sourcer_id=users["sourcer"].id, status=models.SourcingItemStatus.Pending, market=models.Market.Etsy,
+        items=[models.SourcingItem(
+            product_id=products[0].id, sku=products[0].sku, product_name=products[0].product_name,
+            category=products[0].category, product_type=products[0].product_type,
+        )],
+    )
+    db.add(placed)
+    db.commit()
+    return placed
+
+
+def test_loaders_raise_on_relationships_they_do_not_load(db, order):
+    item = db.scalar(
+        select(models.SourcingItem).options(*loaders.ITEM_WITH_ORDER_OWNERS).where(models.SourcingItem.sourcing_id == order.id).limit(1)
+    )
+    with pytest.raises(InvalidRequestError):
+        item.sourcing_order.items
+
+
+def test_order_with_items_endpoints(client, auth, order, pending, products):
+    # ORDER_WITH_ITEMS, through _load_order and _order_page
+    created = client.post(f"{API}/", json={"market": "eBay", "items": [item_payload(products[1], 2)]}, headers=auth["sourcer"])
+    assert created.status_code == 200
+    assert [i["sku"] for i in created.json()["items"]] == [products[1].sku]
+
+    detail = client.get(f"{API}/{order.id}", headers=auth["purchaser"])
+    assert detail.status_code == 200
+    assert len(detail.json()["items"]) == len(products)
+
+    listed = client.get(f"{API}/pending", headers=auth["purchaser"])
+    assert listed.status_code == 200
+    assert {o["id"] for o in listed.json()} >= {pending.id}
+    assigned = client.get(f"{API}/assigned/me", headers=auth["purchaser"])
+    assert assigned.status_code == 200
+    assert [o["id"] for o in assigned.json()] == [order.id]
+
+    updated = client.put(f"{API}/{order.id}", json={"status": "Purchased"}, headers=auth["purchaser"])
+    assert updated.status_code == 200
+    assert updated.json()["status"] == "Purchased"
+
+    batch = client.patch(
+        f"{API}/{order.id}/items",
+        json={"add": [item_payload(products[0])], "update": [{"id": detail.json()["items"][0]["id"], "tested": True}]},
+        headers=auth["purchaser"],
+    )
+    assert batch.status_code == 200
+    assert len(batch.json()["items"]) == len(products) + 1
+
+
+def test_claim_endpoints(client, auth, pending, db, users, products):
+    claimed = client.post(f"{API}/claim-next", headers=auth["purchaser"])
+    assert claimed.status_code == 200
+    assert claimed.json()["id"] == pending.id
+    assert claimed.json()["items"]
+
+    another = models.SourcingID(sourcer_id=users["sourcer"].id, status=models.SourcingItemStatus.Pending)
+    db.add(another)
+    db.commit()
+    assigned = client.post(f"{API}/{another.id}/assign", headers=auth["purchaser"])
+    assert assigned.status_code == 200
+    assert assigned.json()["purchaser_id"] == users["purchaser"].id
+
+
+def test_item_endpoints(client, auth, order, products):
+    item_ids = [i["id"] for i in client.get(f"{API}/{order.id}", headers=auth["purchaser"]).json()["items"]]
+
+    # ITEM_WITH_ORDER
+    patched = client.patch(f"{API}/items/{item_ids[0]}", json={"sku": products[1].sku, "sourced_price": 12}, headers=auth["purchaser"])
+    assert patched.status_code == 200
+    assert patched.json()["sku"] == products[1].sku
+
+    # ORDER_KEY_ONLY
+    added = client.post(f"{API}/{order.id}/items", json=item_payload(products[2], 3), headers=auth["sourcer"])
+    assert added.status_code == 200
+    assert added.json()["sourcing_id"] == order.id
+
+    # ITEM_WITH_ORDER_OWNERS
+    deleted = client.delete(f"{API}/items/{item_ids[1]}", headers=auth["sourcer"])
+    assert deleted.status_code == 204
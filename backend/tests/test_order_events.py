@@ -0,0 +1,74 @@
+"""
+The order event feed: events are collected on flush and published only once
+the transaction commits, so subscribers never hear about a change they could
+not read yet, or one that was rolled back.
+"""
+import asyncio
+
+from app.api import deps
+from app.api.endpoints import sourcing
+from app.db import models
+from app.db.session import AsyncSessionLocal
+from app.services import event_service
+
+
+def _run(scenario):
+    return asyncio.run(asyncio.wait_for(scenario(), 5))
+
+
+def test_stream_sends_the_event_after_commit(order, users):
+    purchaser = deps.CachedUser.from_user(users["purchaser"])
+
+    async def scenario():
+        stream = sourcing._order_event_stream(purchaser, order.id, None)
+        first = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)   # let the stream subscribe
+        try:
+            async with AsyncSessionLocal() as db:
+                loaded = await db.get(models.SourcingID, order.id)
+                loaded.status = models.SourcingItemStatus.Purchased
+                await db.flush()
+                await asyncio.sleep(0.05)
+                assert not first.done(), "event sent before the commit"
+                await db.commit()
+            return await first
+        finally:
+            first.cancel()
+            await stream.aclose()
+
+    message = _run(scenario)
+    assert "event: order.status_changed\n" in message
+    assert f'"sourcing_id":{order.id}' in message
+    assert '"status":"Purchased"' in message
+
+
+def test_rolled_back_transaction_sends_nothing(order):
+    async def scenario():
+        queue, _ = event_service.broadcaster.subscribe()
+        try:
+            async with AsyncSessionLocal() as db:
+                loaded = await db.get(models.SourcingID, order.id)
+                loaded.status = models.SourcingItemStatus.Disapproved
+                await db.flush()
+                await db.rollback()
+            await asyncio.sleep(0.05)
+            assert queue.empty()
+
+            # A later commit in the same session publishes only its own change
+            async with AsyncSessionLocal() as db:
+                loaded = await db.get(models.SourcingID, order.id)
+                loaded.seller_name = "renamed"
+                await db.flush()
+                await db.rollback()
+                loaded = await db.get(models.SourcingID, order.id)
+                loaded.market = models.Market.Etsy
+                await db.commit()
+            event = await queue.get()
+            assert queue.empty()
+            return event
+        finally:
+            event_service.broadcaster.unsubscribe(queue)
+
+    event = _run(scenario)
+    assert event.type == event_service.UPDATED
+    assert event.data["sourcing_id"] == order.id
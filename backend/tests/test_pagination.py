@@ -0,0 +1,37 @@
+"""Page-size bounds and X-Next-Cursor paging on the keyset-paginated list endpoints."""
+import pytest
+from fastapi import Response
+
+from app.api.pagination import MAX_PAGE_SIZE, NEXT_CURSOR_HEADER, finish_page
+from app.db import models
+
+API = "/api/v1"
+
+
+@pytest.mark.parametrize("path", ["/products/", "/users/"])
+@pytest.mark.parametrize("limit", [0, -1, MAX_PAGE_SIZE + 1])
+def test_limit_out_of_range_is_rejected(client, auth, products, path, limit):
+    response = client.get(API + path, params={"limit": limit}, headers=auth["admin"])
+    assert response.status_code == 422
+
+
+@pytest.mark.parametrize("path", ["/products/", "/users/"])
+def test_pages_follow_the_cursor(client, auth, products, path):
+    seen, params = [], {"limit": 2}
+    while True:
+        response = client.get(API + path, params=params, headers=auth["admin"])
+        assert response.status_code == 200
+        page = response.json()
+        assert len(page) <= 2
+        seen.extend(row["id"] for row in page)
+        if NEXT_CURSOR_HEADER not in response.headers:
+            break
+        params["cursor"] = response.headers[NEXT_CURSOR_HEADER]
+    assert seen == sorted(set(seen))
+    assert len(seen) == (len(products) if path == "/products/" else len(models.UserRole))
+
+
+def test_finish_page_with_no_room_returns_nothing():
+    response = Response()
+    assert finish_page([object()], response, [models.User.id], limit=0) == []
+    assert NEXT_CURSOR_HEADER not in response.headers
@@ -0,0 +1,79 @@
+"""
+Report job result files: the runner's sweep deletes the files of jobs that
+finished more than the TTL ago and clears their result_path, after which
+downloads answer 410, and a failed export leaves no partial file behind.
+"""
+import os
+from datetime import datetime, timedelta, timezone
+
+from app.core.config import settings
+from app.db import models
+from app.services import job_service
+
+API = "/api/v1/reports/jobs"
+
+
+def finished_export(db, users, finished_at):
+    job = models.ReportJob(
+        kind=job_service.EXPORT, params={}, status=models.JobStatus.succeeded, requested_by=users["manager"].id,
+        finished_at=finished_at,
+    )
+    db.add(job)
+    db.flush()
+    job.result_path = f"report-job-{job.id}.csv"
+    os.makedirs(settings.REPORT_JOB_DIR, exist_ok=True)
+    with open(job_service.result_file(job), "w") as f:
+        f.write("sourcing_id\n")
+    job.result_size = os.path.getsize(job_service.result_file(job))
+    db.commit()
+    return job
+
+
+def test_sweep_expires_old_result_files(db, client, users, auth):
+    now = datetime.now(timezone.utc)
+    old = finished_export(db, users, now - timedelta(hours=2))
+    fresh = finished_export(db, users, now - timedelta(minutes=5))
+    old_file, fresh_file = job_service.result_file(old), job_service.result_file(fresh)
+
+    runner = job_service.JobRunner(workers=1, stale_after=300, result_ttl=3600)
+    assert runner.sweep() == 1
+    db.expire_all()
+    assert not os.path.exists(old_file)
+    assert (old.result_path, old.result_size) == (None, None)
+    assert os.path.exists(fresh_file)
+    assert fresh.result_path is not None
+
+    response = client.get(f"{API}/{old.id}/download", headers=auth["manager"])
+    assert response.status_code == 410
+    response = client.get(f"{API}/{fresh.id}/download", headers=auth["manager"])
+    assert response.status_code == 200
+    assert response.text == "sourcing_id\n"
+
+    # Already expired jobs are not picked up again
+    assert runner.sweep() == 0
+
+
+def test_sweep_tolerates_missing_files(db, users):
+    job = finished_export(db, users, datetime.now(timezone.utc) - timedelta(days=2))
+    os.remove(job_service.result_file(job))
+
+    assert job_service.JobRunner(workers=1, stale_after=300, result_ttl=86400).sweep() == 1
+    db.expire_all()
+    assert job.result_path is None
+
+
+def test_failed_export_leaves_no_partial_file(db, users, monkeypatch):
+    def fail_midway(db, statement, out, gzip, progress):
+        out.write(b"sourcing_id\n")
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(job_service, "_write_csv", fail_midway)
+    job = models.ReportJob(kind=job_service.EXPORT, params={}, requested_by=users["manager"].id)
+    db.add(job)
+    db.commit()
+
+    job_service.JobRunner(workers=1, stale_after=300)._run(job.id)
+    db.expire_all()
+    assert job.status == models.JobStatus.failed
+    assert job.error == "disk full"
+    assert not any(name.startswith(f"report-job-{job.id}.") for name in os.listdir(settings.REPORT_JOB_DIR))
@@ -0,0 +1,103 @@
+"""
+The report rollups and time series are maintained by deltas on every write;
+after each step here they must equal what rebuild_rollups and rebuild_series
+compute from the raw tables.
+"""
+import pytest
+from sqlalchemy import select
+
+from app.db import models
+from app.db.session import engine
+from app.services import report_service
+
+API = "/api/v1"
+
+
+def report_tables(connection):
+    """The rollup and series rows, with values rounded and empty series points dropped."""
+    rollups = {
+        (row.day, row.dimension, row.dimension_key): (
+            row.orders, row.closed_orders, round(float(row.savings), 2),
+            round(row.response_seconds, 1), row.responded_orders,
+        )
+        for row in connection.execute(select(models.ReportRollup.__table__))
+    }
+    series = {
+        (row.day, row.metric, row.bucket): round(row.value, 2)
+        for row in connection.execute(select(models.ReportSeriesPoint.__table__))
+        if row.value
+    }
+    return rollups, series
+
+
+def assert_matches_rebuild():
+    with engine.connect() as connection:
+        maintained = report_tables(connection)
+        report_service.rebuild_rollups(connection, None)
+        report_service.rebuild_series(connection, None)
+        rebuilt = report_tables(connection)
+        connection.rollback()
+    assert maintained == rebuilt
+
+
+def product_body(product, target):
+    return {
+        "sku": product.sku, "product_name": product.product_name, "target_cost_per_unit": target,
+        "category": product.category, "product_type": product.product_type.value,
+    }
+
+
+@pytest.fixture
+def purchased(client, auth, order):
+    response = client.put(f"{API}/sourcing/{order.id}", json={"status": "Purchased"}, headers=auth["purchaser"])
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_status_changes_and_item_edits_match_rebuild(client, auth, order, purchased):
+    assert_matches_rebuild()
+
+    item_id = purchased["items"][0]["id"]
+    response = client.patch(f"{API}/sourcing/items/{item_id}", json={"quantity_needed": 5}, headers=auth["purchaser"])
+    assert response.status_code == 200
+    assert_matches_rebuild()
+
+    response = client.patch(f"{API}/sourcing/items/{item_id}", json={"sku": "SKU-1"}, headers=auth["purchaser"])
+    assert response.status_code == 200
+    assert_matches_rebuild()
+
+    response = client.delete(f"{API}/sourcing/items/{purchased['items'][1]['id']}", headers=auth["purchaser"])
+    assert response.status_code == 204
+    assert_matches_rebuild()
+
+    response = client.put(f"{API}/sourcing/{order.id}", json={"status": "Assigned"}, headers=auth["purchaser"])
+    assert response.status_code == 200
+    assert_matches_rebuild()
+
+
+def test_repricing_a_product_moves_closed_orders(client, auth, products, purchased):
+    before = client.get(f"{API}/reports/dashboard", headers=auth["manager"]).json()
+
+    response = client.put(
+        f"{API}/products/{products[0].id}", json=product_body(products[0], 400), headers=auth["admin"]
+    )
+    assert response.status_code == 200
+    assert_matches_rebuild()
+
+    after = client.get(f"{API}/reports/dashboard", headers=auth["manager"]).json()
+    # One unit of SKU-0 on the order, repriced from 40 to 400
+    assert after["total_company_savings"] == pytest.approx(before["total_company_savings"] + 360)
+
+    # Renaming the SKU away leaves the order's items unpriced
+    response = client.put(
+        f"{API}/products/{products[1].id}",
+        json={**product_body(products[1], 25), "sku": "SKU-1-RENAMED"}, headers=auth["admin"],
+    )
+    assert response.status_code == 200
+    assert_matches_rebuild()
+
+    response = client.patch(
+        f"{API}/sourcing/items/{purchased['items'][0]['id']}", json={"quantity_needed": 2}, headers=auth["purchaser"]
+    )
+    assert response.status_code == 200
+    assert_matches_rebuild()
@@ -15,4 +15,20 @@ apiClient.interceptors.request.use((config) => {
   return Promise.reject(error);
 });
 
+// Keyset-paged list endpoints return one page per request and put the cursor
+// of the next page in the X-Next-Cursor header; follow it to load them all.
+export const getAllPages = async (url, { params = {}, pick = data => data, ...config } = {}) => {
+  const rows = [];
+  let cursor;
+  do {
+    const response = await apiClient.get(url, {
+      ...config,
+      params: { ...params, limit: 500, ...(cursor ? { cursor } : {}) },   // the API's largest page
+    });
+    rows.push(...pick(response.data));
+    cursor = response.headers['x-next-cursor'];
+  } while (cursor);
+  return rows;
+};
+
 export default apiClient;
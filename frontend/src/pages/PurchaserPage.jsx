@@ -12,7 +12,7 @@ import {
   Space,
 } from 'antd';
 import { PlusOutlined } from '@ant-design/icons';
-import apiClient from '../api/client';
+import apiClient, { getAllPages } from '../api/client';
 import { useNavigate, useLocation } from 'react-router-dom';
 import { motion } from 'framer-motion';
 import { debounce } from 'lodash';
@@ -90,9 +90,8 @@ const PurchaserPage = () => {
       params.end_date = dateRange[1].toISOString();
     }
 
-    apiClient
-      .get('/sourcing/assigned/me', { params })
-      .then(response => setRequests(response.data))
+    getAllPages('/sourcing/assigned/me', { params })
+      .then(setRequests)
       .catch(err => {
         console.error('Failed to fetch assigned requests:', err.response?.data || err.message);
         message.error('Failed to fetch assigned requests.');
@@ -1,7 +1,7 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { Table, Button, message, Space, Typography, Card } from 'antd';
 import { LoadingOutlined } from '@ant-design/icons';
-import apiClient from '../api/client';
+import apiClient, { getAllPages } from '../api/client';
 
 const { Title } = Typography;
 
@@ -11,8 +11,8 @@ const PurchaserPendingPage = () => {
 
   const fetchPending = useCallback(() => {
     setLoading(true);
-    apiClient.get('/sourcing/pending')
-      .then(response => setRequests(response.data))
+    getAllPages('/sourcing/pending')
+      .then(setRequests)
       .catch(() => message.error('Failed to fetch pending requests.'))
       .finally(() => setLoading(false));
   }, []);
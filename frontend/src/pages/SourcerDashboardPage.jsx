@@ -72,28 +72,9 @@ const SourcerDashboardPage = () => {
     });
   }, [stats]);
 
-  const totalBaseline = useMemo(() => {
-    const all = stats?.all_requests || stats?.recent_requests || [];
-    return all.reduce((sum, r) => {
-      const backend = num(r.target_total);
-      return sum + (backend > 0 ? backend : calcBaselineFromItems(r.items));
-    }, 0);
-  }, [stats]);
-
-  const overallEffPct = useMemo(() => {
-    const backendTotalSavings = num(stats?.total_savings);
-    if (backendTotalSavings && totalBaseline > 0) {
-      return (backendTotalSavings / totalBaseline) * 100;
-    }
-    // recompute
-    const all = stats?.all_requests || stats?.recent_requests || [];
-    let sav = 0;
-    all.forEach(r => {
-      const baseline = (num(r.target_total) > 0 ? num(r.target_total) : calcBaselineFromItems(r.items));
-      sav += (baseline - calcActualTotal(r));
-    });
-    return totalBaseline > 0 ? (sav / totalBaseline) * 100 : 0;
-  }, [stats, totalBaseline]);
+  // Totals over every order come from the server; all_requests is only one page
+  const totalBaseline = num(stats?.total_baseline);
+  const overallEffPct = num(stats?.overall_efficiency_pct);
 
   const columns = [
     { title: 'ID', dataIndex: 'id', key: 'id', width: 70 },
@@ -17,7 +17,7 @@ import { motion } from 'framer-motion';
 import { useNavigate } from 'react-router-dom';
 import { debounce } from 'lodash';
 import dayjs from 'dayjs';
-import apiClient from '../api/client';
+import apiClient, { getAllPages } from '../api/client';
 
 const { Text } = Typography;
 const { Option } = Select;
@@ -71,17 +71,13 @@ const SourcingOrdersPage = () => {
       let list = [];
 
       if (me.role === 'sourcer') {
-        const { data } = await apiClient.get('/reports/sourcer/me');
-        list = normalizeArray(data);
+        list = await getAllPages('/reports/sourcer/me', { pick: data => data.all_requests });
       } else if (me.role === 'purchaser') {
         const [pending, assigned] = await Promise.all([
-          apiClient.get('/sourcing/pending'),
-          apiClient.get('/sourcing/assigned/me'),
-        ]);
-        list = dedupeById([
-          ...normalizeArray(pending.data),
-          ...normalizeArray(assigned.data),
+          getAllPages('/sourcing/pending'),
+          getAllPages('/sourcing/assigned/me'),
         ]);
+        list = dedupeById([...pending, ...assigned]);
       } else {
         const { data } = await apiClient.get('/reports/dashboard');
         list = normalizeArray(data);